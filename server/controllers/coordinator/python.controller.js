@@ -6,7 +6,7 @@ const path = require('path');
 
 const runTimetableGeneration = async (req, res) => {
     try {
-        const { algorithm, constraints, preferences } = req.body;
+        const { algorithm, constraints, preferences, timeLimit = 120 } = req.body;
         const departmentId = req.user.department;
 
         // Validate input
@@ -23,7 +23,8 @@ const runTimetableGeneration = async (req, res) => {
             config: {
                 max_iterations: 1000,
                 population_size: 50,
-                mutation_rate: 0.1
+                mutation_rate: 0.1,
+                time_limit: timeLimit
             }
         };
 
@@ -45,8 +46,18 @@ const runTimetableGeneration = async (req, res) => {
 
         const scriptPath = path.join(__dirname, '../../../python_models/models', scriptName);
 
-        // Execute Python script
-        const result = await execPythonScript(scriptPath, inputData);
+        // Execute Python script; the script stops itself at time_limit and
+        // returns its best schedule so far, the executor timeout is a backstop
+        const result = await execPythonScript(scriptPath, inputData, {
+            timeoutMs: (timeLimit + 10) * 1000
+        });
+
+        if (result && result.error) {
+            // Input rejected by validation or the feasibility check (400), or no schedule found (422)
+            const error = new ApiError(result.schedule === null ? 422 : 400, result.error);
+            error.errors = result.errors || result.issues;
+            throw error;
+        }
 
         if (!result || !result.schedule) {
             throw new ApiError(500, 'Timetable generation failed');
@@ -59,7 +70,9 @@ const runTimetableGeneration = async (req, res) => {
             data: {
                 schedule: result.schedule,
                 stats: result.stats,
-                conflicts: result.conflicts || []
+                conflicts: result.conflicts || [],
+                conflictReport: result.conflict_report || null,
+                cancelled: result.cancelled || false
             }
         });
 
@@ -1,14 +1,44 @@
 # python_models/__init__.py
+from .base.problem_index import ProblemIndex
 from .models.conflict_graph_model import ConflictGraphModel
 from .models.constraint_model import ConstraintModel
 from .models.multiagent_model import MultiAgentModel
+from .models.genetic_model import GeneticModel
+from .models.local_search_model import LocalSearchModel
+from .models.portfolio_model import PortfolioModel
 from .utils.graph_utils import GraphUtils
 from .utils.vtu_validator import VTUValidator
+from .utils.feasibility import FeasibilityAnalyzer
+from .utils.personal_timetables import PersonalTimetables
+from .utils.schedule_diff import ScheduleDiff
+from .utils.conflict_report import ConflictReport
+from .utils.reproducibility import Reproducibility
+from .utils.block_layout import BlockLayout
+from .utils.binary_format import BinaryProblem, BinarySolution
+from .utils.instrumentation import Instrumentation
+from .utils.model_pool import ModelPool
+from .utils.async_scheduler import AsyncScheduler, SchedulerBusy
 
 __all__ = [
     'ConflictGraphModel',
     'ConstraintModel',
     'MultiAgentModel',
+    'GeneticModel',
+    'LocalSearchModel',
+    'PortfolioModel',
     'GraphUtils',
-    'VTUValidator'
+    'VTUValidator',
+    'FeasibilityAnalyzer',
+    'PersonalTimetables',
+    'ScheduleDiff',
+    'ConflictReport',
+    'Reproducibility',
+    'BlockLayout',
+    'BinaryProblem',
+    'BinarySolution',
+    'ProblemIndex',
+    'Instrumentation',
+    'ModelPool',
+    'AsyncScheduler',
+    'SchedulerBusy'
 ]
\ No newline at end of file
@@ -0,0 +1,159 @@
+# python_models/base/problem_index.py
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
+
+class ProblemIndex:
+    """
+    Immutable, interned view of a scheduling problem
+    Events, teachers, student groups and rooms are mapped to dense ints so
+    every model can work on integer ids and per-resource event lists instead
+    of re-walking the input dicts. Missing rooms/teachers are stored as -1.
+    """
+
+    __slots__ = (
+        'events', 'event_ids', 'teacher_ids', 'group_ids', 'room_ids',
+        'teachers', 'student_groups', 'rooms',
+        'event_pos', 'teacher_pos', 'group_pos', 'room_pos',
+        'event_teacher', 'event_groups', 'event_room',
+        'teacher_events', 'group_events', 'room_events',
+        'num_timeslots'
+    )
+
+    def __init__(self, events: List[Dict], teachers: List[Dict], student_groups: List[Dict],
+                 rooms: List[Dict], num_timeslots: Optional[int] = None):
+        builder = ProblemIndexBuilder()
+        for section, items in (('teachers', teachers), ('student_groups', student_groups), ('rooms', rooms)):
+            for item in items:
+                builder.add_resource(section, item)
+        for event in events:
+            builder.add_event(event)
+        builder.num_timeslots = num_timeslots
+        builder.fill(self)
+
+    @classmethod
+    def from_input(cls, input_data: Dict) -> 'ProblemIndex':
+        """Build the index straight from input data without validating it"""
+        return cls(
+            input_data.get('events', []),
+            input_data.get('teachers', []),
+            input_data.get('student_groups', []),
+            input_data.get('rooms', []),
+            input_data.get('num_timeslots')
+        )
+
+    @classmethod
+    def resolve(cls, input_data: Dict, index: Optional['ProblemIndex'] = None) -> 'ProblemIndex':
+        """Return the given index after a cheap sanity check, or build one"""
+        if index is None:
+            return cls.from_input(input_data)
+        if len(index.events) != len(input_data.get('events', [])):
+            raise ValueError("Problem index does not match input data: event counts differ")
+        return index
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ProblemIndex is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("ProblemIndex is immutable")
+
+    @property
+    def num_events(self) -> int:
+        return len(self.event_ids)
+
+    def resource_events(self) -> List[Tuple[int, ...]]:
+        """Every teacher, room and student group event list (each one is a clique)"""
+        return list(self.teacher_events) + list(self.room_events) + list(self.group_events)
+
+    def timeslots(self, default: int) -> int:
+        return self.num_timeslots if self.num_timeslots is not None else default
+
+    def structure(self) -> Tuple:
+        """
+        Conflict structure (resource counts and each event's interned teacher,
+        groups and room); equal for problems that differ only in names or other
+        event fields, so models cache derived structures by it, not by identity
+        """
+        return (len(self.teacher_ids), len(self.group_ids), len(self.room_ids),
+                self.event_teacher, self.event_groups, self.event_room)
+
+
+class ProblemIndexBuilder:
+    """Accumulates interned ids while input is walked once (e.g. during validation)"""
+
+    SECTIONS = ('teachers', 'student_groups', 'rooms')
+
+    def __init__(self):
+        self.events = []
+        self.ids = {section: [] for section in self.SECTIONS}
+        self.items = {section: [] for section in self.SECTIONS}
+        self.pos = {section: {} for section in self.SECTIONS}
+        self.event_pos = {}
+        self.event_refs = []
+        self.num_timeslots = None
+
+    def _intern(self, section: str, resource_id, item: Optional[Dict] = None) -> int:
+        positions = self.pos[section]
+        if resource_id not in positions:
+            positions[resource_id] = len(self.ids[section])
+            self.ids[section].append(resource_id)
+            self.items[section].append(item)
+        elif item is not None and self.items[section][positions[resource_id]] is None:
+            self.items[section][positions[resource_id]] = item
+        return positions[resource_id]
+
+    def add_resource(self, section: str, item: Dict):
+        self._intern(section, item['id'], item)
+
+    def add_event(self, event: Dict):
+        # References are interned lazily in build() so resource sections
+        # that appear after events in the input keep their listed order
+        self.event_pos.setdefault(event['id'], len(self.events))
+        self.events.append(event)
+
+    def build(self) -> ProblemIndex:
+        index = ProblemIndex.__new__(ProblemIndex)
+        self.fill(index)
+        return index
+
+    def fill(self, index: ProblemIndex):
+        event_teacher, event_groups, event_room = [], [], []
+        for event in self.events:
+            teacher = event.get('teacher')
+            event_teacher.append(self._intern('teachers', teacher) if teacher is not None else -1)
+            event_groups.append(tuple(self._intern('student_groups', g) for g in event.get('student_groups', [])))
+            event_room.append(self._intern('rooms', event['room']) if 'room' in event else -1)
+
+        teacher_events = [[] for _ in self.ids['teachers']]
+        group_events = [[] for _ in self.ids['student_groups']]
+        room_events = [[] for _ in self.ids['rooms']]
+        for e in range(len(self.events)):
+            if event_teacher[e] >= 0:
+                teacher_events[event_teacher[e]].append(e)
+            for g in event_groups[e]:
+                group_events[g].append(e)
+            if event_room[e] >= 0:
+                room_events[event_room[e]].append(e)
+
+        values = {
+            'events': tuple(self.events),
+            'event_ids': tuple(event['id'] for event in self.events),
+            'teacher_ids': tuple(self.ids['teachers']),
+            'group_ids': tuple(self.ids['student_groups']),
+            'room_ids': tuple(self.ids['rooms']),
+            'teachers': tuple(self.items['teachers']),
+            'student_groups': tuple(self.items['student_groups']),
+            'rooms': tuple(self.items['rooms']),
+            'event_pos': MappingProxyType(dict(self.event_pos)),
+            'teacher_pos': MappingProxyType(dict(self.pos['teachers'])),
+            'group_pos': MappingProxyType(dict(self.pos['student_groups'])),
+            'room_pos': MappingProxyType(dict(self.pos['rooms'])),
+            'event_teacher': tuple(event_teacher),
+            'event_groups': tuple(event_groups),
+            'event_room': tuple(event_room),
+            'teacher_events': tuple(tuple(events) for events in teacher_events),
+            'group_events': tuple(tuple(events) for events in group_events),
+            'room_events': tuple(tuple(events) for events in room_events),
+            'num_timeslots': self.num_timeslots
+        }
+        for name, value in values.items():
+            object.__setattr__(index, name, value)
@@ -1,15 +1,49 @@
 # python_models/base/scheduler_interface.py
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional
+from .problem_index import ProblemIndex
+from ..utils.cancellation import CancellationToken, ProgressReporter
 
 class SchedulerInterface(ABC):
-    """Abstract base class for all timetable schedulers"""
+    """
+    Abstract base class for all timetable schedulers
+    Every model takes a `seed` keyword: randomised models draw from it and
+    deterministic ones use it to break heuristic ties (Reproducibility.tie_break),
+    so the same input, model and seed always give the same schedule.
+    """
+    
+    seed: Optional[int] = None
     
     @abstractmethod
-    def generate_schedule(self, input_data: Dict) -> Dict:
-        """Generate timetable schedule from input data"""
+    def generate_schedule(self, input_data: Dict, index: Optional[ProblemIndex] = None,
+                          cancellation: Optional[CancellationToken] = None,
+                          progress: Optional[ProgressReporter] = None) -> Dict:
+        """
+        Generate timetable schedule from input data
+        A ProblemIndex produced during validation can be passed to skip re-indexing.
+        When the cancellation token fires, the best schedule found so far is
+        returned with 'cancelled', 'cancel_reason' and 'unassigned' set.
+        """
         pass
     
+    def reset(self, stats: bool = True):
+        """
+        Drop per-problem state so the instance can serve another request
+        Reusable structures (caches keyed by ProblemIndex.structure(), which
+        hold no index or event data) are kept. generate_schedule calls reset(stats=False) so timings recorded
+        before the solve (validation) survive; `with model:` resets on exit.
+        """
+        instrumentation = getattr(self, 'instrumentation', None)
+        if stats and instrumentation is not None:
+            instrumentation.reset()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.reset()
+        return False
+    
     @abstractmethod
     def validate_schedule(self, schedule: Dict) -> bool:
         """Validate generated schedule meets constraints"""
@@ -0,0 +1,193 @@
+# python_models/benchmarks/run_benchmarks.py
+"""
+Benchmark runner for the timetable schedulers
+
+Run from the server directory:
+    python -m python_models.benchmarks.run_benchmarks --output results.json
+    python -m python_models.benchmarks.run_benchmarks --sizes small,medium,large --no-baseline \
+        --output python_models/benchmarks/baseline.json
+
+Each model is run on seeded synthetic instances of several sizes; wall time,
+peak memory, timeslots used and conflict counts are written as JSON. The
+results are compared against the committed baseline (or --baseline) and the
+exit code is 1 when any case is slower than the allowed tolerance, got worse,
+failed or is missing; --no-baseline skips the comparison, e.g. to re-record it.
+"""
+from typing import Dict, List, Optional
+import argparse
+import copy
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+from ..models.conflict_graph_model import ConflictGraphModel
+from ..models.constraint_model import ConstraintModel
+from ..models.multiagent_model import MultiAgentModel
+from ..utils.instance_generator import InstanceGenerator
+from ..utils.instrumentation import Instrumentation
+from ..utils.reproducibility import Reproducibility
+
+MODELS = {
+    'conflict_graph': ConflictGraphModel,
+    'constraint': ConstraintModel,
+    'multiagent': MultiAgentModel
+}
+
+SIZES = {
+    'small': {'num_events': 50, 'num_teachers': 10, 'num_groups': 5, 'num_rooms': 5,
+              'num_shared_courses': 2, 'num_electives': 5},
+    'medium': {'num_events': 200, 'num_teachers': 30, 'num_groups': 10, 'num_rooms': 10,
+               'num_shared_courses': 5, 'num_electives': 20},
+    'large': {'num_events': 1000, 'num_teachers': 120, 'num_groups': 40, 'num_rooms': 30,
+              'num_shared_courses': 20, 'num_electives': 80}
+}
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def run_case(model_name: str, size_name: str, params: Dict, seed: int, repeats: int) -> Dict:
+    """Benchmark one model on one generated instance"""
+    instance = InstanceGenerator(seed).generate(**params)
+    result = {
+        'model': model_name,
+        'size': size_name,
+        'seed': seed,
+        'events': params['num_events']
+    }
+    model_cls = MODELS[model_name]
+    try:
+        times = []
+        for _ in range(repeats):
+            data = copy.deepcopy(instance)
+            model = model_cls()
+            start = time.perf_counter()
+            schedule = model.generate_schedule(data)
+            times.append(time.perf_counter() - start)
+
+        # One extra traced run for memory; tracing slows the run down
+        instrumentation = Instrumentation(trace_memory=True)
+        model_cls(instrumentation).generate_schedule(copy.deepcopy(instance))
+        stats = instrumentation.stats()
+    except (RecursionError, MemoryError, KeyError, ValueError) as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+        return result
+
+    result.update({
+        'time_seconds': round(statistics.median(times), 6),
+        'time_min_seconds': round(min(times), 6),
+        'peak_memory_bytes': stats['peak_memory_bytes'].get('total', 0),
+        'valid': model.validate_schedule(schedule),
+        'timeslots_used': len(schedule.get('timeslots', {})),
+        'events_scheduled': len(schedule.get('events', [])),
+        'conflicts': len(model.get_conflicts(schedule)),
+        # Same fingerprint as the baseline: the model placed every event identically
+        'fingerprint': Reproducibility.schedule_fingerprint(schedule)
+    })
+    return result
+
+
+def run_benchmarks(models: List[str], sizes: List[str], seed: int = 0, repeats: int = 3) -> Dict:
+    cases = [
+        run_case(model_name, size_name, SIZES[size_name], seed, repeats)
+        for size_name in sizes
+        for model_name in models
+    ]
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'repeats': repeats,
+        'cases': cases
+    }
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float = 0.25) -> List[Dict]:
+    """
+    Compare results against a baseline run
+    A case regresses when its median time exceeds the baseline by more than
+    tolerance (a fraction), when it uses more timeslots or has more conflicts,
+    or when a case the baseline timed failed or is missing from the results.
+    """
+    baseline_cases = {(c['model'], c['size']): c for c in baseline.get('cases', [])}
+    regressions = []
+    for case in results['cases']:
+        base = baseline_cases.get((case['model'], case['size']))
+        if base is None or 'time_seconds' not in base:
+            continue
+        if 'time_seconds' not in case:
+            reason = case.get('error', 'no timing')
+            regressions.append({'model': case['model'], 'size': case['size'], 'reasons': [reason]})
+            continue
+        ratio = case['time_seconds'] / base['time_seconds'] if base['time_seconds'] else 1.0
+        case['baseline_ratio'] = round(ratio, 3)
+        reasons = []
+        if ratio > 1 + tolerance:
+            reasons.append(f"time {ratio:.2f}x baseline")
+        for metric in ('timeslots_used', 'conflicts'):
+            if case[metric] > base.get(metric, case[metric]):
+                reasons.append(f"{metric} {base[metric]} -> {case[metric]}")
+        if reasons:
+            regressions.append({'model': case['model'], 'size': case['size'], 'reasons': reasons})
+    return regressions
+
+
+def missing_cases(results: Dict, baseline: Dict, models: List[str], sizes: List[str]) -> List[Dict]:
+    """Baseline cases for the requested models and sizes that produced no result"""
+    ran = {(c['model'], c['size']) for c in results['cases']}
+    return [
+        {'model': c['model'], 'size': c['size'], 'reasons': ['missing from results']}
+        for c in baseline.get('cases', [])
+        if c['model'] in models and c['size'] in sizes and (c['model'], c['size']) not in ran
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the timetable schedulers')
+    parser.add_argument('--models', default=','.join(MODELS), help='comma separated model names')
+    parser.add_argument('--sizes', default='small,medium', help=f"comma separated, from {', '.join(SIZES)}")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--output', help='write results JSON here (default: stdout)')
+    parser.add_argument('--baseline', default=BASELINE,
+                        help='baseline results JSON to compare against (default: the committed baseline)')
+    parser.add_argument('--no-baseline', action='store_true', help='skip the baseline comparison')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown fraction')
+    args = parser.parse_args(argv)
+
+    models = [m for m in args.models.split(',') if m]
+    sizes = [s for s in args.sizes.split(',') if s]
+    for name in models:
+        if name not in MODELS:
+            parser.error(f"unknown model: {name}")
+    for name in sizes:
+        if name not in SIZES:
+            parser.error(f"unknown size: {name}")
+
+    results = run_benchmarks(models, sizes, args.seed, args.repeats)
+
+    regressions = []
+    if not args.no_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        regressions += missing_cases(results, baseline, models, sizes)
+        results['regressions'] = regressions
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    for regression in regressions:
+        sys.stderr.write(f"REGRESSION {regression['model']}/{regression['size']}: "
+                         f"{'; '.join(regression['reasons'])}\n")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
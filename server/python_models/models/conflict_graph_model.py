@@ -1,167 +1,139 @@
 # python_models/models/conflict_graph_model.py
-from typing import Dict, List, Set
-import networkx as nx
+from typing import Dict, List, Optional, Set
+from ..base.problem_index import ProblemIndex
 from ..base.scheduler_interface import SchedulerInterface
+from ..utils.block_layout import BlockLayout
+from ..utils.cancellation import CancellationToken, ProgressReporter, SolveCancelled, mark_cancelled
+from ..utils.clique_graph import CliqueGraph
+from ..utils.instrumentation import Instrumentation
+from ..utils.reproducibility import Reproducibility
+from ..utils.schedule_builder import ScheduleBuilder
 
 class ConflictGraphModel(SchedulerInterface):
-    """Timetable scheduler using conflict graph approach"""
+    """
+    Timetable scheduler using conflict graph approach
+    Block events (labs, double periods; see BlockLayout) stay single nodes
+    and take a run of consecutive colors within one day.
+    """
     
-    def __init__(self):
-        self.graph = nx.Graph()
+    def __init__(self, instrumentation: Optional[Instrumentation] = None, seed: Optional[int] = None):
+        """seed: breaks degree ties in the coloring order (None keeps event order)"""
+        self.instrumentation = instrumentation or Instrumentation.disabled()
+        self.seed = seed
+        self.graph = None
+        self.coloring = {}
         self.resources = {
             'teachers': set(),
             'rooms': set(),
             'student_groups': set()
         }
+        # Graph of the last conflict structure seen (ProblemIndex.structure()), kept
+        # across reset() so repeat solves of the same problem skip the build even
+        # with a fresh index; it holds no reference to the index or its events
+        self._cached_graph = (None, None)
     
-    def generate_schedule(self, input_data: Dict) -> Dict:
+    @classmethod
+    def from_config(cls, config: Dict, instrumentation: Optional[Instrumentation] = None) -> 'ConflictGraphModel':
+        """Build from the 'config' block sent by python.controller.js"""
+        return cls(instrumentation, seed=config.get('seed'))
+    
+    def reset(self, stats: bool = True):
+        super().reset(stats)
+        self.graph = None
+        # Colors assigned so far; greedy_color fills it in place
+        self.coloring = {}
+        for resource_ids in self.resources.values():
+            resource_ids.clear()
+    
+    def generate_schedule(self, input_data: Dict, index: Optional[ProblemIndex] = None,
+                          cancellation: Optional[CancellationToken] = None,
+                          progress: Optional[ProgressReporter] = None) -> Dict:
         """Generate schedule using graph coloring approach"""
-        self._build_graph(input_data)
-        coloring = self._color_graph()
-        return self._convert_to_schedule(coloring, input_data)
+        self.reset(stats=False)
+        cancellation = cancellation or CancellationToken.never()
+        progress = progress or ProgressReporter.disabled()
+        instr = self.instrumentation
+        with instr.run():
+            with instr.phase('index'):
+                index = ProblemIndex.resolve(input_data, index)
+            try:
+                with instr.phase('graph_build'):
+                    self._build_graph(index, cancellation, progress)
+                with instr.phase('coloring'):
+                    coloring = self._color_graph(cancellation, index, BlockLayout.from_input(input_data))
+                cancelled = False
+            except SolveCancelled:
+                # Keep the colors assigned before the token fired (none if the
+                # graph build was cancelled)
+                coloring = self.coloring
+                cancelled = True
+            with instr.phase('conversion'):
+                schedule = self._convert_to_schedule(coloring, index)
+        if cancelled:
+            unassigned = [event_id for e, event_id in enumerate(index.event_ids) if e not in coloring]
+            mark_cancelled(schedule, cancellation, unassigned)
+        else:
+            progress.report('coloring', index.num_events, index.num_events, force=True,
+                            colors=len(set(coloring.values())))
+        if self.graph is not None:
+            instr.gauge('nodes', self.graph.number_of_nodes())
+            instr.gauge('edges', self.graph.number_of_edges())
+            instr.gauge('cliques', self.graph.number_of_cliques())
+            instr.gauge('graph_bytes', self.graph.memory_bytes())
+        instr.gauge('colors', len(set(coloring.values())))
+        return instr.attach(schedule)
     
-    def _build_graph(self, input_data: Dict):
-        """Build conflict graph from input data"""
-        # Add all events as nodes
-        for event in input_data['events']:
-            self.graph.add_node(event['id'], **event)
+    def _build_graph(self, index: ProblemIndex, cancellation: Optional[CancellationToken] = None,
+                     progress: Optional[ProgressReporter] = None):
+        """Build the implicit-clique conflict graph from the interned problem index"""
+        cancellation = cancellation or CancellationToken.never()
+        progress = progress or ProgressReporter.disabled()
+        self.resources['teachers'].update(index.teacher_ids)
+        self.resources['rooms'].update(index.room_ids)
+        self.resources['student_groups'].update(index.group_ids)
         
-        # Add edges between conflicting events
-        for i, event1 in enumerate(input_data['events']):
-            for event2 in input_data['events'][i+1:]:
-                if self._events_conflict(event1, event2):
-                    self.graph.add_edge(event1['id'], event2['id'])
-    
-    def _events_conflict(self, event1: Dict, event2: Dict) -> bool:
-        """Check if two events conflict (can't be scheduled at same time)"""
-        # Check teacher conflict
-        if event1['teacher'] == event2['teacher']:
-            return True
-            
-        # Check room conflict if specified
-        if 'room' in event1 and 'room' in event2 and event1['room'] == event2['room']:
-            return True
-            
-        # Check student group conflict
-        if set(event1['student_groups']).intersection(event2['student_groups']):
-            return True
-            
-        return False
+        # Events sharing a teacher, room or student group form a clique;
+        # cliques are stored as memberships, never as explicit edges
+        cancellation.check()
+        cached_structure, graph = self._cached_graph
+        structure = index.structure()
+        if cached_structure != structure:
+            graph = CliqueGraph.from_index(index)
+            self._cached_graph = (structure, graph)
+        self.graph = graph
+        self.graph.degrees(cancellation)
+        progress.report('graph_build', 0, index.num_events, cliques=self.graph.number_of_cliques())
     
-    def _color_graph(self) -> Dict:
-        """Color the graph using greedy algorithm"""
-        return nx.coloring.greedy_color(self.graph, strategy='largest_first')
+    def _color_graph(self, cancellation: Optional[CancellationToken] = None,
+                     index: Optional[ProblemIndex] = None, layout: Optional[BlockLayout] = None) -> Dict:
+        """Color the graph using greedy algorithm (largest degree first)"""
+        ranks = None
+        if self.seed is not None:
+            ranks = Reproducibility.tie_break(self.graph.number_of_nodes(), self.seed)
+        durations = BlockLayout.durations(index) if index is not None else []
+        if not any(d > 1 for d in durations):
+            durations = None
+        return self.graph.greedy_color(cancellation, ranks, durations, layout, self.coloring)
     
-    def _convert_to_schedule(self, coloring: Dict, input_data: Dict) -> Dict:
+    def _convert_to_schedule(self, coloring: Dict, index: ProblemIndex) -> Dict:
         """Convert graph coloring to timetable schedule"""
-        schedule = {
-            'timeslots': {},
-            'events': [],
-            'teachers': {},
-            'rooms': {},
-            'student_groups': {}
-        }
-        
         # Group events by color (timeslot)
         timeslot_events = {}
-        for event_id, timeslot in coloring.items():
+        for event_pos, timeslot in coloring.items():
             if timeslot not in timeslot_events:
                 timeslot_events[timeslot] = []
-            timeslot_events[timeslot].append(event_id)
+            timeslot_events[timeslot].append(event_pos)
         
-        # Build schedule structure
-        for timeslot, event_ids in timeslot_events.items():
-            schedule['timeslots'][timeslot] = []
-            for event_id in event_ids:
-                event = next(e for e in input_data['events'] if e['id'] == event_id)
-                schedule['timeslots'][timeslot].append(event)
-                schedule['events'].append(event)
-                
-                # Track teacher schedules
-                if event['teacher'] not in schedule['teachers']:
-                    schedule['teachers'][event['teacher']] = []
-                schedule['teachers'][event['teacher']].append({
-                    'timeslot': timeslot,
-                    'event': event
-                })
-                
-                # Track room usage if specified
-                if 'room' in event:
-                    if event['room'] not in schedule['rooms']:
-                        schedule['rooms'][event['room']] = []
-                    schedule['rooms'][event['room']].append({
-                        'timeslot': timeslot,
-                        'event': event
-                    })
-                
-                # Track student group schedules
-                for group in event['student_groups']:
-                    if group not in schedule['student_groups']:
-                        schedule['student_groups'][group] = []
-                    schedule['student_groups'][group].append({
-                        'timeslot': timeslot,
-                        'event': event
-                    })
-        
-        return schedule
+        return ScheduleBuilder.build(
+            (timeslot, index.events[event_pos])
+            for timeslot, event_positions in timeslot_events.items()
+            for event_pos in event_positions
+        )
     
     def validate_schedule(self, schedule: Dict) -> bool:
         """Validate the generated schedule"""
-        # Check for teacher conflicts
-        for teacher, assignments in schedule['teachers'].items():
-            timeslots = [a['timeslot'] for a in assignments]
-            if len(timeslots) != len(set(timeslots)):
-                return False
-                
-        # Check for room conflicts
-        for room, assignments in schedule['rooms'].items():
-            timeslots = [a['timeslot'] for a in assignments]
-            if len(timeslots) != len(set(timeslots)):
-                return False
-                
-        # Check for student group conflicts
-        for group, assignments in schedule['student_groups'].items():
-            timeslots = [a['timeslot'] for a in assignments]
-            if len(timeslots) != len(set(timeslots)):
-                return False
-                
-        return True
+        return not ScheduleBuilder.conflicts(schedule)
     
     def get_conflicts(self, schedule: Dict) -> List[Dict]:
         """Get list of conflicts in the schedule"""
-        conflicts = []
-        
-        # Check teacher conflicts
-        for teacher, assignments in schedule['teachers'].items():
-            timeslots = [a['timeslot'] for a in assignments]
-            if len(timeslots) != len(set(timeslots)):
-                conflict_times = [t for t in timeslots if timeslots.count(t) > 1]
-                conflicts.append({
-                    'type': 'Teacher conflict',
-                    'message': f"Teacher {teacher} scheduled for multiple events at times {conflict_times}",
-                    'resources': [teacher]
-                })
-        
-        # Check room conflicts
-        for room, assignments in schedule['rooms'].items():
-            timeslots = [a['timeslot'] for a in assignments]
-            if len(timeslots) != len(set(timeslots)):
-                conflict_times = [t for t in timeslots if timeslots.count(t) > 1]
-                conflicts.append({
-                    'type': 'Room conflict',
-                    'message': f"Room {room} scheduled for multiple events at times {conflict_times}",
-                    'resources': [room]
-                })
-        
-        # Check student group conflicts
-        for group, assignments in schedule['student_groups'].items():
-            timeslots = [a['timeslot'] for a in assignments]
-            if len(timeslots) != len(set(timeslots)):
-                conflict_times = [t for t in timeslots if timeslots.count(t) > 1]
-                conflicts.append({
-                    'type': 'Student group conflict',
-                    'message': f"Group {group} scheduled for multiple events at times {conflict_times}",
-                    'resources': [group]
-                })
-        
-        return conflicts
\ No newline at end of file
+        return ScheduleBuilder.conflicts(schedule)
@@ -1,74 +1,184 @@
 # python_models/models/constraint_model.py
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set, Tuple
+from ..base.problem_index import ProblemIndex
 from ..base.scheduler_interface import SchedulerInterface
+from ..utils.block_layout import BlockLayout
+from ..utils.cancellation import CancellationToken, ProgressReporter, SolveCancelled, mark_cancelled
+from ..utils.feasibility import FeasibilityAnalyzer
+from ..utils.instrumentation import Instrumentation
+from ..utils.reproducibility import Reproducibility
+from ..utils.schedule_builder import ScheduleBuilder
 
 class ConstraintModel(SchedulerInterface):
-    """Timetable scheduler using constraint satisfaction approach"""
+    """
+    Timetable scheduler using constraint satisfaction approach
+    Block events (labs, double periods; see BlockLayout) are one variable
+    whose domain is its valid start slots; placing a block removes every
+    overlapping start from its neighbours' domains.
+    """
     
-    def __init__(self):
+    # Search nodes between cancellation/progress checks (power of two)
+    CHECK_INTERVAL = 256
+    
+    def __init__(self, instrumentation: Optional[Instrumentation] = None, seed: Optional[int] = None):
+        """seed: breaks variable-ordering ties (None keeps event order)"""
+        self.instrumentation = instrumentation or Instrumentation.disabled()
+        self.seed = seed
+        self.ranks = []
+        # Conflict structure and durations the constraints were built for; kept
+        # across reset() so repeat solves of the same problem skip the setup
+        self.setup_key = None
         self.variables = []
-        self.domains = {}
         self.constraints = []
+        self.neighbors = {}
+        self.cliques = []
+        self.var_cliques = {}
+        self.symmetry_clique = []
+        # Duration per variable, or None when every event lasts one period
+        self.durations = None
+        self.num_timeslots = 0
+        self.reset(stats=False)
+    
+    @classmethod
+    def from_config(cls, config: Dict, instrumentation: Optional[Instrumentation] = None) -> 'ConstraintModel':
+        """Build from the 'config' block sent by python.controller.js"""
+        return cls(instrumentation, seed=config.get('seed'))
     
-    def generate_schedule(self, input_data: Dict) -> Dict:
+    def reset(self, stats: bool = True):
+        super().reset(stats)
+        self.nodes_explored = 0
+        self.backtracks = 0
+        self.domains = {}
+        self.trail = []
+        self.slot_use = []
+        self.cancellation = CancellationToken.never()
+        self.progress = ProgressReporter.disabled()
+        self.best_assignment = {}
+        self.cancelled = False
+    
+    def generate_schedule(self, input_data: Dict, index: Optional[ProblemIndex] = None,
+                          cancellation: Optional[CancellationToken] = None,
+                          progress: Optional[ProgressReporter] = None) -> Dict:
         """Generate schedule using constraint satisfaction"""
-        self._setup_problem(input_data)
-        solution = self._solve_csp()
-        return self._convert_to_schedule(solution, input_data)
-    
-    def _setup_problem(self, input_data: Dict):
-        """Setup the CSP problem from input data"""
-        # Define variables (events)
-        self.variables = [event['id'] for event in input_data['events']]
-        
-        # Define domains (possible timeslots for each event)
-        self.domains = {var: list(range(input_data['num_timeslots'])) for var in self.variables}
-        
-        # Define constraints
-        self.constraints = []
-        
-        # Add teacher constraints
-        teacher_events = {}
-        for event in input_data['events']:
-            if event['teacher'] not in teacher_events:
-                teacher_events[event['teacher']] = []
-            teacher_events[event['teacher']].append(event['id'])
+        self.reset(stats=False)
+        self.cancellation = cancellation or CancellationToken.never()
+        self.progress = progress or ProgressReporter.disabled()
+        instr = self.instrumentation
+        with instr.run():
+            with instr.phase('index'):
+                index = ProblemIndex.resolve(input_data, index)
+            with instr.phase('setup'):
+                self._setup_problem(index, BlockLayout.from_input(input_data, index.timeslots(40)))
+            with instr.phase('search'):
+                solution = self._solve_csp()
+            with instr.phase('conversion'):
+                schedule = self._convert_to_schedule(solution, index)
+        if self.cancelled:
+            unassigned = [index.event_ids[var] for var in self.variables if var not in solution]
+            mark_cancelled(schedule, self.cancellation, unassigned)
+        # Search counters are plain ints on the model and published once here
+        instr.gauge('variables', len(self.variables))
+        instr.gauge('constraints', len(self.constraints))
+        instr.gauge('nodes_explored', self.nodes_explored)
+        instr.gauge('backtracks', self.backtracks)
+        if solution is not None:
+            instr.gauge('colors', len(set(solution.values())))
+        return instr.attach(schedule)
+    
+    def _setup_problem(self, index: ProblemIndex, layout: Optional[BlockLayout] = None):
+        """Setup the CSP problem from the interned problem index"""
+        layout = layout or BlockLayout.shared(index.timeslots(40))
+        self.num_timeslots = layout.num_timeslots
+        self.ranks = Reproducibility.tie_break(index.num_events, self.seed)
+        durations = tuple(BlockLayout.durations(index))
+        key = (index.structure(), durations)
+        if key != self.setup_key:
+            self._setup_constraints(index, durations)
+            self.setup_key = key
         
-        for teacher, events in teacher_events.items():
-            for i, event1 in enumerate(events):
-                for event2 in events[i+1:]:
-                    self.constraints.append((event1, event2, 'diff'))
+        # Define domains (possible start timeslots for each event); search narrows them
+        starts = layout.starts
+        if self.durations is None:
+            self.domains = {var: set(starts(1)) for var in self.variables}
+        else:
+            self.domains = {var: set(starts(self.durations[var])) for var in self.variables}
+    
+    def _setup_constraints(self, index: ProblemIndex, durations: Tuple[int, ...]):
+        """Variables, constraints and cliques; unchanged while the conflict structure is the same"""
+        self.durations = durations if any(d > 1 for d in durations) else None
         
-        # Add room constraints (if rooms are specified)
-        room_events = {}
-        for event in input_data['events']:
-            if 'room' in event:
-                if event['room'] not in room_events:
-                    room_events[event['room']] = []
-                room_events[event['room']].append(event['id'])
+        # Define variables (interned event ints)
+        self.variables = list(range(index.num_events))
         
-        for room, events in room_events.items():
+        # Define constraints: every teacher, room and student group
+        # event list is an all-different constraint (a clique of 'diff' pairs)
+        self.constraints = []
+        self.cliques = []
+        self.var_cliques = {var: [] for var in self.variables}
+        self.neighbors = {var: set() for var in self.variables}
+        for events in index.resource_events():
+            if len(events) < 2:
+                continue
+            for event in events:
+                self.var_cliques[event].append(len(self.cliques))
+            self.cliques.append(events)
             for i, event1 in enumerate(events):
                 for event2 in events[i+1:]:
                     self.constraints.append((event1, event2, 'diff'))
+                    self.neighbors[event1].add(event2)
+                    self.neighbors[event2].add(event1)
         
-        # Add student group constraints
-        group_events = {}
-        for event in input_data['events']:
-            for group in event['student_groups']:
-                if group not in group_events:
-                    group_events[group] = []
-                group_events[group].append(event['id'])
-        
-        for group, events in group_events.items():
-            for i, event1 in enumerate(events):
-                for event2 in events[i+1:]:
-                    self.constraints.append((event1, event2, 'diff'))
+        # Pairwise-conflicting events fixed to slots 0..k-1 to break slot symmetry;
+        # with blocks, slots are not interchangeable (only whole days are)
+        self.symmetry_clique = FeasibilityAnalyzer.find_clique(index) if self.durations is None else []
     
     def _solve_csp(self) -> Dict:
-        """Solve the CSP using backtracking"""
+        """Solve the CSP using backtracking with all-different propagation"""
+        self.nodes_explored = 0
+        self.backtracks = 0
+        self.best_assignment = {}
+        self.cancelled = False
+        self.trail = []
+        self.slot_use = [0] * self.num_timeslots
         assignment = {}
-        return self._backtrack(assignment)
+        try:
+            solution = None
+            if self._break_symmetry(assignment):
+                solution = self._backtrack(assignment)
+        except SolveCancelled:
+            # Best-so-far: the deepest consistent partial assignment reached
+            self.cancelled = True
+            return dict(self.best_assignment)
+        self.progress.report('search', len(self.variables) if solution else len(self.best_assignment),
+                             len(self.variables), force=True)
+        return solution
+    
+    def _break_symmetry(self, assignment: Dict) -> bool:
+        """
+        Fix the symmetry clique to slots 0..k-1 at the root
+        Slots are interchangeable, so any solution can be relabelled to this
+        one; a clique larger than the slot count proves infeasibility at once.
+        """
+        if len(self.symmetry_clique) > self.num_timeslots:
+            return False
+        for slot, var in enumerate(self.symmetry_clique):
+            if var in assignment:
+                # Forced by propagation from earlier clique members
+                if assignment[var] != slot:
+                    return False
+                continue
+            if slot not in self.domains[var] or not self._assign(var, slot, assignment):
+                return False
+        if len(assignment) > len(self.best_assignment):
+            self.best_assignment = dict(assignment)
+        return True
+    
+    def _checkpoint(self):
+        """Poll cancellation and emit throttled progress"""
+        self.cancellation.check()
+        if self.progress.due():
+            self.progress.report('search', len(self.best_assignment), len(self.variables),
+                                 nodes_explored=self.nodes_explored, backtracks=self.backtracks)
     
     def _backtrack(self, assignment: Dict) -> Dict:
         """Backtracking algorithm for CSP"""
@@ -77,145 +187,144 @@ class ConstraintModel(SchedulerInterface):
             
         var = self._select_unassigned_variable(assignment)
         for value in self._order_domain_values(var, assignment):
-            if self._is_consistent(var, value, assignment):
-                assignment[var] = value
+            mark = len(self.trail)
+            self.nodes_explored += 1
+            if self.nodes_explored & (self.CHECK_INTERVAL - 1) == 0:
+                self._checkpoint()
+            if self._assign(var, value, assignment):
+                if len(assignment) > len(self.best_assignment):
+                    self.best_assignment = dict(assignment)
                 result = self._backtrack(assignment)
                 if result is not None:
                     return result
-                del assignment[var]
+            self._undo(mark, assignment)
+            self.backtracks += 1
         return None
     
-    def _select_unassigned_variable(self, assignment: Dict) -> str:
-        """Select next unassigned variable (MRV heuristic)"""
-        unassigned = [v for v in self.variables if v not in assignment]
-        return min(unassigned, key=lambda v: len(self.domains[v]))
-    
-    def _order_domain_values(self, var: str, assignment: Dict) -> List[int]:
-        """Order domain values (least constraining value heuristic)"""
-        return sorted(self.domains[var])
-    
-    def _is_consistent(self, var: str, value: int, assignment: Dict) -> bool:
-        """Check if assignment is consistent with constraints"""
-        for (var1, var2, constraint) in self.constraints:
-            if var1 == var or var2 == var:
-                other_var = var1 if var2 == var else var2
-                if other_var in assignment:
-                    if constraint == 'diff' and assignment[other_var] == value:
-                        return False
+    def _assign(self, var: int, value: int, assignment: Dict) -> bool:
+        """
+        Assign var and propagate; False on a wipe-out (caller undoes the trail)
+        Forward checking removes the value (for blocks, every start that
+        overlaps the block) from every neighbour; neighbours left with one slot
+        are assigned in turn. Each all-different constraint whose members lost
+        values is then checked for fewer start slots than events.
+        """
+        trail = self.trail
+        durations = self.durations
+        queue = [(var, value)]
+        touched = set()
+        while queue:
+            var, value = queue.pop()
+            for other in self.domains[var]:
+                if other != value:
+                    trail.append((var, other))
+            self.domains[var] = {value}
+            assignment[var] = value
+            self.slot_use[value] += 1
+            trail.append((var, None))
+            for neighbor in self.neighbors[var]:
+                domain = self.domains[neighbor]
+                if durations is None:
+                    if value not in domain:
+                        continue
+                    blocked = (value,)
+                else:
+                    # Starts whose interval [start, start + d') meets [value, value + d)
+                    blocked = [start for start in range(value - durations[neighbor] + 1, value + durations[var])
+                               if start in domain]
+                    if not blocked:
+                        continue
+                if neighbor in assignment:
+                    return False
+                for start in blocked:
+                    domain.discard(start)
+                    trail.append((neighbor, start))
+                if not domain:
+                    return False
+                touched.update(self.var_cliques[neighbor])
+                if len(domain) == 1:
+                    queue.append((neighbor, next(iter(domain))))
+        
+        # Pigeonhole (Hall) check on the all-different constraints touched
+        for clique in touched:
+            members = self.cliques[clique]
+            if durations is not None:
+                if self._packing_bound(members) < len(members):
+                    return False
+                continue
+            slots = set()
+            for member in members:
+                slots |= self.domains[member]
+            if len(slots) < len(members):
+                return False
         return True
     
-    def _convert_to_schedule(self, solution: Dict, input_data: Dict) -> Dict:
+    def _packing_bound(self, members: List[int]) -> int:
+        """
+        Most pairwise-disjoint blocks the members' domains offer
+        The block version of the Hall check: members of one all-different
+        constraint need disjoint intervals, and earliest-end greedy over the
+        candidate intervals (shortest per start) finds the maximum count.
+        """
+        ends = {}
+        for member in members:
+            duration = self.durations[member]
+            for start in self.domains[member]:
+                if start not in ends or ends[start] > start + duration:
+                    ends[start] = start + duration
+        count, free = 0, 0
+        for end, start in sorted((end, start) for start, end in ends.items()):
+            if start >= free:
+                count += 1
+                free = end
+        return count
+    
+    def _undo(self, mark: int, assignment: Dict):
+        """Restore domains and assignments recorded after trail position mark"""
+        trail = self.trail
+        while len(trail) > mark:
+            var, value = trail.pop()
+            if value is None:
+                self.slot_use[assignment.pop(var)] -= 1
+            else:
+                self.domains[var].add(value)
+    
+    def _select_unassigned_variable(self, assignment: Dict) -> int:
+        """Select next unassigned variable (MRV heuristic, most neighbours, then rank on ties)"""
+        unassigned = [v for v in self.variables if v not in assignment]
+        return min(unassigned, key=lambda v: (len(self.domains[v]), -len(self.neighbors[v]), self.ranks[v]))
+    
+    def _order_domain_values(self, var: int, assignment: Dict) -> List[int]:
+        """
+        Used slots first, then a single unused one
+        Unused slots have not been removed from any domain, so they are
+        interchangeable and trying more than one repeats the same subtree.
+        Blocks make slots differ by position in the day, so all are tried.
+        """
+        values = sorted(self.domains[var])
+        if self.durations is not None:
+            return values
+        used = [value for value in values if self.slot_use[value]]
+        fresh = next((value for value in values if not self.slot_use[value]), None)
+        return used + [fresh] if fresh is not None else used
+    
+    def _convert_to_schedule(self, solution: Dict, index: ProblemIndex) -> Dict:
         """Convert CSP solution to timetable schedule"""
         if solution is None:
             return {'error': 'No solution found'}
             
-        schedule = {
-            'timeslots': {},
-            'events': [],
-            'teachers': {},
-            'rooms': {},
-            'student_groups': {}
-        }
-        
-        # Group events by timeslot
-        for event_id, timeslot in solution.items():
-            if timeslot not in schedule['timeslots']:
-                schedule['timeslots'][timeslot] = []
-            event = next(e for e in input_data['events'] if e['id'] == event_id)
-            schedule['timeslots'][timeslot].append(event)
-            schedule['events'].append(event)
-            
-            # Track teacher schedules
-            if event['teacher'] not in schedule['teachers']:
-                schedule['teachers'][event['teacher']] = []
-            schedule['teachers'][event['teacher']].append({
-                'timeslot': timeslot,
-                'event': event
-            })
-            
-            # Track room usage if specified
-            if 'room' in event:
-                if event['room'] not in schedule['rooms']:
-                    schedule['rooms'][event['room']] = []
-                schedule['rooms'][event['room']].append({
-                    'timeslot': timeslot,
-                    'event': event
-                })
-            
-            # Track student group schedules
-            for group in event['student_groups']:
-                if group not in schedule['student_groups']:
-                    schedule['student_groups'][group] = []
-                schedule['student_groups'][group].append({
-                    'timeslot': timeslot,
-                    'event': event
-                })
-        
-        return schedule
+        return ScheduleBuilder.build(
+            (timeslot, index.events[event_pos]) for event_pos, timeslot in solution.items()
+        )
     
     def validate_schedule(self, schedule: Dict) -> bool:
         """Validate the generated schedule"""
         if 'error' in schedule:
             return False
-            
-        # Check for teacher conflicts
-        for teacher, assignments in schedule['teachers'].items():
-            timeslots = [a['timeslot'] for a in assignments]
-            if len(timeslots) != len(set(timeslots)):
-                return False
-                
-        # Check for room conflicts
-        for room, assignments in schedule['rooms'].items():
-            timeslots = [a['timeslot'] for a in assignments]
-            if len(timeslots) != len(set(timeslots)):
-                return False
-                
-        # Check for student group conflicts
-        for group, assignments in schedule['student_groups'].items():
-            timeslots = [a['timeslot'] for a in assignments]
-            if len(timeslots) != len(set(timeslots)):
-                return False
-                
-        return True
+        return not ScheduleBuilder.conflicts(schedule)
     
     def get_conflicts(self, schedule: Dict) -> List[Dict]:
         """Get list of conflicts in the schedule"""
         if 'error' in schedule:
             return [{'type': 'No solution', 'message': schedule['error'], 'resources': []}]
-            
-        conflicts = []
-        
-        # Check teacher conflicts
-        for teacher, assignments in schedule['teachers'].items():
-            timeslots = [a['timeslot'] for a in assignments]
-            if len(timeslots) != len(set(timeslots)):
-                conflict_times = [t for t in timeslots if timeslots.count(t) > 1]
-                conflicts.append({
-                    'type': 'Teacher conflict',
-                    'message': f"Teacher {teacher} scheduled for multiple events at times {conflict_times}",
-                    'resources': [teacher]
-                })
-        
-        # Check room conflicts
-        for room, assignments in schedule['rooms'].items():
-            timeslots = [a['timeslot'] for a in assignments]
-            if len(timeslots) != len(set(timeslots)):
-                conflict_times = [t for t in timeslots if timeslots.count(t) > 1]
-                conflicts.append({
-                    'type': 'Room conflict',
-                    'message': f"Room {room} scheduled for multiple events at times {conflict_times}",
-                    'resources': [room]
-                })
-        
-        # Check student group conflicts
-        for group, assignments in schedule['student_groups'].items():
-            timeslots = [a['timeslot'] for a in assignments]
-            if len(timeslots) != len(set(timeslots)):
-                conflict_times = [t for t in timeslots if timeslots.count(t) > 1]
-                conflicts.append({
-                    'type': 'Student group conflict',
-                    'message': f"Group {group} scheduled for multiple events at times {conflict_times}",
-                    'resources': [group]
-                })
-        
-        return conflicts
\ No newline at end of file
+        return ScheduleBuilder.conflicts(schedule)
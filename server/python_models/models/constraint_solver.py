@@ -0,0 +1,14 @@
+# python_models/models/constraint_solver.py
+"""CLI entry point for ConstraintModel (algorithm 'csp' in python.controller.js)"""
+import os
+import sys
+
+if __name__ == '__main__' and __package__ in (None, ''):
+    # Run as a script by the Node executor: make the python_models package importable
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from python_models.models.constraint_model import ConstraintModel
+from python_models.utils.cli import run_model
+
+if __name__ == '__main__':
+    sys.exit(run_model(ConstraintModel))
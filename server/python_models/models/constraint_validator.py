@@ -0,0 +1,57 @@
+# python_models/models/constraint_validator.py
+"""
+CLI entry point for the pre-solve feasibility check (validateConstraints in python.controller.js)
+
+Writes one {"type": "result", "valid": ..., "issues": [...], "bounds": {...}} line.
+The problem may be given at the top level or under 'constraints'.
+"""
+import os
+import sys
+
+if __name__ == '__main__' and __package__ in (None, ''):
+    # Run as a script by the Node executor: make the python_models package importable
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from python_models.utils.cli import read_input, write_message
+from python_models.utils.feasibility import FeasibilityAnalyzer
+from python_models.utils.instrumentation import Instrumentation
+from python_models.utils.vtu_validator import VTUValidator
+
+
+def main(argv=None) -> int:
+    argv = sys.argv if argv is None else argv
+    try:
+        input_data = read_input(argv)
+    except ValueError as e:
+        write_message({'type': 'result', 'valid': False,
+                       'issues': [{'type': 'Schema', 'severity': 'error', 'message': f"Invalid input JSON: {e}",
+                                   'resources': []}]})
+        return 0
+
+    problem = input_data
+    if 'events' not in problem and isinstance(input_data.get('constraints'), dict):
+        problem = input_data['constraints']
+    config = input_data.get('config', {})
+    instrumentation = Instrumentation.from_config(config)
+
+    with instrumentation.run():
+        with instrumentation.phase('validation'):
+            validation = VTUValidator.validate_input_schema(
+                problem, max_errors=config.get('max_errors', 50), build_index=True)
+        if not validation['valid']:
+            write_message({
+                'type': 'result',
+                'valid': False,
+                'issues': [{'type': 'Schema', 'severity': 'error', 'message': error, 'resources': []}
+                           for error in validation['errors']]
+            })
+            return 0
+        with instrumentation.phase('feasibility'):
+            report = FeasibilityAnalyzer.analyze(validation['index'])
+
+    write_message(dict(report, type='result', stats=instrumentation.stats() if instrumentation.enabled else None))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
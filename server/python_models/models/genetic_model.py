@@ -0,0 +1,293 @@
+# python_models/models/genetic_model.py
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import os
+import numpy as np
+from ..base.problem_index import ProblemIndex
+from ..base.scheduler_interface import SchedulerInterface
+from ..utils.block_layout import BlockLayout
+from ..utils.cancellation import CancellationToken, ProgressReporter, init_worker, mark_cancelled, worker_state
+from ..utils.instrumentation import Instrumentation
+from ..utils.schedule_builder import ScheduleBuilder
+
+
+class ClashEvaluator:
+    """
+    Vectorised fitness over array-encoded chromosomes (event -> slot vectors)
+    Every (event, resource) membership is one entry of two int32 arrays; a
+    resource clashes in a slot once per extra event booked there, so the clash
+    count of an individual is memberships minus occupied (resource, slot) buckets.
+    A block event (see BlockLayout) has one membership per period it covers,
+    offset from its start gene by member_offsets.
+    """
+
+    def __init__(self, member_events: np.ndarray, member_resources: np.ndarray,
+                 num_events: int, num_resources: int, num_timeslots: int,
+                 member_offsets: Optional[np.ndarray] = None):
+        self.member_events = member_events
+        self.member_resources = member_resources
+        self.member_offsets = member_offsets
+        self.num_events = num_events
+        self.num_buckets = max(1, num_resources * num_timeslots)
+        self.num_timeslots = num_timeslots
+
+    @classmethod
+    def from_index(cls, index: ProblemIndex, num_timeslots: int,
+                   durations: Optional[Tuple[int, ...]] = None) -> 'ClashEvaluator':
+        """durations: periods per event (None when every event lasts one period)"""
+        events, resources, offsets = [], [], []
+        num_teachers, num_groups = len(index.teacher_ids), len(index.group_ids)
+        for e in range(index.num_events):
+            rows = [index.event_teacher[e]] if index.event_teacher[e] >= 0 else []
+            rows.extend(num_teachers + g for g in index.event_groups[e])
+            if index.event_room[e] >= 0:
+                rows.append(num_teachers + num_groups + index.event_room[e])
+            for offset in range(durations[e] if durations else 1):
+                events.extend([e] * len(rows))
+                resources.extend(rows)
+                offsets.extend([offset] * len(rows))
+        return cls(
+            np.asarray(events, dtype=np.int32),
+            np.asarray(resources, dtype=np.int32),
+            index.num_events,
+            num_teachers + num_groups + len(index.room_ids),
+            num_timeslots,
+            np.asarray(offsets, dtype=np.int32) if durations else None
+        )
+
+    def evaluate(self, population: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return per-individual clash counts and a per-gene 'in a clash' mask
+        population has shape (individuals, events) with slot values
+        """
+        size = population.shape[0]
+        members = self.member_events.shape[0]
+        if members == 0 or size == 0:
+            return np.zeros(size, dtype=np.int64), np.zeros(population.shape, dtype=bool)
+
+        offsets = (np.arange(size, dtype=np.int64) * self.num_buckets)[:, None]
+        keys = offsets + self.member_resources.astype(np.int64) * self.num_timeslots + population[:, self.member_events]
+        if self.member_offsets is not None:
+            keys += self.member_offsets
+        counts = np.bincount(keys.ravel(), minlength=size * self.num_buckets)
+        occupied = np.count_nonzero(counts.reshape(size, self.num_buckets), axis=1)
+        clashes = members - occupied
+
+        clashing = counts[keys] > 1
+        gene_keys = (np.arange(size, dtype=np.int64) * self.num_events)[:, None] + self.member_events
+        flags = np.bincount(gene_keys.ravel(), weights=clashing.ravel(), minlength=size * self.num_events)
+        return clashes, flags.reshape(size, self.num_events) > 0
+
+
+def _evaluate_chunk(population: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Worker body: clash counts and bit-packed clash flags for one slice of the population"""
+    clashes, flags = worker_state('evaluator').evaluate(population.astype(np.int32))
+    return clashes, np.packbits(flags, axis=1)
+
+
+class GeneticModel(SchedulerInterface):
+    """
+    Timetable scheduler using a genetic algorithm over event -> timeslot vectors
+    A block event's gene is its start slot, drawn only from the starts where
+    the block fits its day (BlockLayout.starts).
+    """
+
+    # Genes (individuals x events) per generation below which evaluation stays
+    # in-process: smaller populations cost more to ship to workers than to score
+    PARALLEL_MIN_GENES = 250_000
+
+    def __init__(self, instrumentation: Optional[Instrumentation] = None,
+                 population_size: int = 50, generations: int = 1000,
+                 mutation_rate: float = 0.02, elite: int = 2, workers: int = 1,
+                 time_limit: Optional[float] = None, seed: Optional[int] = None):
+        """
+        - mutation_rate: probability that a gene involved in a clash is reassigned
+          (every gene also mutates with probability 1/events for diversity)
+        - workers: processes used for fitness evaluation; 1 evaluates in-process,
+          None uses every CPU. Each generation ships the whole population, so
+          workers only pay off from PARALLEL_MIN_GENES genes (e.g. 200
+          individuals x 1250 events) on multi-core hosts; smaller runs stay
+          in-process whatever workers says
+        - time_limit: seconds before returning the best individual found
+        """
+        self.instrumentation = instrumentation or Instrumentation.disabled()
+        self.population_size = max(2, population_size)
+        self.generations = generations
+        self.mutation_rate = mutation_rate
+        self.elite = max(0, min(elite, self.population_size - 1))
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.time_limit = time_limit
+        self.seed = seed
+        # Evaluator of the last (ProblemIndex.structure(), horizon, durations) seen,
+        # kept across reset() for repeat solves; it holds no reference to the index
+        self._cached_evaluator = (None, None)
+        self.reset(stats=False)
+
+    def reset(self, stats: bool = True):
+        super().reset(stats)
+        self.best_clashes = None
+        self.generations_run = 0
+
+    @classmethod
+    def from_config(cls, config: Dict, instrumentation: Optional[Instrumentation] = None) -> 'GeneticModel':
+        """Build from the 'config' block sent by python.controller.js"""
+        return cls(
+            instrumentation,
+            population_size=config.get('population_size', 50),
+            generations=config.get('max_iterations', config.get('generations', 1000)),
+            mutation_rate=config.get('mutation_rate', 0.02),
+            elite=config.get('elite', 2),
+            workers=config.get('workers', 1),
+            time_limit=config.get('time_limit'),
+            seed=config.get('seed')
+        )
+
+    def generate_schedule(self, input_data: Dict, index: Optional[ProblemIndex] = None,
+                          cancellation: Optional[CancellationToken] = None,
+                          progress: Optional[ProgressReporter] = None) -> Dict:
+        """Generate schedule by evolving a population of slot vectors"""
+        self.reset(stats=False)
+        cancellation = cancellation or CancellationToken.never()
+        progress = progress or ProgressReporter.disabled()
+        if self.time_limit is not None:
+            cancellation = cancellation.with_time_limit(self.time_limit)
+        instr = self.instrumentation
+        with instr.run():
+            with instr.phase('index'):
+                index = ProblemIndex.resolve(input_data, index)
+                num_timeslots = index.timeslots(40)
+                layout = BlockLayout.from_input(input_data, num_timeslots)
+                durations = tuple(BlockLayout.durations(index))
+                if all(d == 1 for d in durations):
+                    durations = None
+                evaluator = self._evaluator(index, num_timeslots, durations)
+                starts = self._start_table(layout, durations) if durations else None
+            with instr.phase('evolution'):
+                best = self._evolve(evaluator, index.num_events, num_timeslots, cancellation, progress, starts)
+            with instr.phase('conversion'):
+                schedule = self._convert_to_schedule(best, index)
+        if cancellation.reason is not None and self.best_clashes:
+            # Stopped early with clashes left: the result is best-so-far
+            mark_cancelled(schedule, cancellation, [])
+        instr.gauge('generations', self.generations_run)
+        instr.gauge('best_clashes', self.best_clashes)
+        instr.gauge('colors', len(schedule['timeslots']))
+        return instr.attach(schedule)
+
+    def _evaluator(self, index: ProblemIndex, num_timeslots: int,
+                   durations: Optional[Tuple[int, ...]] = None) -> ClashEvaluator:
+        cached_key, evaluator = self._cached_evaluator
+        key = (index.structure(), num_timeslots, durations)
+        if cached_key != key:
+            evaluator = ClashEvaluator.from_index(index, num_timeslots, durations)
+            self._cached_evaluator = (key, evaluator)
+        return evaluator
+
+    @staticmethod
+    def _start_table(layout: BlockLayout, durations: Tuple[int, ...]) -> Tuple[np.ndarray, np.ndarray]:
+        """(events x starts) table of valid start slots, zero padded, and the valid count per event"""
+        rows = [layout.starts(d) for d in durations]
+        misfits = [e for e, row in enumerate(rows) if not row]
+        if misfits:
+            raise ValueError(f"Events at positions {misfits[:10]} are longer than a day or the horizon")
+        table = np.zeros((len(rows), max(len(row) for row in rows)), dtype=np.int32)
+        for e, row in enumerate(rows):
+            table[e, :len(row)] = row
+        return table, np.asarray([len(row) for row in rows], dtype=np.int64)
+
+    @staticmethod
+    def _random_slots(rng: np.random.Generator, columns: np.ndarray, num_timeslots: int,
+                      starts: Optional[Tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+        """A random slot for each gene column: any slot, or a valid block start when starts is set"""
+        if starts is None:
+            return rng.integers(0, num_timeslots, size=columns.shape, dtype=np.int32)
+        table, counts = starts
+        return table[columns, rng.integers(0, counts[columns])]
+
+    def _evolve(self, evaluator: ClashEvaluator, num_events: int, num_timeslots: int,
+                cancellation: CancellationToken, progress: ProgressReporter,
+                starts: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> np.ndarray:
+        rng = np.random.default_rng(self.seed)
+        size = self.population_size
+        columns = np.broadcast_to(np.arange(num_events), (size, num_events))
+        population = self._random_slots(rng, columns, num_timeslots, starts)
+        best, self.best_clashes, self.generations_run = population[0], None, 0
+        if num_events == 0:
+            self.best_clashes = 0
+            return best
+
+        pool = None
+        if self.workers > 1 and size * num_events >= self.PARALLEL_MIN_GENES:
+            pool = ProcessPoolExecutor(self.workers, initializer=init_worker, initargs=({'evaluator': evaluator},))
+        try:
+            for generation in range(self.generations + 1):
+                clashes, flags = self._evaluate(evaluator, population, pool)
+                order = np.argsort(clashes, kind='stable')
+                if self.best_clashes is None or clashes[order[0]] < self.best_clashes:
+                    best, self.best_clashes = population[order[0]].copy(), int(clashes[order[0]])
+                self.generations_run = generation
+                if progress.due():
+                    progress.report('evolution', generation, self.generations,
+                                    best_conflicts=self.best_clashes)
+                if self.best_clashes == 0 or generation == self.generations or cancellation.cancelled:
+                    break
+                if cancellation.beaten(self.best_clashes):
+                    # A portfolio engine already posted fewer clashes
+                    break
+                population = self._next_generation(rng, population, clashes, flags, order, num_timeslots, starts)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        progress.report('evolution', self.generations_run, self.generations,
+                        best_conflicts=self.best_clashes, force=True)
+        return best
+
+    def _evaluate(self, evaluator: ClashEvaluator, population: np.ndarray,
+                  pool: Optional[ProcessPoolExecutor]) -> Tuple[np.ndarray, np.ndarray]:
+        if pool is None:
+            return evaluator.evaluate(population)
+        # One chunk per worker; slots fit in a byte and flags come back bit-packed
+        if evaluator.num_timeslots <= 256:
+            population = population.astype(np.uint8)
+        chunks = np.array_split(population, self.workers)
+        results = list(pool.map(_evaluate_chunk, chunks))
+        flags = np.unpackbits(np.concatenate([r[1] for r in results]), axis=1, count=population.shape[1])
+        return np.concatenate([r[0] for r in results]), flags.astype(bool)
+
+    def _next_generation(self, rng: np.random.Generator, population: np.ndarray, clashes: np.ndarray,
+                         flags: np.ndarray, order: np.ndarray, num_timeslots: int,
+                         starts: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> np.ndarray:
+        size, num_events = population.shape
+        children = size - self.elite
+
+        # Binary tournament selection for both parents
+        def tournament():
+            a, b = rng.integers(0, size, children), rng.integers(0, size, children)
+            return np.where(clashes[a] <= clashes[b], a, b)
+        first, second = tournament(), tournament()
+
+        # Uniform crossover; clash flags follow the gene they came from
+        mask = rng.random((children, num_events)) < 0.5
+        offspring = np.where(mask, population[first], population[second])
+        offspring_flags = np.where(mask, flags[first], flags[second])
+
+        # Conflict-directed mutation plus a low background rate
+        mutate = (offspring_flags & (rng.random((children, num_events)) < self.mutation_rate)) \
+            | (rng.random((children, num_events)) < 1.0 / num_events)
+        offspring[mutate] = self._random_slots(rng, np.nonzero(mutate)[1], num_timeslots, starts)
+
+        return np.concatenate([population[order[:self.elite]], offspring])
+
+    def _convert_to_schedule(self, slots: np.ndarray, index: ProblemIndex) -> Dict:
+        """Convert the best chromosome to timetable schedule"""
+        return ScheduleBuilder.build(
+            (timeslot, index.events[event_pos]) for event_pos, timeslot in enumerate(slots.tolist())
+        )
+
+    def validate_schedule(self, schedule: Dict) -> bool:
+        """Validate the generated schedule"""
+        return not self.get_conflicts(schedule)
+
+    def get_conflicts(self, schedule: Dict) -> List[Dict]:
+        """Get list of conflicts in the schedule"""
+        return ScheduleBuilder.conflicts(schedule)
@@ -0,0 +1,183 @@
+# python_models/models/local_search_model.py
+from typing import Dict, List, Optional, Sequence
+import random
+from ..base.problem_index import ProblemIndex
+from ..base.scheduler_interface import SchedulerInterface
+from ..utils.block_layout import BlockLayout
+from ..utils.cancellation import CancellationToken, ProgressReporter, mark_cancelled
+from ..utils.instrumentation import Instrumentation
+from ..utils.reproducibility import Reproducibility
+from ..utils.schedule_builder import ScheduleBuilder
+
+
+class LocalSearchModel(SchedulerInterface):
+    """
+    Timetable scheduler using greedy construction followed by min-conflicts repair
+    Block events (see BlockLayout) move between valid starts and book every
+    period they cover.
+    Repair stops early once the cancellation token's shared incumbent (another
+    portfolio engine's result) is better than the best assignment found here.
+    """
+
+    # Repair steps between cancellation/progress checks
+    CHECK_INTERVAL = 512
+
+    def __init__(self, instrumentation: Optional[Instrumentation] = None,
+                 max_steps: int = 200000, noise: float = 0.05, seed: Optional[int] = None):
+        """
+        - max_steps: repair moves before giving up with the best assignment found
+        - noise: probability of moving a clashing event to a random slot
+        """
+        self.instrumentation = instrumentation or Instrumentation.disabled()
+        self.max_steps = max_steps
+        self.noise = noise
+        self.seed = seed
+        self.reset(stats=False)
+
+    def reset(self, stats: bool = True):
+        super().reset(stats)
+        self.best_clashes = None
+        self.steps = 0
+        self.pruned = False
+
+    def generate_schedule(self, input_data: Dict, index: Optional[ProblemIndex] = None,
+                          cancellation: Optional[CancellationToken] = None,
+                          progress: Optional[ProgressReporter] = None) -> Dict:
+        """Generate schedule by repairing a greedy assignment"""
+        self.reset(stats=False)
+        cancellation = cancellation or CancellationToken.never()
+        progress = progress or ProgressReporter.disabled()
+        instr = self.instrumentation
+        with instr.run():
+            with instr.phase('index'):
+                index = ProblemIndex.resolve(input_data, index)
+                num_timeslots = index.timeslots(40)
+                resources = self._event_resources(index)
+                layout = BlockLayout.from_input(input_data, num_timeslots)
+                durations = BlockLayout.durations(index)
+                starts = [layout.starts(d) for d in durations]
+                misfits = [index.event_ids[e] for e, row in enumerate(starts) if not row]
+                if misfits:
+                    raise ValueError(f"Events {misfits[:10]} are longer than a day or the horizon")
+            with instr.phase('construction'):
+                slots, cells = self._construct(resources, index.num_events, num_timeslots, durations, starts)
+            with instr.phase('repair'):
+                slots = self._repair(slots, cells, resources, num_timeslots, durations, starts,
+                                     cancellation, progress)
+            with instr.phase('conversion'):
+                schedule = self._convert_to_schedule(slots, index)
+        if cancellation.reason is not None and self.best_clashes:
+            mark_cancelled(schedule, cancellation, [])
+        instr.gauge('repair_steps', self.steps)
+        instr.gauge('pruned', self.pruned)
+        instr.gauge('best_clashes', self.best_clashes)
+        instr.gauge('colors', len(schedule['timeslots']))
+        return instr.attach(schedule)
+
+    @staticmethod
+    def _event_resources(index: ProblemIndex) -> List[List[int]]:
+        """Resource rows touched by each event: teachers, then groups, then rooms"""
+        num_teachers, num_groups = len(index.teacher_ids), len(index.group_ids)
+        resources = []
+        for e in range(index.num_events):
+            rows = [num_teachers + g for g in index.event_groups[e]]
+            if index.event_teacher[e] >= 0:
+                rows.append(index.event_teacher[e])
+            if index.event_room[e] >= 0:
+                rows.append(num_teachers + num_groups + index.event_room[e])
+            resources.append(rows)
+        return resources
+
+    def _construct(self, resources: List[List[int]], num_events: int, num_timeslots: int,
+                   durations: List[int], starts: List[Sequence[int]]):
+        """Place the most constrained events first, each at its least-booked start"""
+        load = {}
+        for e, rows in enumerate(resources):
+            for r in rows:
+                load[r] = load.get(r, 0) + durations[e]
+        ranks = Reproducibility.tie_break(num_events, self.seed)
+        order = sorted(range(num_events), key=lambda e: (-sum(load[r] for r in resources[e]), ranks[e]))
+
+        slots = [0] * num_events
+        # (resource * num_timeslots + slot) -> events booked there
+        cells = {}
+        for e in order:
+            rows, d = resources[e], durations[e]
+            slot = min(starts[e], key=lambda s: sum(len(cells.get(r * num_timeslots + c, ()))
+                                                    for r in rows for c in range(s, s + d)))
+            slots[e] = slot
+            for r in rows:
+                for c in range(slot, slot + d):
+                    cells.setdefault(r * num_timeslots + c, []).append(e)
+        return slots, cells
+
+    def _repair(self, slots: List[int], cells: Dict, resources: List[List[int]], num_timeslots: int,
+                durations: List[int], starts: List[Sequence[int]],
+                cancellation: CancellationToken, progress: ProgressReporter) -> List[int]:
+        rng = random.Random(self.seed)
+        over = {key for key, events in cells.items() if len(events) > 1}
+        clashes = sum(len(cells[key]) - 1 for key in over)
+        best, self.best_clashes = list(slots), clashes
+
+        self.steps = 0
+        while clashes and self.steps < self.max_steps:
+            self.steps += 1
+            if self.steps % self.CHECK_INTERVAL == 0:
+                if cancellation.cancelled:
+                    break
+                if cancellation.beaten(self.best_clashes):
+                    # Another engine already returned fewer clashes
+                    self.pruned = True
+                    break
+                if progress.due():
+                    progress.report('repair', self.steps, self.max_steps, best_conflicts=self.best_clashes)
+
+            e = rng.choice(cells[rng.choice(tuple(over))])
+            current, rows, d = slots[e], resources[e], durations[e]
+            if rng.random() < self.noise:
+                target = starts[e][rng.randrange(len(starts[e]))]
+            else:
+                # Bookings per candidate start, less this event's own (the periods
+                # the candidate shares with the current placement)
+                costs = [sum(len(cells.get(r * num_timeslots + c, ())) for r in rows for c in range(s, s + d))
+                         - len(rows) * max(0, min(s, current) + d - max(s, current))
+                         for s in starts[e]]
+                lowest = min(costs)
+                target = rng.choice([s for s, cost in zip(starts[e], costs) if cost == lowest])
+            if target == current:
+                continue
+
+            for r in rows:
+                for c in range(current, current + d):
+                    key = r * num_timeslots + c
+                    booked = cells[key]
+                    booked.remove(e)
+                    if len(booked) >= 1:
+                        clashes -= 1
+                    if len(booked) <= 1:
+                        over.discard(key)
+                for c in range(target, target + d):
+                    key = r * num_timeslots + c
+                    moved = cells.setdefault(key, [])
+                    moved.append(e)
+                    if len(moved) > 1:
+                        clashes += 1
+                        over.add(key)
+            slots[e] = target
+
+            if clashes < self.best_clashes:
+                best, self.best_clashes = list(slots), clashes
+        progress.report('repair', self.steps, self.max_steps, best_conflicts=self.best_clashes, force=True)
+        return best
+
+    def _convert_to_schedule(self, slots: List[int], index: ProblemIndex) -> Dict:
+        """Convert the event -> slot assignment to timetable schedule"""
+        return ScheduleBuilder.build((timeslot, index.events[event_pos]) for event_pos, timeslot in enumerate(slots))
+
+    def validate_schedule(self, schedule: Dict) -> bool:
+        """Validate the generated schedule"""
+        return not self.get_conflicts(schedule)
+
+    def get_conflicts(self, schedule: Dict) -> List[Dict]:
+        """Get list of conflicts in the schedule"""
+        return ScheduleBuilder.conflicts(schedule)
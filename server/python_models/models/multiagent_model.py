@@ -1,11 +1,57 @@
 # python_models/models/multiagent_model.py
-from typing import Dict, List, Set
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Set, Tuple
+import multiprocessing
+import os
+from ..base.problem_index import ProblemIndex
 from ..base.scheduler_interface import SchedulerInterface
+from ..utils.cancellation import CancellationToken, ProgressReporter, init_worker, mark_cancelled, worker_state
+from ..utils.instrumentation import Instrumentation, get_logger
+from ..utils.reproducibility import Reproducibility
+from ..utils.schedule_builder import ScheduleBuilder
+
+logger = get_logger('multiagent')
+
+def _solve_partition(partition_input: Dict, time_limit: Optional[float], seed: Optional[int]) -> Dict:
+    """Worker process body: negotiate one department's timetable (stop flag from init_worker)"""
+    token = CancellationToken(time_limit=time_limit, flag=worker_state('stop_flag'))
+    return MultiAgentModel(seed=seed).generate_schedule(partition_input, cancellation=token)
+
 
 class MultiAgentModel(SchedulerInterface):
     """Timetable scheduler using multi-agent approach"""
     
-    def __init__(self):
+    def __init__(self, instrumentation: Optional[Instrumentation] = None,
+                 partition: Optional[str] = None, workers: Optional[int] = None,
+                 start_method: Optional[str] = None, seed: Optional[int] = None):
+        """
+        - partition: group/course field to split the input by (e.g. 'program' or
+          'department'); every part is negotiated in its own process and the
+          mediator reconciles shared courses and resources in a final pass.
+          None negotiates the whole input in one loop.
+        - workers: processes for the parts (defaults to the CPU count); 1 solves
+          them one after another in-process
+        - seed: order in which course owners negotiate (None keeps input order)
+        """
+        self.instrumentation = instrumentation or Instrumentation.disabled()
+        self.partition = partition
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.start_method = start_method
+        self.seed = seed
+        self.reset(stats=False)
+
+    @classmethod
+    def from_config(cls, config: Dict, instrumentation: Optional[Instrumentation] = None) -> 'MultiAgentModel':
+        """Build from the 'config' block sent by python.controller.js"""
+        return cls(
+            instrumentation,
+            partition=config.get('partition'),
+            workers=config.get('workers'),
+            seed=config.get('seed')
+        )
+    
+    def reset(self, stats: bool = True):
+        super().reset(stats)
         self.agents = {
             'course_owners': {},
             'timetable': {},
@@ -15,14 +61,51 @@ class MultiAgentModel(SchedulerInterface):
             'educational_programs': {},
             'scene': {}
         }
+        self.index = None
+        self.positions = {}
+        self.cancellation = CancellationToken.never()
+        self.progress = ProgressReporter.disabled()
+        self.unassigned = []
+        self.num_timeslots = 40
+        # Occupied timeslots per interned resource id
+        self.occupancy = {
+            'teachers': {},
+            'rooms': {},
+            'student_groups': {}
+        }
     
-    def generate_schedule(self, input_data: Dict) -> Dict:
+    def generate_schedule(self, input_data: Dict, index: Optional[ProblemIndex] = None,
+                          cancellation: Optional[CancellationToken] = None,
+                          progress: Optional[ProgressReporter] = None) -> Dict:
         """Generate schedule using multi-agent approach"""
-        self._initialize_agents(input_data)
-        return self._run_negotiation()
+        self.reset(stats=False)
+        self.cancellation = cancellation or CancellationToken.never()
+        self.progress = progress or ProgressReporter.disabled()
+        instr = self.instrumentation
+        with instr.run():
+            with instr.phase('index'):
+                self.index = ProblemIndex.resolve(input_data, index)
+                self.num_timeslots = self.index.timeslots(40)
+                self.positions = {
+                    'teachers': self.index.teacher_pos,
+                    'rooms': self.index.room_pos,
+                    'student_groups': self.index.group_pos
+                }
+            if self.partition:
+                schedule = self._run_partitioned(input_data)
+            else:
+                with instr.phase('initialize_agents'):
+                    self._initialize_agents(input_data)
+                with instr.phase('negotiation'):
+                    schedule = self._run_negotiation()
+        if self.cancellation.reason is not None:
+            mark_cancelled(schedule, self.cancellation, self.unassigned)
+        instr.gauge('events_scheduled', len(schedule['events']))
+        instr.gauge('colors', len(schedule['timeslots']))
+        return instr.attach(schedule)
     
     def _initialize_agents(self, input_data: Dict):
-        """Initialize all agents from input data"""
+        """Initialize all agents from input data and the problem index"""
         # Course Owner Agents (COA)
         for course in input_data.get('courses', []):
             self.agents['course_owners'][course['id']] = {
@@ -34,7 +117,8 @@ class MultiAgentModel(SchedulerInterface):
         
         # Timetable Agent (TA)
         self.agents['timetable'] = {
-            'courses': input_data.get('courses', []),
+            # Copied: negotiation appends to it and must not touch the input
+            'courses': list(input_data.get('courses', [])),
             'shared_courses': input_data.get('shared_courses', []),
             'curricula': input_data.get('curricula', []),
             'student_groups': input_data.get('student_groups', []),
@@ -48,8 +132,16 @@ class MultiAgentModel(SchedulerInterface):
             'university_rooms': input_data.get('university_rooms', [])
         }
         
+        # Slots the mediator already booked (set on department parts)
+        for section, resources in input_data.get('reserved', {}).items():
+            for resource_id, timeslots in resources.items():
+                key = self._resource_key(section, resource_id)
+                self.occupancy[section].setdefault(key, set()).update(timeslots)
+        
         # Student Agents (StA)
-        for group in input_data.get('student_groups', []):
+        for group in self.index.student_groups:
+            if group is None:
+                continue
             self.agents['students'][group['id']] = {
                 'group': group,
                 'electives': group.get('electives', []),
@@ -96,55 +188,240 @@ class MultiAgentModel(SchedulerInterface):
                 'requirements': coa['requirements']
             })
         
+        total = (len(self.agents['mediator']['shared_courses']) + len(self.agents['course_owners'])
+                 + sum(len(sta['electives']) for sta in self.agents['students'].values()))
+        done = 0
+        
         # Protocol P2: MA receives shared courses and resolves conflicts
         shared_schedule = self._schedule_shared_courses()
         schedule = self._merge_schedules(schedule, shared_schedule)
+        done += len(self.agents['mediator']['shared_courses'])
         
         # Protocol P3: COA receives orders for semester courses
-        for course_id, coa in self.agents['course_owners'].items():
+        owners = list(self.agents['course_owners'].items())
+        if self.seed is not None:
+            ranks = Reproducibility.tie_break(len(owners), self.seed)
+            owners = [owner for _, owner in sorted(zip(ranks, owners), key=lambda pair: pair[0])]
+        for course_id, coa in owners:
+            if self._should_stop(course_id, done, total, schedule):
+                continue
             if course_id not in [c['id'] for c in shared_schedule['events']]:
                 course_schedule = self._schedule_course(coa)
+                if not course_schedule['events']:
+                    self._unscheduled(course_id)
                 schedule = self._merge_schedules(schedule, course_schedule)
+            done += 1
         
         # Protocol P4: COA receives registration for electives
         for student_id, sta in self.agents['students'].items():
             for elective in sta['electives']:
+                if self._should_stop(elective['id'], done, total, schedule):
+                    continue
                 elective_schedule = self._schedule_elective(elective, student_id)
+                if not elective_schedule['events']:
+                    self._unscheduled(elective['id'])
                 schedule = self._merge_schedules(schedule, elective_schedule)
+                done += 1
+        self.progress.report('negotiation', done, total, force=True)
         
         # Protocol P5: SA receives course activities
         self.agents['scene']['calendar_events'] = schedule['events']
+        if self.unassigned:
+            schedule['unassigned'] = list(self.unassigned)
         
         return schedule
     
+    @staticmethod
+    def partition_input(input_data: Dict, field: str = 'program') -> Tuple[Dict[str, Dict], List[Dict]]:
+        """
+        Split input by department/program into self-contained parts
+        A group's department is its own field, else the curriculum listing it
+        (programs map a program to its department when field is not 'program').
+        Courses follow their groups; courses spanning departments are returned
+        separately for the mediator, alongside the input's shared_courses.
+        """
+        program_field = {program['id']: program.get(field) for program in input_data.get('programs', [])}
+        curriculum_of = {}
+        for curriculum in input_data.get('curricula', []):
+            department = curriculum.get(field, program_field.get(curriculum.get('program')))
+            if department is None and field == 'program':
+                department = curriculum.get('program')
+            for group_id in curriculum.get('student_groups', []):
+                curriculum_of.setdefault(group_id, department)
+
+        department_of = {}
+        for group in input_data.get('student_groups', []):
+            department = group.get(field)
+            if department is None and group.get('program') is not None:
+                department = program_field.get(group['program'])
+            if department is None:
+                department = curriculum_of.get(group['id'])
+            department_of[group['id']] = department if department is not None else 'default'
+
+        teachers = {teacher['id']: teacher for teacher in input_data.get('teachers', [])}
+        parts, cross = {}, []
+
+        def part(department) -> Dict:
+            if department not in parts:
+                parts[department] = {
+                    'num_timeslots': input_data.get('num_timeslots'),
+                    'courses': [],
+                    'student_groups': [],
+                    'teachers': [],
+                    'programs': input_data.get('programs', []),
+                    'curricula': [c for c in input_data.get('curricula', [])
+                                  if any(department_of.get(g) == department for g in c.get('student_groups', []))]
+                }
+            return parts[department]
+
+        for group in input_data.get('student_groups', []):
+            part(department_of[group['id']])['student_groups'].append(group)
+        for course in input_data.get('courses', []):
+            departments = {department_of.get(group, 'default') for group in course.get('student_groups', [])}
+            if course.get(field) is not None:
+                departments = {course[field]}
+            if len(departments) > 1:
+                cross.append(course)
+                continue
+            department = departments.pop() if departments else teachers.get(course.get('teacher'), {}).get(field, 'default')
+            part(department)['courses'].append(course)
+
+        # Each part lists just the teachers it books
+        for department, data in parts.items():
+            used = {course.get('teacher') for course in data['courses']}
+            used.update(elective.get('teacher') for group in data['student_groups']
+                        for elective in group.get('electives', []))
+            data['teachers'] = [teachers[t] for t in used if t in teachers]
+        return parts, cross
+
+    def _run_partitioned(self, input_data: Dict) -> Dict:
+        """Mediate shared courses, negotiate departments in parallel, then reconcile"""
+        instr = self.instrumentation
+        with instr.phase('partition'):
+            parts, cross = self.partition_input(input_data, self.partition)
+        instr.gauge('partitions', len(parts))
+
+        # Protocol P2 first, as in the single loop: departments plan around shared courses
+        with instr.phase('mediation'):
+            self._initialize_agents(dict(input_data, courses=[]))
+            schedule = self._schedule_shared_courses()
+            reserved = {
+                section: {resource: [a['timeslot'] for a in assignments]
+                          for resource, assignments in schedule[section].items()}
+                for section in ('teachers', 'rooms', 'student_groups')
+            }
+            parts = {department: dict(data, reserved=reserved) for department, data in parts.items()}
+        with instr.phase('negotiation'):
+            results = self._solve_partitions(parts)
+
+        with instr.phase('reconciliation'):
+            # Department timetables in a fixed order; clashes with earlier parts are moved
+            for department in sorted(results, key=str):
+                result = results[department]
+                self.unassigned.extend(result.get('unassigned', []))
+                students_of = {}
+                for student, assignments in result.get('students', {}).items():
+                    for assignment in assignments:
+                        students_of.setdefault(assignment['event']['id'], []).append(student)
+                for event in result['events']:
+                    timeslot = event['timeslot']
+                    students = students_of.get(event['id'], ())
+                    if not self._resources_free(event, timeslot):
+                        instr.count('reconciled_events')
+                        event, timeslot = self._move_event(event)
+                        if event is None:
+                            continue
+                    self._reserve(event, timeslot)
+                    ScheduleBuilder.place(schedule, event, timeslot, students)
+
+            # Courses spanning departments go to the mediator
+            for course in cross:
+                if self.cancellation.cancelled:
+                    self.unassigned.append(course['id'])
+                    continue
+                course_schedule = self._schedule_course({
+                    'course': course,
+                    'teacher': course.get('teacher'),
+                    'student_groups': course.get('student_groups', [])
+                })
+                if not course_schedule['events']:
+                    self._unscheduled(course['id'])
+                for event in course_schedule['events']:
+                    ScheduleBuilder.place(schedule, event, event['timeslot'])
+        if self.unassigned:
+            schedule['unassigned'] = list(self.unassigned)
+        self.agents['scene']['calendar_events'] = schedule['events']
+        return schedule
+
+    def _solve_partitions(self, parts: Dict[str, Dict]) -> Dict[str, Dict]:
+        """department -> negotiated schedule, one worker process per department"""
+        results = {}
+        total = len(parts)
+        if self.workers <= 1 or total <= 1:
+            for department, data in parts.items():
+                results[department] = MultiAgentModel(seed=self.seed).generate_schedule(
+                    data, cancellation=self.cancellation)
+                self.progress.report('partitions', len(results), total, force=True)
+            return results
+
+        context = multiprocessing.get_context(self.start_method)
+        stop_flag = context.Event()
+        executor = ProcessPoolExecutor(min(self.workers, total), mp_context=context,
+                                       initializer=init_worker, initargs=({'stop_flag': stop_flag},))
+        try:
+            futures = {executor.submit(_solve_partition, data, self.cancellation.remaining(), self.seed): department
+                       for department, data in parts.items()}
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+                if self.cancellation.cancelled:
+                    # Workers return their best so far
+                    stop_flag.set()
+                for future in done:
+                    results[futures[future]] = future.result()
+                if done:
+                    self.progress.report('partitions', len(results), total, force=True)
+        finally:
+            stop_flag.set()
+            executor.shutdown(wait=True)
+        return results
+
+    def _resources_free(self, event: Dict, timeslot: int) -> bool:
+        if not self._check_teacher_available(event.get('teacher'), timeslot):
+            return False
+        if not self._check_room_available(event.get('room'), timeslot):
+            return False
+        return all(self._check_group_available(group, timeslot) for group in event.get('student_groups', []))
+
+    def _move_event(self, event: Dict):
+        """Copy of event at the first timeslot free for all its resources, (None, None) if there is none"""
+        for timeslot in range(self.num_timeslots):
+            if self._resources_free(event, timeslot):
+                # Event ids end in their timeslot
+                moved = dict(event, id=f"{event['id'].rsplit('_', 1)[0]}_{timeslot}", timeslot=timeslot)
+                return moved, timeslot
+        self.instrumentation.count('unscheduled_courses')
+        self.unassigned.append(event['id'])
+        logger.warning(f"Could not reconcile event {event['id']}", extra={'fields': {'event': event['id']}})
+        return None, None
+
     def _schedule_shared_courses(self) -> Dict:
         """Schedule shared courses using mediator agent"""
-        schedule = {
-            'timeslots': {},
-            'events': [],
-            'teachers': {},
-            'rooms': {},
-            'student_groups': {}
-        }
+        schedule = ScheduleBuilder.empty()
         
         for course in self.agents['mediator']['shared_courses']:
+            if self.cancellation.cancelled:
+                self.unassigned.append(course['id'])
+                continue
             # Find available timeslot with required room
             scheduled = False
-            for timeslot in range(40):  # Assuming 40 timeslots (5 days * 8 hours)
-                room_available = self._check_room_available(
-                    course.get('required_room'), 
-                    timeslot, 
-                    schedule
-                )
+            for timeslot in range(self.num_timeslots):
+                room_available = self._check_room_available(course.get('required_room'), timeslot)
                 
-                teacher_available = self._check_teacher_available(
-                    course['teacher'],
-                    timeslot,
-                    schedule
-                )
+                teacher_available = self._check_teacher_available(course['teacher'], timeslot)
                 
                 groups_available = all(
-                    self._check_group_available(group, timeslot, schedule)
+                    self._check_group_available(group, timeslot)
                     for group in course['student_groups']
                 )
                 
@@ -161,65 +438,42 @@ class MultiAgentModel(SchedulerInterface):
                     if 'required_room' in course:
                         event['room'] = course['required_room']
                     
-                    schedule['events'].append(event)
-                    if timeslot not in schedule['timeslots']:
-                        schedule['timeslots'][timeslot] = []
-                    schedule['timeslots'][timeslot].append(event)
-                    
-                    # Update teacher schedule
-                    if course['teacher'] not in schedule['teachers']:
-                        schedule['teachers'][course['teacher']] = []
-                    schedule['teachers'][course['teacher']].append({
-                        'timeslot': timeslot,
-                        'event': event
-                    })
-                    
-                    # Update room schedule if specified
-                    if 'room' in event:
-                        if event['room'] not in schedule['rooms']:
-                            schedule['rooms'][event['room']] = []
-                        schedule['rooms'][event['room']].append({
-                            'timeslot': timeslot,
-                            'event': event
-                        })
-                    
-                    # Update student group schedules
-                    for group in course['student_groups']:
-                        if group not in schedule['student_groups']:
-                            schedule['student_groups'][group] = []
-                        schedule['student_groups'][group].append({
-                            'timeslot': timeslot,
-                            'event': event
-                        })
-                    
+                    ScheduleBuilder.place(schedule, event, timeslot)
+                    self._reserve(event, timeslot)
                     scheduled = True
                     break
             
             if not scheduled:
-                print(f"Warning: Could not schedule shared course {course['id']}")
+                self.instrumentation.count('unscheduled_shared_courses')
+                logger.warning(f"Could not schedule shared course {course['id']}",
+                               extra={'fields': {'course': course['id']}})
         
         return schedule
     
+    def _should_stop(self, course_id: str, done: int, total: int, schedule: Dict) -> bool:
+        """Record course_id as unassigned once cancelled, otherwise report progress"""
+        if self.cancellation.cancelled:
+            self.unassigned.append(course_id)
+            return True
+        if self.progress.due():
+            self.progress.report('negotiation', done, total, events=len(schedule['events']))
+        return False
+    
+    def _unscheduled(self, course_id: str):
+        """Record a course or elective no timeslot in the horizon could take"""
+        self.instrumentation.count('unscheduled_courses')
+        self.unassigned.append(course_id)
+    
     def _schedule_course(self, course: Dict) -> Dict:
         """Schedule a regular course using course owner agent"""
-        schedule = {
-            'timeslots': {},
-            'events': [],
-            'teachers': {},
-            'rooms': {},
-            'student_groups': {}
-        }
+        schedule = ScheduleBuilder.empty()
         
         # Simple scheduling - just find first available timeslot
-        for timeslot in range(40):  # Assuming 40 timeslots (5 days * 8 hours)
-            teacher_available = self._check_teacher_available(
-                course['teacher'],
-                timeslot,
-                schedule
-            )
+        for timeslot in range(self.num_timeslots):
+            teacher_available = self._check_teacher_available(course['teacher'], timeslot)
             
             groups_available = all(
-                self._check_group_available(group, timeslot, schedule)
+                self._check_group_available(group, timeslot)
                 for group in course['student_groups']
             )
             
@@ -234,62 +488,27 @@ class MultiAgentModel(SchedulerInterface):
                     'timeslot': timeslot
                 }
                 
-                schedule['events'].append(event)
-                if timeslot not in schedule['timeslots']:
-                    schedule['timeslots'][timeslot] = []
-                schedule['timeslots'][timeslot].append(event)
-                
-                # Update teacher schedule
-                if course['teacher'] not in schedule['teachers']:
-                    schedule['teachers'][course['teacher']] = []
-                schedule['teachers'][course['teacher']].append({
-                    'timeslot': timeslot,
-                    'event': event
-                })
-                
-                # Update student group schedules
-                for group in course['student_groups']:
-                    if group not in schedule['student_groups']:
-                        schedule['student_groups'][group] = []
-                    schedule['student_groups'][group].append({
-                        'timeslot': timeslot,
-                        'event': event
-                    })
-                
+                ScheduleBuilder.place(schedule, event, timeslot)
+                self._reserve(event, timeslot)
                 break
         
         return schedule
     
     def _schedule_elective(self, elective: Dict, student_id: str) -> Dict:
         """Schedule an elective course for a student"""
-        schedule = {
-            'timeslots': {},
-            'events': [],
-            'teachers': {},
-            'rooms': {},
-            'student_groups': {},
-            'students': {}
-        }
+        schedule = ScheduleBuilder.empty()
+        schedule['students'] = {}
         
         # Find the student group
-        group_id = None
-        for group in self.agents['students'].values():
-            if student_id == group['group']['id']:
-                group_id = student_id
-                break
-        
-        if not group_id:
+        if student_id not in self.index.group_pos:
             return schedule
+        group_id = student_id
         
         # Simple scheduling - just find first available timeslot
-        for timeslot in range(40):  # Assuming 40 timeslots (5 days * 8 hours)
-            teacher_available = self._check_teacher_available(
-                elective['teacher'],
-                timeslot,
-                schedule
-            )
+        for timeslot in range(self.num_timeslots):
+            teacher_available = self._check_teacher_available(elective['teacher'], timeslot)
             
-            group_available = self._check_group_available(group_id, timeslot, schedule)
+            group_available = self._check_group_available(group_id, timeslot)
             
             if teacher_available and group_available:
                 # Schedule the elective
@@ -302,65 +521,43 @@ class MultiAgentModel(SchedulerInterface):
                     'timeslot': timeslot
                 }
                 
-                schedule['events'].append(event)
-                if timeslot not in schedule['timeslots']:
-                    schedule['timeslots'][timeslot] = []
-                schedule['timeslots'][timeslot].append(event)
-                
-                # Update teacher schedule
-                if elective['teacher'] not in schedule['teachers']:
-                    schedule['teachers'][elective['teacher']] = []
-                schedule['teachers'][elective['teacher']].append({
-                    'timeslot': timeslot,
-                    'event': event
-                })
-                
-                # Update student group schedule
-                if group_id not in schedule['student_groups']:
-                    schedule['student_groups'][group_id] = []
-                schedule['student_groups'][group_id].append({
-                    'timeslot': timeslot,
-                    'event': event
-                })
-                
-                # Update individual student schedule
-                if student_id not in schedule['students']:
-                    schedule['students'][student_id] = []
-                schedule['students'][student_id].append({
-                    'timeslot': timeslot,
-                    'event': event
-                })
-                
+                ScheduleBuilder.place(schedule, event, timeslot, students=[student_id])
+                self._reserve(event, timeslot)
                 break
         
         return schedule
     
-    def _check_room_available(self, room_id: str, timeslot: int, schedule: Dict) -> bool:
+    def _resource_key(self, section: str, resource_id):
+        """Interned int for a known resource, the raw id otherwise"""
+        return self.positions[section].get(resource_id, resource_id)
+    
+    def _is_free(self, section: str, resource_id, timeslot: int) -> bool:
+        busy = self.occupancy[section].get(self._resource_key(section, resource_id))
+        return busy is None or timeslot not in busy
+    
+    def _reserve(self, event: Dict, timeslot: int):
+        """Mark the event's teacher, room and groups as busy at timeslot"""
+        resources = [('teachers', event['teacher'])]
+        if 'room' in event:
+            resources.append(('rooms', event['room']))
+        resources.extend(('student_groups', group) for group in event['student_groups'])
+        for section, resource_id in resources:
+            key = self._resource_key(section, resource_id)
+            self.occupancy[section].setdefault(key, set()).add(timeslot)
+    
+    def _check_room_available(self, room_id: str, timeslot: int) -> bool:
         """Check if a room is available at given timeslot"""
         if not room_id:
             return True
-            
-        if room_id in schedule['rooms']:
-            for assignment in schedule['rooms'][room_id]:
-                if assignment['timeslot'] == timeslot:
-                    return False
-        return True
+        return self._is_free('rooms', room_id, timeslot)
     
-    def _check_teacher_available(self, teacher_id: str, timeslot: int, schedule: Dict) -> bool:
+    def _check_teacher_available(self, teacher_id: str, timeslot: int) -> bool:
         """Check if a teacher is available at given timeslot"""
-        if teacher_id in schedule['teachers']:
-            for assignment in schedule['teachers'][teacher_id]:
-                if assignment['timeslot'] == timeslot:
-                    return False
-        return True
+        return self._is_free('teachers', teacher_id, timeslot)
     
-    def _check_group_available(self, group_id: str, timeslot: int, schedule: Dict) -> bool:
+    def _check_group_available(self, group_id: str, timeslot: int) -> bool:
         """Check if a student group is available at given timeslot"""
-        if group_id in schedule['student_groups']:
-            for assignment in schedule['student_groups'][group_id]:
-                if assignment['timeslot'] == timeslot:
-                    return False
-        return True
+        return self._is_free('student_groups', group_id, timeslot)
     
     def _merge_schedules(self, schedule1: Dict, schedule2: Dict) -> Dict:
         """Merge two schedules together"""
@@ -411,65 +608,20 @@ class MultiAgentModel(SchedulerInterface):
             else:
                 merged['student_groups'][group] = assignments.copy()
         
+        # Merge individual student (elective) schedules
+        students = {}
+        for schedule in (schedule1, schedule2):
+            for student, assignments in schedule.get('students', {}).items():
+                students.setdefault(student, []).extend(assignments)
+        if students:
+            merged['students'] = students
+        
         return merged
     
     def validate_schedule(self, schedule: Dict) -> bool:
         """Validate the generated schedule"""
-        # Check for teacher conflicts
-        for teacher, assignments in schedule['teachers'].items():
-            timeslots = [a['timeslot'] for a in assignments]
-            if len(timeslots) != len(set(timeslots)):
-                return False
-                
-        # Check for room conflicts
-        for room, assignments in schedule['rooms'].items():
-            timeslots = [a['timeslot'] for a in assignments]
-            if len(timeslots) != len(set(timeslots)):
-                return False
-                
-        # Check for student group conflicts
-        for group, assignments in schedule['student_groups'].items():
-            timeslots = [a['timeslot'] for a in assignments]
-            if len(timeslots) != len(set(timeslots)):
-                return False
-                
-        return True
+        return not self.get_conflicts(schedule)
     
     def get_conflicts(self, schedule: Dict) -> List[Dict]:
         """Get list of conflicts in the schedule"""
-        conflicts = []
-        
-        # Check teacher conflicts
-        for teacher, assignments in schedule['teachers'].items():
-            timeslots = [a['timeslot'] for a in assignments]
-            if len(timeslots) != len(set(timeslots)):
-                conflict_times = [t for t in timeslots if timeslots.count(t) > 1]
-                conflicts.append({
-                    'type': 'Teacher conflict',
-                    'message': f"Teacher {teacher} scheduled for multiple events at times {conflict_times}",
-                    'resources': [teacher]
-                })
-        
-        # Check room conflicts
-        for room, assignments in schedule['rooms'].items():
-            timeslots = [a['timeslot'] for a in assignments]
-            if len(timeslots) != len(set(timeslots)):
-                conflict_times = [t for t in timeslots if timeslots.count(t) > 1]
-                conflicts.append({
-                    'type': 'Room conflict',
-                    'message': f"Room {room} scheduled for multiple events at times {conflict_times}",
-                    'resources': [room]
-                })
-        
-        # Check student group conflicts
-        for group, assignments in schedule['student_groups'].items():
-            timeslots = [a['timeslot'] for a in assignments]
-            if len(timeslots) != len(set(timeslots)):
-                conflict_times = [t for t in timeslots if timeslots.count(t) > 1]
-                conflicts.append({
-                    'type': 'Student group conflict',
-                    'message': f"Group {group} scheduled for multiple events at times {conflict_times}",
-                    'resources': [group]
-                })
-        
-        return conflicts
\ No newline at end of file
+        return ScheduleBuilder.conflicts(schedule)
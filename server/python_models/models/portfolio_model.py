@@ -0,0 +1,229 @@
+# python_models/models/portfolio_model.py
+from queue import Empty
+from typing import Dict, List, Optional, Sequence, Tuple
+import multiprocessing
+import sys
+import time
+from ..base.problem_index import ProblemIndex
+from ..base.scheduler_interface import SchedulerInterface
+from ..utils.block_layout import BlockLayout
+from ..utils.cancellation import CancellationToken, ProgressReporter
+from ..utils.instrumentation import Instrumentation, get_logger
+from ..utils.schedule_builder import ScheduleBuilder
+from .conflict_graph_model import ConflictGraphModel
+from .constraint_model import ConstraintModel
+from .local_search_model import LocalSearchModel
+
+logger = get_logger('portfolio')
+
+ENGINES = {
+    'conflict_graph': ConflictGraphModel,
+    'constraint': ConstraintModel,
+    'local_search': LocalSearchModel
+}
+
+
+def schedule_score(schedule: Dict, num_timeslots: int) -> Optional[Tuple[int, int, int]]:
+    """
+    (hard clashes, events beyond the slot budget, unassigned events); compared
+    lexicographically, lower is better. Returns None for a failed result (e.g.
+    'No solution found').
+    """
+    if 'error' in schedule:
+        return None
+    clashes = ScheduleBuilder.clash_count(schedule)
+    # Blocks count when any period they cover is past the budget
+    excess = sum(1 for slot, events in schedule['timeslots'].items() for event in events
+                 if int(slot) + BlockLayout.duration(event) > num_timeslots)
+    return clashes, excess, len(schedule.get('unassigned', []))
+
+
+def _run_engine(name: str, input_data: Dict, num_timeslots: int, stop_flag, incumbent, results,
+                time_limit: Optional[float], seed: Optional[int]):
+    """
+    Worker process body: solve with one engine and post (name, schedule, score, error, seconds)
+    The token carries the shared incumbent, the fewest clashes any engine has
+    posted so far. Scores rank clashes first, so an anytime engine (local
+    search) whose best has more clashes than the incumbent can no longer win
+    and stops.
+    """
+    # Forked from the CLI process: let terminate() kill losers that overrun the grace period
+    CancellationToken.restore_signal_handlers()
+    token = CancellationToken(flag=stop_flag, incumbent=incumbent)
+    if time_limit is not None:
+        # Own deadline on a child token so it does not stop the other engines
+        token = token.with_time_limit(time_limit)
+    model = ENGINES[name](seed=seed)
+    start = time.perf_counter()
+    try:
+        schedule = model.generate_schedule(input_data, cancellation=token)
+    except (RecursionError, MemoryError, TypeError, ValueError, KeyError) as e:
+        results.put((name, None, None, f"{type(e).__name__}: {e}", time.perf_counter() - start))
+        return
+    elapsed = time.perf_counter() - start
+    score = schedule_score(schedule, num_timeslots)
+    if score is not None:
+        with incumbent.get_lock():
+            incumbent.value = min(incumbent.value, score[0])
+    results.put((name, schedule, score, schedule.get('error'), elapsed))
+
+
+class PortfolioModel(SchedulerInterface):
+    """Timetable scheduler racing several engines in separate processes"""
+
+    def __init__(self, instrumentation: Optional[Instrumentation] = None,
+                 engines: Sequence[str] = ('conflict_graph', 'constraint', 'local_search'),
+                 time_limit: Optional[float] = 60.0, grace: float = 1.0,
+                 seed: Optional[int] = None, start_method: Optional[str] = None):
+        """
+        - engines: names from ENGINES to race
+        - time_limit: seconds each engine may run before returning its best so far
+        - grace: seconds losing engines get to exit after a winner is found
+        """
+        unknown = [name for name in engines if name not in ENGINES]
+        if unknown:
+            raise ValueError(f"Unknown portfolio engines: {unknown}")
+        self.instrumentation = instrumentation or Instrumentation.disabled()
+        self.engines = list(engines)
+        self.time_limit = time_limit
+        self.grace = grace
+        self.seed = seed
+        self.start_method = start_method
+        self.reset(stats=False)
+
+    def reset(self, stats: bool = True):
+        super().reset(stats)
+        self.report = {}
+
+    @classmethod
+    def from_config(cls, config: Dict, instrumentation: Optional[Instrumentation] = None) -> 'PortfolioModel':
+        """Build from the 'config' block sent by python.controller.js"""
+        return cls(
+            instrumentation,
+            engines=config.get('engines', ('conflict_graph', 'constraint', 'local_search')),
+            time_limit=config.get('time_limit', 60.0),
+            grace=config.get('grace', 1.0),
+            seed=config.get('seed')
+        )
+
+    def generate_schedule(self, input_data: Dict, index: Optional[ProblemIndex] = None,
+                          cancellation: Optional[CancellationToken] = None,
+                          progress: Optional[ProgressReporter] = None) -> Dict:
+        """Race the engines and return the first conflict-free schedule within the slot budget"""
+        self.reset(stats=False)
+        cancellation = cancellation or CancellationToken.never()
+        progress = progress or ProgressReporter.disabled()
+        instr = self.instrumentation
+        with instr.run():
+            index = ProblemIndex.resolve(input_data, index)
+            num_timeslots = index.timeslots(40)
+            # Engines rebuild their own index; the ProblemIndex is not picklable
+            engine_input = dict(input_data, num_timeslots=num_timeslots)
+            with instr.phase('race'):
+                winner, results = self._race(engine_input, num_timeslots, cancellation, progress)
+        instr.gauge('engines', len(self.engines))
+
+        self.report = {
+            'winner': winner,
+            'engines': {
+                name: {key: value for key, value in result.items() if key != 'schedule'}
+                for name, result in results.items()
+            }
+        }
+        if winner is None:
+            return instr.attach({'error': 'No engine produced a schedule', 'portfolio': self.report})
+        schedule = results[winner]['schedule']
+        schedule['engine'] = winner
+        schedule['portfolio'] = self.report
+        return instr.attach(schedule)
+
+    def _race(self, engine_input: Dict, num_timeslots: int, cancellation: CancellationToken,
+              progress: ProgressReporter) -> Tuple[Optional[str], Dict]:
+        context = multiprocessing.get_context(self.start_method)
+        stop_flag = context.Event()
+        incumbent = context.Value('q', sys.maxsize)
+        queue = context.Queue()
+        processes = {
+            name: context.Process(
+                target=_run_engine,
+                args=(name, engine_input, num_timeslots, stop_flag, incumbent, queue, self.time_limit, self.seed),
+                name=f"portfolio-{name}",
+                daemon=True
+            )
+            for name in self.engines
+        }
+        for process in processes.values():
+            process.start()
+
+        results = {name: {'status': 'running'} for name in self.engines}
+        winner = None
+        stop_deadline = None
+        try:
+            while any(r['status'] == 'running' for r in results.values()):
+                if stop_deadline is not None and time.monotonic() >= stop_deadline:
+                    break
+                if not stop_flag.is_set() and cancellation.cancelled:
+                    # Caller cancelled: engines return their best so far
+                    stop_flag.set()
+                try:
+                    name, schedule, score, error, elapsed = queue.get(timeout=0.05)
+                except Empty:
+                    for name, process in processes.items():
+                        if results[name]['status'] == 'running' and not process.is_alive() and queue.empty():
+                            results[name]['status'] = 'crashed'
+                    continue
+
+                result = results[name]
+                result.update({'seconds': round(elapsed, 4), 'schedule': schedule})
+                if score is None:
+                    result.update({'status': 'error', 'error': error})
+                    continue
+                result.update({
+                    'status': 'stopped' if schedule.get('cancelled') else 'finished',
+                    'score': {'clashes': score[0], 'over_budget': score[1], 'unassigned': score[2]}
+                })
+                progress.report('race', sum(r['status'] != 'running' for r in results.values()),
+                                len(self.engines), best_conflicts=incumbent.value, engine=name, force=True)
+                if winner is None and score == (0, 0, 0):
+                    winner = name
+                    result['status'] = 'won'
+                    stop_flag.set()
+                    stop_deadline = time.monotonic() + self.grace
+        finally:
+            stop_flag.set()
+            for process in processes.values():
+                process.join(timeout=self.grace)
+                if process.is_alive():
+                    process.terminate()
+            for name, result in results.items():
+                if result['status'] == 'running':
+                    result['status'] = 'terminated'
+
+        if winner is None:
+            winner = self._best_effort(results)
+        return winner, results
+
+    @staticmethod
+    def _best_effort(results: Dict) -> Optional[str]:
+        """Lowest-scoring engine (clashes, then over budget, then unassigned) when none reached a clean schedule"""
+        scored = [
+            (tuple(r['score'].values()), r['seconds'], name)
+            for name, r in results.items() if 'score' in r
+        ]
+        if not scored:
+            return None
+        name = min(scored)[-1]
+        results[name]['status'] = 'best_effort'
+        return name
+
+    def validate_schedule(self, schedule: Dict) -> bool:
+        """Validate the generated schedule"""
+        if 'error' in schedule:
+            return False
+        return not self.get_conflicts(schedule)
+
+    def get_conflicts(self, schedule: Dict) -> List[Dict]:
+        """Get list of conflicts in the schedule"""
+        if 'error' in schedule:
+            return [{'type': 'No solution', 'message': schedule['error'], 'resources': []}]
+        return ENGINES[schedule.get('engine', 'conflict_graph')]().get_conflicts(schedule)
@@ -0,0 +1,6 @@
+# python_models/tests/conftest.py
+import os
+import sys
+
+# Make the python_models package importable however pytest is started
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
@@ -0,0 +1,60 @@
+# python_models/tests/test_block_events.py
+import json
+from python_models import GeneticModel, LocalSearchModel, VTUValidator
+from python_models.models.portfolio_model import schedule_score
+from python_models.utils.schedule_builder import ScheduleBuilder
+
+
+def _labs_and_lectures():
+    """4 two-period labs and 3 lectures sharing one teacher and group in 12 slots"""
+    events = [{'id': f'L{i}', 'name': f'Lab {i}', 'teacher': 'T', 'student_groups': ['G'], 'is_lab': True}
+              for i in range(4)]
+    events += [{'id': f'C{i}', 'name': f'Lecture {i}', 'teacher': 'T', 'student_groups': ['G']} for i in range(3)]
+    return {
+        'events': events,
+        'teachers': [{'id': 'T', 'name': 'T'}],
+        'student_groups': [{'id': 'G', 'name': 'G'}],
+        'rooms': [],
+        'num_timeslots': 12
+    }
+
+
+def _check_blocks(schedule):
+    assert not ScheduleBuilder.conflicts(schedule)
+    for slot, events in schedule['timeslots'].items():
+        for event in events:
+            if event.get('is_lab'):
+                # Two periods within one 8-period day
+                assert int(slot) % 8 <= 6
+
+
+def test_genetic_model_places_blocks_without_overlap():
+    data = _labs_and_lectures()
+    model = GeneticModel(seed=1)
+    schedule = model.generate_schedule(data)
+    assert model.best_clashes == 0
+    _check_blocks(schedule)
+
+
+def test_local_search_places_blocks_without_overlap():
+    data = _labs_and_lectures()
+    model = LocalSearchModel(seed=1)
+    schedule = model.generate_schedule(data)
+    assert model.best_clashes == 0
+    _check_blocks(schedule)
+
+
+def test_block_past_the_horizon_counts_as_excess():
+    schedule = ScheduleBuilder.build([(11, {'id': 'L0', 'teacher': 'T', 'student_groups': [], 'is_lab': True})])
+    assert schedule_score(schedule, 12) == (0, 1, 0)
+
+
+def test_validator_rejects_blocks_longer_than_a_day():
+    data = _labs_and_lectures()
+    data['events'][0]['duration'] = 9
+    message = "Event L0 duration 9 exceeds 8 periods per day"
+    assert message in VTUValidator.validate_input_schema(data)['errors']
+    assert message in VTUValidator.validate_input_stream(json.dumps(data))['errors']
+    # config may follow the events in the stream
+    data['config'] = {'periods_per_day': 10}
+    assert VTUValidator.validate_input_stream(json.dumps(data))['valid']
@@ -0,0 +1,26 @@
+# python_models/tests/test_caches.py
+from python_models import ConflictGraphModel, ConstraintModel, ProblemIndex
+from python_models.utils.instance_generator import InstanceGenerator
+
+
+def test_graph_cache_hits_for_equal_problems():
+    data = InstanceGenerator(0).generate(num_events=120)
+    model = ConflictGraphModel()
+    first = model.generate_schedule(data, ProblemIndex.from_input(data))
+    graph = model.graph
+    second = model.generate_schedule(data, ProblemIndex.from_input(data))
+    assert model.graph is graph
+    assert first['timeslots'] == second['timeslots']
+
+
+def test_caches_rebuild_for_changed_problems():
+    data = InstanceGenerator(0).generate(num_events=120)
+    model = ConstraintModel()
+    model.generate_schedule(data)
+    key = model.setup_key
+    changed = dict(data, events=[dict(event) for event in data['events']])
+    changed['events'][0]['teacher'] = changed['events'][1]['teacher']
+    changed['events'][2]['is_lab'] = True
+    schedule = model.generate_schedule(changed)
+    assert model.setup_key != key
+    assert model.validate_schedule(schedule)
@@ -0,0 +1,33 @@
+# python_models/tests/test_conflict_graph_model.py
+from python_models import ConflictGraphModel
+from python_models.utils.cancellation import CancellationToken
+from python_models.utils.clique_graph import CliqueGraph
+from python_models.utils.instance_generator import InstanceGenerator
+
+
+class _CancelAfter(CancellationToken):
+    """Token that cancels itself on its n-th check()"""
+
+    def __init__(self, checks):
+        super().__init__()
+        self.checks = checks
+
+    def check(self):
+        self.checks -= 1
+        if self.checks <= 0:
+            self.cancel()
+        super().check()
+
+
+def test_cancelled_coloring_keeps_colors_assigned_so_far(monkeypatch):
+    monkeypatch.setattr(CliqueGraph, 'CHECK_INTERVAL', 10)
+    data = InstanceGenerator(0).generate(num_events=200)
+    # 1 check before the build, 20 while computing degrees, then 5 coloring batches
+    model = ConflictGraphModel()
+    schedule = model.generate_schedule(data, cancellation=_CancelAfter(26))
+    assert schedule['cancelled']
+    placed = {event['id'] for event in schedule['events']}
+    assert len(placed) == 40
+    assert placed.isdisjoint(schedule['unassigned'])
+    assert len(placed) + len(schedule['unassigned']) == len(data['events'])
+    assert model.validate_schedule(schedule)
@@ -0,0 +1,56 @@
+# python_models/tests/test_conflict_report.py
+import os
+import re
+from python_models import ConflictReport
+from python_models.utils.schedule_builder import ScheduleBuilder
+
+CONFLICT_SERVICE = os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'timetable', 'conflict.service.js')
+
+
+def _node_messages():
+    """conflict type -> message template literal from detectConflicts"""
+    with open(CONFLICT_SERVICE) as f:
+        source = f.read()
+    return dict(re.findall(r"type: '(\w+)',.*?message: `([^`]*)`", source, re.S))
+
+
+def _render(template, values):
+    return re.sub(r'\$\{(\w+)\}', lambda match: str(values[match.group(1)]), template)
+
+
+def test_messages_match_node_wording():
+    templates = _node_messages()
+    assert set(templates) == {'teacher', 'room', 'student'}
+    values = {'teacher': 'T1', 'room': 'R1', 'studentGroup': 'G1', 'day': 'Tuesday', 'period': '2'}
+    for conflict_type, node_field in (('teacher', 'teacher'), ('room', 'room'), ('student', 'studentGroup')):
+        message = ConflictReport._message(conflict_type, values[node_field], 'Tuesday', '2')
+        assert message == _render(templates[conflict_type], values)
+
+
+def test_later_bookings_conflict_with_the_first_subject():
+    schedule = ScheduleBuilder.build([
+        (9, {'id': 'a', 'subject': 'Maths', 'teacher': 'T1', 'room': 'R1', 'student_groups': ['G1']}),
+        (9, {'id': 'b', 'subject': 'Physics', 'teacher': 'T1', 'room': 'R2', 'student_groups': ['G1']}),
+        (9, {'id': 'c', 'subject': 'Lab', 'teacher': 'T2', 'room': 'R1', 'student_groups': ['G2']}),
+        (10, {'id': 'd', 'subject': 'Chemistry', 'teacher': 'T3', 'room': 'R3', 'student_groups': ['G1']})
+    ])
+    report = ConflictReport.build(schedule)
+    assert [(c['type'], c['event'], c['conflictWith'], c['day'], c['period']) for c in report['conflicts']] == [
+        ('teacher', 'b', 'Maths', 'Tuesday', '2'),
+        ('student', 'b', 'Maths', 'Tuesday', '2'),
+        ('room', 'c', 'Maths', 'Tuesday', '2')
+    ]
+    assert report['conflicts'][0]['message'] == 'Teacher T1 double booked for Tuesday 2'
+    assert report['summary'] == {'teacher': 1, 'room': 1, 'student': 1, 'total': 3}
+
+
+def test_blocks_conflict_in_every_period_they_cover():
+    schedule = ScheduleBuilder.build([
+        (0, {'id': 'lab', 'subject': 'Lab', 'teacher': 'T1', 'is_lab': True, 'student_groups': []}),
+        (1, {'id': 'x', 'subject': 'Maths', 'teacher': 'T1', 'student_groups': []}),
+        (2, {'id': 'y', 'subject': 'Physics', 'teacher': 'T1', 'student_groups': []})
+    ])
+    report = ConflictReport.build(schedule)
+    assert [(c['event'], c['conflictWith'], c['day'], c['period']) for c in report['conflicts']] == [
+        ('x', 'Lab', 'Monday', '2')
+    ]
@@ -0,0 +1,39 @@
+# python_models/tests/test_constraint_model.py
+import itertools
+import random
+from python_models import ConstraintModel
+
+
+def _graph_input(num_nodes, edges, num_timeslots):
+    """One event per node; each edge is a student group shared by its two events"""
+    events = [{'id': f'e{node}', 'teacher': f't{node}', 'student_groups': []} for node in range(num_nodes)]
+    for i, (u, v) in enumerate(edges):
+        events[u]['student_groups'].append(f'g{i}')
+        events[v]['student_groups'].append(f'g{i}')
+    return {'events': events, 'num_timeslots': num_timeslots}
+
+
+def _chromatic_number(num_nodes, edges):
+    for colors in range(1, num_nodes + 1):
+        for coloring in itertools.product(range(colors), repeat=num_nodes):
+            if all(coloring[u] != coloring[v] for u, v in edges):
+                return colors
+    return num_nodes
+
+
+def test_csp_matches_brute_force_chromatic_number():
+    rng = random.Random(0)
+    for _ in range(25):
+        num_nodes = rng.randint(3, 7)
+        edges = [pair for pair in itertools.combinations(range(num_nodes), 2) if rng.random() < 0.5]
+        chromatic = _chromatic_number(num_nodes, edges)
+
+        model = ConstraintModel(seed=1)
+        schedule = model.generate_schedule(_graph_input(num_nodes, edges, chromatic))
+        assert 'error' not in schedule
+        assert model.validate_schedule(schedule)
+        assert len(schedule['timeslots']) == chromatic
+
+        if chromatic > 1:
+            schedule = ConstraintModel(seed=1).generate_schedule(_graph_input(num_nodes, edges, chromatic - 1))
+            assert schedule.get('error') == 'No solution found'
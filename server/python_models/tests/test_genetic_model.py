@@ -0,0 +1,22 @@
+# python_models/tests/test_genetic_model.py
+from python_models import GeneticModel, Reproducibility
+from python_models.utils.instance_generator import InstanceGenerator
+
+
+def test_process_pool_matches_in_process(monkeypatch):
+    data = InstanceGenerator(0).generate(num_events=150)
+    local = GeneticModel(generations=10, seed=1).generate_schedule(data)
+    # Force the pool path whatever the population size
+    monkeypatch.setattr(GeneticModel, 'PARALLEL_MIN_GENES', 0)
+    pooled = GeneticModel(generations=10, seed=1, workers=2).generate_schedule(data)
+    assert Reproducibility.schedule_fingerprint(local) == Reproducibility.schedule_fingerprint(pooled)
+
+
+def test_conflicts_match_validation():
+    data = InstanceGenerator(0).generate(num_events=150)
+    model = GeneticModel(generations=0, seed=1)
+    schedule = model.generate_schedule(data)
+    conflicts = model.get_conflicts(schedule)
+    assert conflicts
+    assert not model.validate_schedule(schedule)
+    assert {c['type'] for c in conflicts} <= {'Teacher conflict', 'Room conflict', 'Student group conflict'}
@@ -0,0 +1,30 @@
+# python_models/tests/test_instrumentation.py
+from python_models.utils.instrumentation import Instrumentation
+
+
+def test_outer_peak_includes_nested_phases():
+    instr = Instrumentation(trace_memory=True)
+    with instr.run():
+        with instr.phase('big'):
+            data = bytearray(5_000_000)
+            del data
+        with instr.phase('small'):
+            data = bytearray(10)
+    memory = instr.stats()['peak_memory_bytes']
+    assert memory['big'] >= 5_000_000
+    assert memory['total'] >= memory['big']
+    assert memory['small'] < 1_000_000
+
+
+def test_flags_come_from_config():
+    instr = Instrumentation.from_config({'trace_memory': True, 'profile': True})
+    with instr.run():
+        with instr.phase('work'):
+            sum(range(1000))
+    stats = instr.stats()
+    assert 'work' in stats['peak_memory_bytes']
+    assert stats['profile']
+
+    assert not Instrumentation.from_config({'stats': False, 'trace_memory': True}).trace_memory
+    # Requests cannot choose a file to write the profile to
+    assert Instrumentation.from_config({'profile_output': '/tmp/x.prof'}).profile_output is None
@@ -0,0 +1,18 @@
+# python_models/tests/test_multiagent_model.py
+from python_models import MultiAgentModel
+from python_models.utils.instance_generator import InstanceGenerator
+
+
+def test_agents_stay_within_the_declared_horizon():
+    data = InstanceGenerator(0).generate(num_events=60)
+    model = MultiAgentModel()
+    full = model.generate_schedule(data)
+    assert model.validate_schedule(full)
+    # Elective bookings land in the per-student section
+    assert full['students']
+
+    schedule = model.generate_schedule(dict(data, num_timeslots=8))
+    assert max(int(slot) for slot in schedule['timeslots']) < 8
+    assert model.validate_schedule(schedule)
+    # Courses that no longer fit are reported, not dropped
+    assert len(schedule['events']) + len(schedule['unassigned']) == len(full['events'])
@@ -0,0 +1,38 @@
+# python_models/tests/test_portfolio_model.py
+import multiprocessing
+from python_models import LocalSearchModel, PortfolioModel
+from python_models.models.portfolio_model import schedule_score
+from python_models.utils.cancellation import CancellationToken
+from python_models.utils.instance_generator import InstanceGenerator
+from python_models.utils.schedule_builder import ScheduleBuilder
+
+
+def test_local_search_stops_when_incumbent_is_better():
+    data = dict(InstanceGenerator(0).generate(num_events=150), num_timeslots=4)
+    incumbent = multiprocessing.Value('q', 0)
+    model = LocalSearchModel(seed=1)
+    model.generate_schedule(data, cancellation=CancellationToken(incumbent=incumbent).with_time_limit(30))
+    assert model.pruned
+    assert model.best_clashes > 0
+
+
+def test_portfolio_returns_a_clean_winner():
+    data = InstanceGenerator(0).generate(num_events=60)
+    engines = ('conflict_graph', 'local_search')
+    model = PortfolioModel(engines=engines, time_limit=10, seed=1)
+    schedule = model.generate_schedule(data)
+    winner = model.report['winner']
+    assert winner in engines
+    assert schedule['engine'] == winner
+    assert model.report['engines'][winner]['status'] == 'won'
+    assert schedule_score(schedule, 40) == (0, 0, 0)
+    assert ScheduleBuilder.clash_count(schedule) == 0
+
+
+def test_best_effort_ranks_clashes_first():
+    results = {
+        'few_clashes': {'score': {'clashes': 1, 'over_budget': 9, 'unassigned': 0}, 'seconds': 2.0},
+        'many_clashes': {'score': {'clashes': 3, 'over_budget': 0, 'unassigned': 0}, 'seconds': 1.0}
+    }
+    assert PortfolioModel._best_effort(results) == 'few_clashes'
+    assert results['few_clashes']['status'] == 'best_effort'
@@ -0,0 +1,87 @@
+# python_models/tests/test_schedule_diff.py
+import copy
+import json
+import random
+from python_models import ConflictGraphModel, MultiAgentModel, ScheduleDiff
+from python_models.utils.instance_generator import InstanceGenerator
+from python_models.utils.schedule_builder import ScheduleBuilder
+
+
+def _edited(schedule, seed):
+    """Copy of schedule with random moves, room changes, edits, removals and additions"""
+    rng = random.Random(seed)
+    placements = []
+    for slot, event in ScheduleDiff.placements(schedule).values():
+        event = copy.deepcopy(event)
+        roll = rng.random()
+        if roll < 0.1:
+            continue
+        if roll < 0.3:
+            slot = rng.randrange(40)
+        elif roll < 0.4:
+            event['room'] = f"R{rng.randrange(5)}"
+        elif roll < 0.45:
+            event.pop('room', None)
+        elif roll < 0.55:
+            event['subject'] = f"changed-{event['id']}"
+        placements.append((slot, event))
+    for i in range(5):
+        placements.append((rng.randrange(40), {'id': f'new{i}', 'teacher': 'T-new', 'student_groups': [f'G{i}']}))
+    return ScheduleBuilder.build(placements)
+
+
+def _bookings(schedule, section):
+    # Booking order follows placement order, which a patch does not preserve
+    return {resource: sorted((a['timeslot'], a['event']['id']) for a in assignments)
+            for resource, assignments in schedule[section].items()}
+
+
+def test_apply_diff_round_trip():
+    data = InstanceGenerator(0).generate(num_events=120)
+    old = ConflictGraphModel().generate_schedule(data)
+    for seed in range(5):
+        new = _edited(old, seed)
+        snapshot = copy.deepcopy(old)
+        patch = ScheduleDiff.diff(old, new)
+        patched = ScheduleDiff.apply(old, patch)
+        assert ScheduleDiff.placements(patched) == ScheduleDiff.placements(new)
+        for section in ('teachers', 'rooms', 'student_groups'):
+            assert _bookings(patched, section) == _bookings(new, section)
+        assert ScheduleDiff.is_empty(ScheduleDiff.diff(patched, new))
+        assert old == snapshot
+
+
+def test_diff_survives_json_round_trip():
+    data = InstanceGenerator(1).generate(num_events=60)
+    old = ConflictGraphModel().generate_schedule(data)
+    new = _edited(old, 7)
+    # Timeslot keys come back as strings from JSON
+    patch = json.loads(json.dumps(ScheduleDiff.diff(old, new)))
+    patched = ScheduleDiff.apply(json.loads(json.dumps(old, default=str)), patch)
+    assert ScheduleDiff.placements(patched) == ScheduleDiff.placements(new)
+    assert ScheduleDiff.is_empty(ScheduleDiff.diff(old, old))
+
+
+def test_apply_keeps_students_and_other_keys():
+    data = InstanceGenerator(0).generate(num_events=60)
+    old = MultiAgentModel().generate_schedule(dict(data, num_timeslots=8))
+    assert old['students'] and old['unassigned']
+    old.pop('stats', None)
+    enrolled = ScheduleDiff.students(old)
+    moved_id = next(iter(enrolled))
+    placements = []
+    for slot, event in ScheduleDiff.placements(old).values():
+        if event['id'] == moved_id:
+            slot, event = slot + 1, dict(event, timeslot=slot + 1)
+        placements.append((slot, event))
+    new = ScheduleBuilder.build([])
+    for slot, event in placements:
+        ScheduleBuilder.place(new, event, slot, enrolled.get(event['id'], ())[1:])
+    returning = old['unassigned'][0]
+    ScheduleBuilder.place(new, {'id': returning, 'teacher': 'T-new', 'student_groups': []}, 3, ['S1'])
+
+    patched = ScheduleDiff.apply(old, ScheduleDiff.diff(old, new))
+    assert ScheduleDiff.placements(patched) == ScheduleDiff.placements(new)
+    assert ScheduleDiff.students(patched) == ScheduleDiff.students(new)
+    assert _bookings(patched, 'students') == _bookings(new, 'students')
+    assert patched['unassigned'] == old['unassigned'][1:]
@@ -0,0 +1,132 @@
+# python_models/tests/test_vtu_validator.py
+import contextlib
+import io
+import json
+import os
+
+from python_models import ConflictGraphModel, VTUValidator
+from python_models.utils.cancellation import CancellationToken
+from python_models.utils.cli import run_model
+
+
+def _problem(num_events=4):
+    return {
+        'teachers': [{'id': 't1', 'name': 'T1'}],
+        'student_groups': [{'id': 'g1', 'name': 'G1'}],
+        'rooms': [{'id': 'r1', 'name': 'R1', 'capacity': 30, 'equipment': []}],
+        'events': [{'id': f'e{i}', 'name': f'E{i}', 'teacher': 't1', 'student_groups': ['g1']}
+                   for i in range(num_events)]
+    }
+
+
+class _CountingStream(io.StringIO):
+    """StringIO that records how many characters were read"""
+
+    def __init__(self, text):
+        super().__init__(text)
+        self.consumed = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.consumed += len(chunk)
+        return chunk
+
+
+def _run_cli(monkeypatch, text):
+    # The cancel watcher reads the stdin descriptor, which pytest replaces
+    monkeypatch.setattr('sys.stdin', open(os.devnull))
+    out = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(io.StringIO()):
+            code = run_model(ConflictGraphModel, ['cli', text])
+    finally:
+        CancellationToken.restore_signal_handlers()
+    return code, json.loads(out.getvalue().splitlines()[-1])
+
+
+def test_stream_matches_dict_validation():
+    problem = _problem()
+    problem['events'].append({'id': 'bad', 'name': 'Bad', 'teacher': 'nobody', 'student_groups': ['g1']})
+    expected = VTUValidator.validate_input_schema(problem)
+    assert VTUValidator.validate_input_stream(json.dumps(problem)) == expected
+    assert not expected['valid']
+
+
+def test_stream_stops_reading_at_max_errors():
+    problem = _problem(20000)
+    problem['events'][:5] = [{'id': f'bad{i}'} for i in range(5)]
+    text = json.dumps(problem)
+    stream = _CountingStream(text)
+    result = VTUValidator.validate_input_stream(stream, max_errors=5, chunk_size=1024)
+    assert not result['valid']
+    assert len(result['errors']) == 5
+    assert stream.consumed < len(text) // 10
+
+
+def test_stream_rejects_trailing_data():
+    text = json.dumps(_problem())
+    assert VTUValidator.validate_input_stream(text + ' \n')['valid']
+    result = VTUValidator.validate_input_stream(text + ' {}')
+    assert not result['valid']
+    assert 'after the top-level object' in result['errors'][0]
+
+
+def test_stream_keeps_parsed_data():
+    problem = dict(_problem(), num_timeslots=10, config={'seed': 3})
+    result = VTUValidator.validate_input_stream(json.dumps(problem), keep_data=True)
+    assert result['data'] == problem
+
+
+def test_cli_validates_before_solving(monkeypatch):
+    # Rejections exit 0 so the executor passes the result message on
+    code, message = _run_cli(monkeypatch, json.dumps(_problem()) + 'x')
+    assert code == 0
+    assert message['error'].startswith('Invalid input JSON')
+
+    problem = _problem()
+    problem['events'][0]['teacher'] = 'nobody'
+    code, message = _run_cli(monkeypatch, json.dumps(problem))
+    assert code == 0
+    assert message['error'] == 'Invalid input'
+    assert any('nobody' in error for error in message['errors'])
+
+    # 5 events of one teacher cannot fit 4 slots
+    code, message = _run_cli(monkeypatch, json.dumps(dict(_problem(5), num_timeslots=4)))
+    assert code == 0
+    assert message['error'] == 'Infeasible input'
+    assert message['issues']
+
+    code, message = _run_cli(monkeypatch, json.dumps(_problem()))
+    assert code == 0
+    assert len(message['schedule']['events']) == 4
+
+
+def test_unhashable_ids_are_schema_errors():
+    problem = _problem()
+    problem['events'][0]['id'] = ['e0']
+    problem['teachers'][0]['id'] = {'id': 't1'}
+    problem['events'][1]['student_groups'] = [['g1']]
+    for result in (VTUValidator.validate_input_schema(problem),
+                   VTUValidator.validate_input_stream(json.dumps(problem))):
+        assert not result['valid']
+        assert "Event at index 0 id should be a string or integer" in result['errors']
+        assert "Teacher at index 0 id should be a string or integer" in result['errors']
+        assert "Event e1 has invalid student_groups reference ['g1']" in result['errors']
+
+
+def test_stream_rejects_malformed_json_without_reading_on():
+    text = json.dumps(_problem(20000)).replace('"name": "E1"', '"name": "E1",,', 1)
+    stream = _CountingStream(text)
+    result = VTUValidator.validate_input_stream(stream, chunk_size=1024)
+    assert not result['valid']
+    assert result['errors'][0].startswith('Malformed JSON input')
+    assert stream.consumed < len(text) // 10
+
+
+def test_stream_decodes_values_split_across_chunks():
+    problem = dict(_problem(), config={'values': [1.5e10, True, None, -12345678901234567890, 'café éé']})
+    text = json.dumps(problem, ensure_ascii=False)
+    for chunk_size in (1, 2, 3, 7):
+        for stream in (io.StringIO(text), io.BytesIO(text.encode('utf-8'))):
+            result = VTUValidator.validate_input_stream(stream, chunk_size=chunk_size, keep_data=True)
+            assert result['data'] == problem
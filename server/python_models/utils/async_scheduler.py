@@ -0,0 +1,157 @@
+# python_models/utils/async_scheduler.py
+"""
+asyncio facade over the synchronous models
+
+Solves run in a bounded executor (processes by default, since the models are
+CPU-bound) so they never block the event loop. Requests beyond the workers
+wait in a bounded queue; when it is full they wait for a slot or fail fast
+with SchedulerBusy. Each request may carry a deadline: the model returns its
+best schedule so far when it passes.
+"""
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Type
+import asyncio
+import multiprocessing
+import os
+import threading
+from ..base.scheduler_interface import SchedulerInterface
+from .cancellation import CancellationToken, init_worker
+from .model_pool import ModelPool
+
+
+class SchedulerBusy(Exception):
+    """Raised when no queue slot frees up before the request's queue timeout"""
+
+
+# Warm model pools per (model class, options), one set per worker process
+_pools: Dict[str, ModelPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _call_model(model_class: Type[SchedulerInterface], options: Dict, method: str, args: tuple,
+                time_limit: Optional[float] = None, token: Optional[CancellationToken] = None):
+    """Executor task: run one model call on a pooled instance"""
+    key = f"{model_class.__module__}.{model_class.__qualname__}:{sorted(options.items())!r}"
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ModelPool(lambda: model_class(**options))
+    with pool.acquire() as model:
+        if method == 'generate_schedule':
+            if token is None:
+                token = CancellationToken(time_limit=time_limit)
+            return model.generate_schedule(args[0], cancellation=token)
+        return getattr(model, method)(*args)
+
+
+class AsyncScheduler:
+    """Awaitable generate_schedule/validate_schedule/get_conflicts for one model class"""
+
+    def __init__(self, model_class: Type[SchedulerInterface], options: Optional[Dict] = None,
+                 executor: str = 'process', max_workers: Optional[int] = None, max_queue: int = 16,
+                 default_deadline: Optional[float] = None, grace: float = 5.0,
+                 start_method: Optional[str] = None):
+        """
+        - options: keyword arguments for model_class (must be picklable for processes)
+        - executor: 'process' or 'thread' (threads also cancel running solves
+          when the awaiting task is cancelled)
+        - max_queue: requests allowed to wait beyond the max_workers running
+        - default_deadline: seconds per request when none is given
+        - grace: extra seconds after a deadline before the await gives up
+        """
+        if executor not in ('process', 'thread'):
+            raise ValueError(f"Unknown executor: {executor}")
+        self.model_class = model_class
+        self.options = dict(options or {})
+        self.executor_kind = executor
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.default_deadline = default_deadline
+        self.grace = grace
+        self.start_method = start_method
+        self.pending = 0
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _ensure_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == 'process':
+                self._executor = ProcessPoolExecutor(
+                    self.max_workers, mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=init_worker)
+            else:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='scheduler')
+            self._slots = asyncio.Semaphore(self.max_workers + self.max_queue)
+        return self._executor
+
+    async def _admit(self, timeout: Optional[float]):
+        """Take a running/queued slot, waiting at most timeout seconds"""
+        self._ensure_executor()
+        if timeout is not None and timeout <= 0:
+            if self._slots.locked():
+                raise SchedulerBusy(f"{self.pending} requests already pending")
+            await self._slots.acquire()
+            return
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout)
+        except asyncio.TimeoutError:
+            raise SchedulerBusy(f"{self.pending} requests already pending") from None
+
+    async def _submit(self, method: str, args: tuple, deadline: Optional[float] = None,
+                      queue_timeout: Optional[float] = None):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await self._admit(queue_timeout if queue_timeout is not None else deadline)
+        self.pending += 1
+
+        remaining = None if deadline is None else max(0.0, deadline - (loop.time() - start))
+        token = None
+        if self.executor_kind == 'thread':
+            token = CancellationToken(time_limit=remaining)
+        future = loop.run_in_executor(self._executor, _call_model, self.model_class, self.options,
+                                      method, args, remaining, token)
+
+        slots = self._slots
+
+        def release(_):
+            # The slot is only freed once the worker is really done with the request
+            self.pending -= 1
+            slots.release()
+        future.add_done_callback(release)
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future),
+                                          None if remaining is None else remaining + self.grace)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            if token is not None:
+                token.cancel('cancelled')
+            raise
+
+    async def generate_schedule(self, input_data: Dict, deadline: Optional[float] = None,
+                                queue_timeout: Optional[float] = None) -> Dict:
+        """
+        Solve input_data in the executor
+        deadline counts from the call, queueing included; queue_timeout bounds the
+        wait for a slot (defaults to the deadline, 0 fails fast when the queue is full).
+        """
+        deadline = deadline if deadline is not None else self.default_deadline
+        return await self._submit('generate_schedule', (input_data,), deadline, queue_timeout)
+
+    async def validate_schedule(self, schedule: Dict) -> bool:
+        return await self._submit('validate_schedule', (schedule,))
+
+    async def get_conflicts(self, schedule: Dict) -> List[Dict]:
+        return await self._submit('get_conflicts', (schedule,))
+
+    async def close(self, wait: bool = True):
+        """Shut the executor down (in a thread, so the loop keeps running)"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.get_running_loop().run_in_executor(None, lambda: executor.shutdown(wait=wait))
+
+    async def __aenter__(self) -> 'AsyncScheduler':
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+        return False
@@ -0,0 +1,299 @@
+# python_models/utils/binary_format.py
+"""
+Compact binary files for interned problems and solutions
+
+A file is an 8-byte magic, a little-endian uint64 header length, a JSON header
+and then 8-byte aligned little-endian arrays described by the header
+({name: [offset, dtype, length]}). open() memory-maps the file and every array
+is a zero-copy NumPy view, so workers open cached problems without parsing and
+processes mapping the same file share its pages.
+
+Problem arrays (int32 unless noted; -1 marks a missing teacher/room):
+  - event_teacher, event_room, event_group_ptr/event_groups (CSR)
+  - teacher_ptr/teacher_events, group_ptr/group_events, room_ptr/room_events
+    (resource -> event memberships, CSR)
+  - slot_day, slot_period: the timeslot grid
+  - <section>_ids_ptr (int64) / <section>_ids (uint8): JSON-encoded ids
+  - event_json_ptr (int64) / event_json (uint8): full event records, decoded lazily
+  - records_ptr (int64) / records (uint8): resource records and the rest of the
+    input (courses, programs, config, ...) as JSON, decoded only by to_input()
+Solution arrays: event_slot and event_room (int32, -1 when unassigned/absent),
+in the problem's event order; the header keeps the problem fingerprint.
+
+Convert from the command line (run from the server directory):
+    python -m python_models.utils.binary_format to-binary input.json problem.ttp
+    python -m python_models.utils.binary_format to-json problem.ttp input.json
+"""
+from typing import Dict, List, Optional, Sequence
+import argparse
+import json
+import mmap
+import struct
+import sys
+import numpy as np
+from ..base.problem_index import ProblemIndex
+from .reproducibility import Reproducibility
+from .schedule_builder import ScheduleBuilder
+
+ALIGNMENT = 8
+SECTIONS = ('teachers', 'student_groups', 'rooms')
+
+
+def _encode_strings(values: Sequence[str]):
+    """(int64 offsets, uint8 blob) for a list of strings"""
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+
+def _csr(lists: Sequence[Sequence[int]]):
+    ptr = np.zeros(len(lists) + 1, dtype=np.int32)
+    np.cumsum([len(items) for items in lists], out=ptr[1:])
+    values = np.fromiter((v for items in lists for v in items), dtype=np.int32, count=int(ptr[-1]))
+    return ptr, values
+
+
+def _write_container(path: str, magic: bytes, header: Dict, arrays: Dict[str, np.ndarray]):
+    layout, offset = {}, 0
+    for name, values in arrays.items():
+        values = np.ascontiguousarray(values, dtype=values.dtype.newbyteorder('<'))
+        arrays[name] = values
+        layout[name] = [offset, values.dtype.str, len(values)]
+        offset += -(-values.nbytes // ALIGNMENT) * ALIGNMENT
+    header = dict(header, arrays=layout)
+    text = json.dumps(header, separators=(',', ':'), default=str).encode('utf-8')
+    # Pad the header so the first array starts aligned
+    text += b' ' * (-(len(magic) + 8 + len(text)) % ALIGNMENT)
+    with open(path, 'wb') as f:
+        f.write(magic)
+        f.write(struct.pack('<Q', len(text)))
+        f.write(text)
+        for values in arrays.values():
+            data = values.tobytes()
+            f.write(data)
+            f.write(b'\0' * (-len(data) % ALIGNMENT))
+
+
+class _Container:
+    """Header plus zero-copy array views over a mapped (or in-memory) buffer"""
+
+    MAGIC = b''
+
+    def __init__(self, buffer, mapping: Optional[mmap.mmap] = None):
+        if bytes(buffer[:len(self.MAGIC)]) != self.MAGIC:
+            raise ValueError(f"Not a {type(self).__name__} file (bad magic)")
+        (length,) = struct.unpack_from('<Q', buffer, len(self.MAGIC))
+        start = len(self.MAGIC) + 8
+        self.header = json.loads(bytes(buffer[start:start + length]).decode('utf-8'))
+        self._data_start = start + length
+        self._buffer = buffer
+        self._mapping = mapping
+        self._arrays = {}
+
+    @classmethod
+    def open(cls, path: str):
+        """Memory-map path read-only"""
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapping, mapping)
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        return cls(data)
+
+    def array(self, name: str) -> np.ndarray:
+        """Read-only view of one stored array (no copy)"""
+        if name not in self._arrays:
+            offset, dtype, length = self.header['arrays'][name]
+            self._arrays[name] = np.frombuffer(self._buffer, dtype=np.dtype(dtype), count=length,
+                                               offset=self._data_start + offset)
+        return self._arrays[name]
+
+    def _strings(self, name: str, i: int) -> str:
+        ptr = self.array(f'{name}_ptr')
+        return self.array(name)[ptr[i]:ptr[i + 1]].tobytes().decode('utf-8')
+
+    def close(self):
+        # Views must be dropped before the mapping can be closed
+        self._arrays.clear()
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class BinaryProblem(_Container):
+    """Interned problem file: resource memberships, timeslot grid and lazily decoded records"""
+
+    MAGIC = b'TTPROB01'
+
+    @staticmethod
+    def write(path: str, input_data: Dict, index: Optional[ProblemIndex] = None,
+              periods_per_day: int = 8) -> str:
+        """Write input_data (interned through index when given) to path"""
+        index = ProblemIndex.resolve(input_data, index)
+        num_timeslots = index.timeslots(40)
+        arrays = {
+            'event_teacher': np.array(index.event_teacher, dtype=np.int32),
+            'event_room': np.array(index.event_room, dtype=np.int32)
+        }
+        arrays['event_group_ptr'], arrays['event_groups'] = _csr(index.event_groups)
+        for name, lists in (('teacher', index.teacher_events), ('group', index.group_events),
+                            ('room', index.room_events)):
+            arrays[f'{name}_ptr'], arrays[f'{name}_events'] = _csr(lists)
+        slots = np.arange(num_timeslots, dtype=np.int32)
+        arrays['slot_day'], arrays['slot_period'] = slots // periods_per_day, slots % periods_per_day
+        for section, ids in (('events', index.event_ids), ('teachers', index.teacher_ids),
+                             ('student_groups', index.group_ids), ('rooms', index.room_ids)):
+            arrays[f'{section}_ids_ptr'], arrays[f'{section}_ids'] = _encode_strings(
+                [json.dumps(i) for i in ids])
+        arrays['event_json_ptr'], arrays['event_json'] = _encode_strings(
+            [json.dumps(event, default=str) for event in index.events])
+        records = {
+            # Resource records (None for ids only referenced by events)
+            'items': {
+                'teachers': list(index.teachers),
+                'student_groups': list(index.student_groups),
+                'rooms': list(index.rooms)
+            },
+            'extra': {key: value for key, value in input_data.items()
+                      if key not in ('events', 'num_timeslots') + SECTIONS}
+        }
+        arrays['records_ptr'], arrays['records'] = _encode_strings([json.dumps(records, default=str)])
+
+        header = {
+            'version': 1,
+            'num_events': index.num_events,
+            'num_timeslots': num_timeslots,
+            'declared_timeslots': index.num_timeslots,
+            'periods_per_day': periods_per_day,
+            'fingerprint': Reproducibility.problem_fingerprint(input_data)
+        }
+        _write_container(path, BinaryProblem.MAGIC, header, arrays)
+        return path
+
+    @property
+    def num_events(self) -> int:
+        return self.header['num_events']
+
+    @property
+    def num_timeslots(self) -> int:
+        return self.header['num_timeslots']
+
+    @property
+    def fingerprint(self) -> str:
+        return self.header['fingerprint']
+
+    def ids(self, section: str) -> List:
+        """Decoded ids of 'events', 'teachers', 'student_groups' or 'rooms'"""
+        count = len(self.array(f'{section}_ids_ptr')) - 1
+        return [json.loads(self._strings(f'{section}_ids', i)) for i in range(count)]
+
+    def event(self, e: int) -> Dict:
+        """Full record of event position e (decoded on demand)"""
+        return json.loads(self._strings('event_json', e))
+
+    def members(self, section: str, r: int) -> np.ndarray:
+        """Event positions using resource r of 'teacher', 'group' or 'room'"""
+        ptr = self.array(f'{section}_ptr')
+        return self.array(f'{section}_events')[ptr[r]:ptr[r + 1]]
+
+    def records(self) -> Dict:
+        """{'items': resource records per section, 'extra': other input keys}"""
+        return json.loads(self._strings('records', 0))
+
+    def to_input(self) -> Dict:
+        """Input in the standard JSON shape"""
+        records = self.records()
+        data = dict(records['extra'])
+        data['events'] = [self.event(e) for e in range(self.num_events)]
+        for section in SECTIONS:
+            data[section] = [item for item in records['items'][section] if item is not None]
+        if self.header['declared_timeslots'] is not None:
+            data['num_timeslots'] = self.header['declared_timeslots']
+        return data
+
+    def to_index(self) -> ProblemIndex:
+        """ProblemIndex with the same int ids as the file"""
+        data = self.to_input()
+        # Resources are interned in file order, including event-only references
+        items = self.records()['items']
+        resources = {
+            section: [item if item is not None else {'id': i} for i, item in zip(self.ids(section), items[section])]
+            for section in SECTIONS
+        }
+        return ProblemIndex(data['events'], resources['teachers'], resources['student_groups'],
+                            resources['rooms'], self.header['declared_timeslots'])
+
+
+class BinarySolution(_Container):
+    """Solution file: event -> slot/room arrays in a problem's event order"""
+
+    MAGIC = b'TTSOL001'
+
+    @staticmethod
+    def write(path: str, schedule: Dict, problem: BinaryProblem) -> str:
+        event_pos = {event_id: e for e, event_id in enumerate(problem.ids('events'))}
+        room_pos = {room_id: r for r, room_id in enumerate(problem.ids('rooms'))}
+        event_slot = np.full(problem.num_events, -1, dtype=np.int32)
+        event_room = np.full(problem.num_events, -1, dtype=np.int32)
+        unknown = []
+        for slot, events in schedule.get('timeslots', {}).items():
+            for event in events:
+                e = event_pos.get(event.get('id'))
+                if e is None:
+                    unknown.append(event.get('id'))
+                    continue
+                event_slot[e] = int(slot)
+                event_room[e] = room_pos.get(event.get('room'), -1)
+        if unknown:
+            raise ValueError(f"Schedule has events not in the problem: {unknown[:10]}")
+        header = {
+            'version': 1,
+            'problem': problem.fingerprint,
+            'cancelled': schedule.get('cancelled', False)
+        }
+        _write_container(path, BinarySolution.MAGIC, header, {'event_slot': event_slot, 'event_room': event_room})
+        return path
+
+    def to_schedule(self, problem: BinaryProblem) -> Dict:
+        """Standard schedule dict for the problem this solution was written against"""
+        if self.header['problem'] != problem.fingerprint:
+            raise ValueError("Solution was written for a different problem")
+        event_slot, event_room = self.array('event_slot'), self.array('event_room')
+        room_ids = problem.ids('rooms')
+        schedule = ScheduleBuilder.empty()
+        for e in np.flatnonzero(event_slot >= 0):
+            event = problem.event(int(e))
+            if event_room[e] >= 0:
+                event['room'] = room_ids[event_room[e]]
+            ScheduleBuilder.place(schedule, event, int(event_slot[e]))
+        if self.header.get('cancelled'):
+            schedule['cancelled'] = True
+        return schedule
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Convert problems between JSON and the binary format')
+    parser.add_argument('command', choices=('to-binary', 'to-json'))
+    parser.add_argument('source')
+    parser.add_argument('target')
+    args = parser.parse_args(argv)
+    if args.command == 'to-binary':
+        with open(args.source) as f:
+            BinaryProblem.write(args.target, json.load(f))
+    else:
+        with BinaryProblem.open(args.source) as problem, open(args.target, 'w') as f:
+            json.dump(problem.to_input(), f)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+# python_models/utils/block_layout.py
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from ..base.problem_index import ProblemIndex
+
+
+class BlockLayout:
+    """
+    Multi-period (block) events on the day/period slot grid
+    An event lasts 'duration' consecutive periods (labs default to
+    LAB_DURATION, everything else to 1) and is placed by its start slot.
+    A start is valid when the block ends on the same day and inside the
+    horizon; valid starts are computed once per duration, so labs and double
+    periods stay single events instead of one event per hour. Layouts depend
+    only on the grid, so shared() hands out one per process and grid size.
+    """
+
+    PERIODS_PER_DAY = 8
+    LAB_DURATION = 2
+
+    def __init__(self, num_timeslots: Optional[int] = None, periods_per_day: Optional[int] = None):
+        """num_timeslots None leaves the horizon open (graph coloring uses as many slots as it needs)"""
+        self.num_timeslots = num_timeslots
+        self.periods_per_day = periods_per_day or self.PERIODS_PER_DAY
+        self._starts = {}
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def shared(num_timeslots: Optional[int] = None, periods_per_day: Optional[int] = None) -> 'BlockLayout':
+        """Process-wide layout for a grid; its start tables are reused across problems"""
+        return BlockLayout(num_timeslots, periods_per_day)
+
+    @staticmethod
+    def from_input(input_data: Dict, num_timeslots: Optional[int] = None) -> 'BlockLayout':
+        """Shared layout with config.periods_per_day (as used by ConflictReport) or the default 8"""
+        config = input_data.get('config') or {}
+        return BlockLayout.shared(num_timeslots, config.get('periods_per_day'))
+
+    @staticmethod
+    def duration(event: Dict) -> int:
+        """Periods an event lasts: a positive int 'duration', else 2 for labs, else 1"""
+        duration = event.get('duration')
+        if isinstance(duration, int) and not isinstance(duration, bool) and duration > 0:
+            return duration
+        return BlockLayout.LAB_DURATION if event.get('is_lab') else 1
+
+    @staticmethod
+    def durations(index: ProblemIndex) -> List[int]:
+        """Duration per interned event"""
+        return [BlockLayout.duration(event) for event in index.events]
+
+    def fits(self, start: int, duration: int) -> bool:
+        """True if a block of duration periods starting at start stays within one day and the horizon"""
+        if start < 0 or start % self.periods_per_day + duration > self.periods_per_day:
+            return False
+        return self.num_timeslots is None or start + duration <= self.num_timeslots
+
+    def starts(self, duration: int) -> Tuple[int, ...]:
+        """Valid start slots for a duration (bounded horizon only)"""
+        if duration not in self._starts:
+            self._starts[duration] = tuple(s for s in range(self.num_timeslots) if self.fits(s, duration))
+        return self._starts[duration]
+
+    def next_start(self, slot: int, duration: int) -> int:
+        """First start >= slot where the block fits its day (open horizon)"""
+        if slot % self.periods_per_day + duration > self.periods_per_day:
+            slot += self.periods_per_day - slot % self.periods_per_day
+        return slot
+
+    @staticmethod
+    def cells(start: int, duration: int) -> range:
+        """Slots a block occupies"""
+        return range(start, start + duration)
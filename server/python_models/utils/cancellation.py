@@ -0,0 +1,219 @@
+# python_models/utils/cancellation.py
+from typing import Dict, Optional, TextIO
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+
+class SolveCancelled(Exception):
+    """Raised inside a solver loop to unwind once its token is cancelled"""
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation for long solves
+    A token is cancelled explicitly, by its deadline passing, by SIGTERM/SIGINT
+    (install_signal_handlers) or by a 'cancel' command on stdin (watch_stdin).
+    Solvers poll `cancelled` every few hundred steps and return their best
+    result so far instead of raising to the caller. Anytime solvers also poll
+    beaten(): a token may carry a shared incumbent score (e.g. the best result
+    another portfolio engine has posted), and a solver whose own best is
+    already worse stops early.
+    """
+
+    def __init__(self, time_limit: Optional[float] = None, deadline: Optional[float] = None,
+                 flag=None, incumbent=None):
+        # deadline is absolute time.monotonic(); time_limit is seconds from now.
+        # flag may be a multiprocessing.Event to cancel solves in other processes,
+        # incumbent a multiprocessing.Value holding the best score posted so far
+        if time_limit is not None:
+            limit_deadline = time.monotonic() + time_limit
+            deadline = limit_deadline if deadline is None else min(deadline, limit_deadline)
+        self.deadline = deadline
+        self.reason = None
+        self._flag = flag if flag is not None else threading.Event()
+        self._incumbent = incumbent
+        self._parent = None
+
+    @classmethod
+    def never(cls) -> 'CancellationToken':
+        """Token that is never cancelled unless cancel() is called"""
+        return cls()
+
+    def with_time_limit(self, time_limit: float) -> 'CancellationToken':
+        """Child token cancelled with this one or time_limit seconds from now, whichever is first"""
+        child = CancellationToken(time_limit=time_limit, deadline=self.deadline, incumbent=self._incumbent)
+        child._parent = self
+        return child
+
+    def cancel(self, reason: str = 'cancelled'):
+        if not self._flag.is_set():
+            self.reason = reason
+            self._flag.set()
+        elif self.reason is None:
+            self.reason = reason
+
+    @property
+    def cancelled(self) -> bool:
+        if self._flag.is_set():
+            if self.reason is None:
+                # Set through a shared flag by another process
+                self.reason = 'cancelled'
+            return True
+        if self._parent is not None and self._parent.cancelled:
+            self.cancel(self._parent.reason)
+            return True
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel('deadline')
+            return True
+        return False
+
+    def beaten(self, score) -> bool:
+        """True when the shared incumbent is strictly better (lower) than score"""
+        return self._incumbent is not None and score is not None and self._incumbent.value < score
+
+    def check(self):
+        """Raise SolveCancelled if the token has been cancelled"""
+        if self.cancelled:
+            raise SolveCancelled(self.reason)
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the deadline, None when there is none"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def install_signal_handlers(self, signals=(signal.SIGTERM, signal.SIGINT)):
+        """Cancel on the given signals (main thread only)"""
+        for signum in signals:
+            signal.signal(signum, lambda received, frame: self.cancel(signal.Signals(received).name.lower()))
+
+    @staticmethod
+    def restore_signal_handlers(signals=(signal.SIGTERM, signal.SIGINT)):
+        """Default handlers again, e.g. in worker processes forked from a CLI run"""
+        for signum in signals:
+            signal.signal(signum, signal.SIG_DFL)
+
+    def watch_stdin(self, stream: Optional[TextIO] = None) -> threading.Thread:
+        """
+        Cancel when a 'cancel' command arrives on stdin
+        Accepts a bare `cancel` line, a JSON string "cancel" or {"command": "cancel"}.
+        """
+        lines = _iter_lines(stream)
+
+        def watch():
+            for line in lines:
+                line = line.strip()
+                try:
+                    command = json.loads(line)
+                except ValueError:
+                    command = line
+                if isinstance(command, dict):
+                    command = command.get('command')
+                if command == 'cancel':
+                    self.cancel('cancel_command')
+                    return
+
+        thread = threading.Thread(target=watch, name='cancel-watcher', daemon=True)
+        thread.start()
+        return thread
+
+
+def _iter_lines(stream: Optional[TextIO]):
+    """
+    Lines from stream, or from the raw stdin descriptor when stream is None
+    Reading the descriptor directly keeps the watcher thread from holding the
+    sys.stdin buffer lock, which would deadlock processes forked meanwhile.
+    """
+    if stream is not None:
+        yield from stream
+        return
+    fd = sys.stdin.fileno()
+    pending = b''
+    while True:
+        chunk = os.read(fd, 4096)
+        if not chunk:
+            break
+        pending += chunk
+        *complete, pending = pending.split(b'\n')
+        for line in complete:
+            yield line.decode('utf-8', 'replace')
+    if pending:
+        yield pending.decode('utf-8', 'replace')
+
+
+class ProgressReporter:
+    """
+    Periodic progress messages written as NDJSON lines
+    Each line is {"type": "progress", ...} so consumers can tell them apart
+    from the final result line. Reports are throttled to one per interval.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, interval: float = 1.0, enabled: bool = True):
+        self.stream = stream or sys.stdout
+        self.interval = interval
+        self.enabled = enabled
+        self._start = time.monotonic()
+        self._last = None
+
+    @classmethod
+    def disabled(cls) -> 'ProgressReporter':
+        return _DISABLED
+
+    def due(self) -> bool:
+        """Whether a throttled report would be written now"""
+        return self.enabled and (self._last is None or time.monotonic() - self._last >= self.interval)
+
+    def report(self, phase: str, assigned: int, total: int, best_conflicts: Optional[int] = None,
+               force: bool = False, **fields):
+        if not self.enabled or (not force and not self.due()):
+            return
+        now = time.monotonic()
+        self._last = now
+        message = {
+            'type': 'progress',
+            'phase': phase,
+            'assigned': assigned,
+            'total': total,
+            'percent': round(100.0 * assigned / total, 1) if total else 100.0,
+            'elapsed': round(now - self._start, 3)
+        }
+        if best_conflicts is not None:
+            message['best_conflicts'] = best_conflicts
+        message.update(fields)
+        self.stream.write(json.dumps(message) + '\n')
+        self.stream.flush()
+
+
+_DISABLED = ProgressReporter(enabled=False)
+
+
+def mark_cancelled(schedule: Dict, token: CancellationToken, unassigned) -> Dict:
+    """Flag a best-so-far schedule returned after cancellation"""
+    schedule['cancelled'] = True
+    schedule['cancel_reason'] = token.reason
+    schedule['unassigned'] = list(unassigned)
+    return schedule
+
+
+# Per-process state handed to pool workers by init_worker
+_worker_state: Dict = {}
+
+
+def init_worker(state: Optional[Dict] = None):
+    """
+    Initializer for every process pool the models start
+    Let the parent's executor shutdown terminate workers normally, and keep
+    state (a stop flag, an evaluator) for worker_state() in the task bodies.
+    """
+    CancellationToken.restore_signal_handlers()
+    _worker_state.clear()
+    _worker_state.update(state or {})
+
+
+def worker_state(name: str):
+    """Value given to init_worker in this worker process, None when absent"""
+    return _worker_state.get(name)
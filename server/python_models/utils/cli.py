@@ -0,0 +1,136 @@
+# python_models/utils/cli.py
+"""
+Command-line entry point shared by the scheduler scripts in models/
+
+The Node side (pythonExecutor.service.js) runs a script with the input JSON
+as its only argument and reads stdout line by line:
+  - {"type": "progress", ...} lines while the solver runs
+  - one final {"type": "result", "schedule": ..., "conflicts": ..., "conflict_report": ...,
+    "stats": ...} line; conflict_report follows conflict.service.js semantics
+Logs and stats go to stderr. Sending `cancel` (or {"command": "cancel"}) on
+stdin, SIGTERM, or reaching config.time_limit seconds stops the solver, which
+then returns its best schedule so far with 'cancelled' set.
+The input text is checked by the streaming validator while it is parsed, so
+malformed JSON, trailing data or bad items are rejected before the whole
+document has been decoded. Input that fails the feasibility bounds (config.check_feasibility, default on)
+is rejected with an 'Infeasible input' error and the issues found.
+Rejections and solver failures are result lines with an 'error' (plus 'errors'
+or 'issues') and exit status 0, since python-shell turns a non-zero exit into a
+bare failure that would hide them; a non-zero exit means the script crashed.
+config.stats (default on) adds the stats block; config.trace_memory and
+config.profile add per-phase peak memory and a cProfile summary to it.
+With config.personal_timetables_dir set, per-person timetables (PersonalTimetables)
+are written there and summarised under 'personal_timetables' in the result.
+Events and resources are sorted by id before solving (config.stable_order,
+default on) and the result carries a 'fingerprint' of problem and schedule;
+with config.seed the same input always yields the same fingerprint.
+"""
+from typing import Callable, Dict, List, Optional
+import json
+import sys
+
+from ..base.problem_index import ProblemIndex
+from .cancellation import CancellationToken, ProgressReporter
+from .conflict_report import ConflictReport
+from .feasibility import FeasibilityAnalyzer
+from .instrumentation import Instrumentation, get_logger
+from .personal_timetables import PersonalTimetables
+from .reproducibility import Reproducibility
+from .vtu_validator import VTUValidator
+
+logger = get_logger('cli')
+
+# Validation errors reported unless config.max_errors (read before the sections) says otherwise
+MAX_ERRORS = 50
+
+
+def read_text(argv: List[str]) -> str:
+    """Raw input text from the first argument, or from stdin when there is none"""
+    if len(argv) > 1 and argv[1] != '-':
+        return argv[1]
+    return sys.stdin.read()
+
+
+def read_input(argv: List[str]) -> Dict:
+    """Input JSON from the first argument, or from stdin when there is none"""
+    return json.loads(read_text(argv))
+
+
+def write_message(message: Dict):
+    sys.stdout.write(json.dumps(message, default=str) + '\n')
+    sys.stdout.flush()
+
+
+def run_model(model_factory: Callable, argv: Optional[List[str]] = None) -> int:
+    """Run one scheduler on the CLI input and write NDJSON progress and result lines"""
+    argv = sys.argv if argv is None else argv
+    instrumentation = Instrumentation()
+    with instrumentation.phase('validation'):
+        # Parse and validate in one pass; reading stops at the first JSON error
+        # or once max_errors item errors have been found
+        validation = VTUValidator.validate_input_stream(read_text(argv), max_errors=MAX_ERRORS, keep_data=True)
+    input_data = validation['data']
+    malformed = [error for error in validation['errors'] if error.startswith('Malformed JSON input')]
+    if malformed:
+        write_message({'type': 'result', 'error': malformed[0].replace('Malformed JSON input', 'Invalid input JSON', 1)})
+        return 0
+    # Inputs without events (other model shapes) are not held to the event schema
+    if input_data is None or ('events' in input_data and not validation['valid']):
+        write_message({'type': 'result', 'error': 'Invalid input', 'errors': validation['errors']})
+        return 0
+
+    config = input_data.get('config', {})
+    if config.get('stable_order', True):
+        # Listing order must not change the schedule
+        input_data = Reproducibility.canonical_input(input_data)
+    instrumentation.configure(config)
+    token = CancellationToken(time_limit=config.get('time_limit'))
+    token.install_signal_handlers()
+    if len(argv) > 1 and argv[1] != '-':
+        token.watch_stdin()
+    progress = ProgressReporter(interval=config.get('progress_interval', 1.0),
+                                enabled=config.get('progress', True))
+
+    index = None
+    if 'events' in input_data:
+        with instrumentation.phase('index'):
+            # Built after canonical ordering so positions match input_data
+            index = ProblemIndex.from_input(input_data)
+        if config.get('check_feasibility', True):
+            # Provably infeasible input never reaches the solver
+            with instrumentation.phase('feasibility'):
+                feasibility = FeasibilityAnalyzer.analyze(index)
+            if not feasibility['valid']:
+                write_message({'type': 'result', 'error': 'Infeasible input', 'issues': feasibility['issues'],
+                               'bounds': feasibility['bounds']})
+                return 0
+
+    # Models with tunable parameters read them from the config block
+    from_config = getattr(model_factory, 'from_config', None)
+    model = from_config(config, instrumentation) if from_config else model_factory(instrumentation)
+    schedule = model.generate_schedule(input_data, index, cancellation=token, progress=progress)
+    if 'error' in schedule:
+        write_message({'type': 'result', 'error': schedule['error'], 'schedule': None,
+                       'stats': instrumentation.stats() if instrumentation.enabled else None})
+        return 0
+
+    stats = schedule.pop('stats', None)
+    with instrumentation.phase('serialisation'):
+        message = {
+            'type': 'result',
+            'schedule': schedule,
+            'conflicts': model.get_conflicts(schedule),
+            # Node-compatible report so the server need not re-run detectConflicts
+            'conflict_report': ConflictReport.build(schedule, config.get('days'), config.get('periods_per_day')),
+            'cancelled': schedule.get('cancelled', False),
+            'fingerprint': Reproducibility.fingerprint(input_data, schedule, type(model).__name__,
+                                                       getattr(model, 'seed', None)),
+            'stats': stats
+        }
+        if config.get('personal_timetables_dir'):
+            # Per-person views for the mobile API, one file each
+            timetables = PersonalTimetables.build(schedule, input_data)
+            message['personal_timetables'] = timetables.write(config['personal_timetables_dir'])
+        write_message(message)
+    instrumentation.emit(model=type(model).__name__)
+    return 0
@@ -0,0 +1,171 @@
+# python_models/utils/clique_graph.py
+from array import array
+from typing import Dict, Iterator, List, Optional, Set
+from ..base.problem_index import ProblemIndex
+from .block_layout import BlockLayout
+from .cancellation import CancellationToken
+
+
+class CliqueGraph:
+    """
+    Conflict graph stored as event -> resource memberships
+    Every teacher, student group and room is an implicit clique over its
+    events, so the O(k^2) edges of a clique are never materialised. Both
+    directions are kept in CSR form (offset and id arrays of int32), which
+    is O(memberships) memory; neighbourhoods are computed on demand.
+    """
+
+    # Events handled between cancellation checks
+    CHECK_INTERVAL = 4096
+
+    def __init__(self, event_ptr: array, event_resources: array, resource_ptr: array, resource_events: array):
+        self.event_ptr = event_ptr
+        self.event_resources = event_resources
+        self.resource_ptr = resource_ptr
+        self.resource_events = resource_events
+        self._degrees = None
+
+    @classmethod
+    def from_index(cls, index: ProblemIndex) -> 'CliqueGraph':
+        """Memberships of the teacher, group and room cliques (singletons dropped)"""
+        cliques = [events for events in index.resource_events() if len(events) > 1]
+        resource_ptr, resource_events = array('i', [0]), array('i')
+        memberships = [0] * index.num_events
+        for events in cliques:
+            resource_events.extend(events)
+            resource_ptr.append(len(resource_events))
+            for e in events:
+                memberships[e] += 1
+
+        event_ptr = array('i', [0])
+        for count in memberships:
+            event_ptr.append(event_ptr[-1] + count)
+        event_resources = array('i', bytes(4 * len(resource_events)))
+        fill = array('i', event_ptr[:-1])
+        for r in range(len(cliques)):
+            for e in resource_events[resource_ptr[r]:resource_ptr[r + 1]]:
+                event_resources[fill[e]] = r
+                fill[e] += 1
+        return cls(event_ptr, event_resources, resource_ptr, resource_events)
+
+    def number_of_nodes(self) -> int:
+        return len(self.event_ptr) - 1
+
+    def number_of_cliques(self) -> int:
+        return len(self.resource_ptr) - 1
+
+    def resources(self, e: int) -> array:
+        return self.event_resources[self.event_ptr[e]:self.event_ptr[e + 1]]
+
+    def clique(self, r: int) -> array:
+        return self.resource_events[self.resource_ptr[r]:self.resource_ptr[r + 1]]
+
+    def neighbors(self, e: int) -> Set[int]:
+        """Events sharing at least one resource with event e"""
+        neighbors = set()
+        for r in self.resources(e):
+            neighbors.update(self.clique(r))
+        neighbors.discard(e)
+        return neighbors
+
+    def degrees(self, cancellation: Optional[CancellationToken] = None) -> array:
+        """Exact degree of every event (cached)"""
+        if self._degrees is None:
+            cancellation = cancellation or CancellationToken.never()
+            degrees = array('i')
+            for e in range(self.number_of_nodes()):
+                if e % self.CHECK_INTERVAL == 0:
+                    cancellation.check()
+                resources = self.resources(e)
+                if len(resources) == 1:
+                    # One clique: no overlap to deduplicate
+                    r = resources[0]
+                    degrees.append(self.resource_ptr[r + 1] - self.resource_ptr[r] - 1)
+                else:
+                    degrees.append(len(self.neighbors(e)))
+            self._degrees = degrees
+        return self._degrees
+
+    def number_of_edges(self) -> int:
+        return sum(self.degrees()) // 2
+
+    def edges(self) -> Iterator:
+        """Each edge once as (u, v) with u < v; materialises neighbourhoods one at a time"""
+        for u in range(self.number_of_nodes()):
+            for v in sorted(self.neighbors(u)):
+                if u < v:
+                    yield u, v
+
+    def greedy_color(self, cancellation: Optional[CancellationToken] = None,
+                     ranks: Optional[List[int]] = None, durations: Optional[List[int]] = None,
+                     layout: Optional[BlockLayout] = None,
+                     coloring: Optional[Dict[int, int]] = None) -> Dict[int, int]:
+        """
+        Greedy coloring in largest-first order (same result as networkx's
+        greedy_color with strategy='largest_first')
+        Each clique keeps a bitmask of colors taken by its colored events, so
+        an event's forbidden colors are the OR of its cliques' masks. Equal
+        degrees are taken in event order, or by ascending rank when given.
+        With durations, an event of duration d takes the lowest start color
+        whose d consecutive bits are free and that fits its day in layout;
+        longer blocks are colored first. coloring, when given, is filled in
+        place, so a caller whose token cancels the loop keeps the colors
+        assigned so far.
+        """
+        cancellation = cancellation or CancellationToken.never()
+        degrees = self.degrees(cancellation)
+        if durations is not None:
+            layout = layout or BlockLayout()
+            ranks = ranks or range(self.number_of_nodes())
+            order = sorted(range(self.number_of_nodes()), key=lambda e: (-durations[e], -degrees[e], ranks[e]))
+        elif ranks is None:
+            order = sorted(range(self.number_of_nodes()), key=degrees.__getitem__, reverse=True)
+        else:
+            order = sorted(range(self.number_of_nodes()), key=lambda e: (-degrees[e], ranks[e]))
+        taken = [0] * self.number_of_cliques()
+        coloring = {} if coloring is None else coloring
+        for done, e in enumerate(order):
+            if done % self.CHECK_INTERVAL == 0:
+                cancellation.check()
+            resources = self.resources(e)
+            used = 0
+            for r in resources:
+                used |= taken[r]
+            # Lowest zero bit of used
+            color = (~used & (used + 1)).bit_length() - 1
+            bit = 1 << color
+            if durations is not None and durations[e] > 1:
+                color, bit = self._block_color(used, color, durations[e], layout)
+            for r in resources:
+                taken[r] |= bit
+            coloring[e] = color
+        return coloring
+
+    @staticmethod
+    def _block_color(used: int, color: int, duration: int, layout: BlockLayout):
+        """Lowest start >= color with duration free bits in used that fits its day; (start, mask)"""
+        block = (1 << duration) - 1
+        while True:
+            color = layout.next_start(color, duration)
+            clash = (used >> color) & block
+            if not clash:
+                return color, block << color
+            # Skip past the highest taken bit in the window, then to the next free bit
+            color += clash.bit_length()
+            free = ~(used >> color)
+            color += (free & -free).bit_length() - 1
+
+    def to_networkx(self):
+        """Explicit networkx graph (materialises every edge; small instances only)"""
+        import networkx as nx
+        graph = nx.Graph()
+        graph.add_nodes_from(range(self.number_of_nodes()))
+        graph.add_edges_from(self.edges())
+        return graph
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the CSR arrays"""
+        arrays = [self.event_ptr, self.event_resources, self.resource_ptr, self.resource_events]
+        if self._degrees is not None:
+            arrays.append(self._degrees)
+        return sum(a.itemsize * len(a) for a in arrays)
@@ -0,0 +1,94 @@
+# python_models/utils/conflict_report.py
+from typing import Dict, Optional, Sequence
+from .block_layout import BlockLayout
+
+
+class ConflictReport:
+    """
+    Canonical conflict report with the semantics of Node's conflict.service
+    detectConflicts walks (day, period) cells in order and, per teacher, room
+    and student group, keeps the first subject booked in a cell; every later
+    booking is one conflict whose conflictWith is that first subject. Slot
+    indexes decode to days and periods like config/constants.js
+    (DAYS Monday..Saturday, PERIODS 1..8): slot s is DAYS[s // 8], period s % 8 + 1.
+    A block event (lab, double period) books every period it covers.
+    """
+
+    DAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday')
+    PERIODS_PER_DAY = 8
+    VERSION = 1
+
+    # (Node conflict type, event field, Node resource field)
+    CHECKS = (
+        ('teacher', 'teacher', 'teacher'),
+        ('room', 'room', 'room'),
+        ('student', 'student_groups', 'studentGroup')
+    )
+
+    @staticmethod
+    def decode_slot(slot: int, days: Sequence[str] = DAYS, periods_per_day: int = PERIODS_PER_DAY):
+        """(day, period) for a slot index; days past the list are named 'Day N'"""
+        day, period = divmod(int(slot), periods_per_day)
+        return (days[day] if day < len(days) else f"Day {day + 1}"), period + 1
+
+    @staticmethod
+    def _subject(event: Dict):
+        return event.get('subject', event.get('name', event.get('id')))
+
+    @staticmethod
+    def build(schedule: Dict, days: Optional[Sequence[str]] = None,
+              periods_per_day: Optional[int] = None) -> Dict:
+        """
+        Returns {'version', 'conflicts', 'summary'}; conflicts match the objects
+        detectConflicts builds (type, resource, day, period, conflictWith, message)
+        plus the 'event' and 'conflictWithEvent' ids
+        """
+        days = days or ConflictReport.DAYS
+        periods_per_day = periods_per_day or ConflictReport.PERIODS_PER_DAY
+        conflicts = []
+        first = {}
+        cells = {}
+        for slot, events in sorted(schedule.get('timeslots', {}).items(), key=lambda item: int(item[0])):
+            for event in events:
+                for cell in BlockLayout.cells(int(slot), BlockLayout.duration(event)):
+                    cells.setdefault(cell, []).append(event)
+        for slot, events in sorted(cells.items()):
+            day, period = ConflictReport.decode_slot(slot, days, periods_per_day)
+            # Object.entries keys: Node reports periods as strings
+            period = str(period)
+            for event in events:
+                for conflict_type, field, node_field in ConflictReport.CHECKS:
+                    if field not in event or event[field] is None:
+                        continue
+                    resources = event[field] if field == 'student_groups' else [event[field]]
+                    for resource in resources:
+                        key = (conflict_type, resource, day, period)
+                        holder = first.get(key)
+                        if holder is None:
+                            first[key] = event
+                            continue
+                        conflicts.append({
+                            'type': conflict_type,
+                            node_field: resource,
+                            'day': day,
+                            'period': period,
+                            'conflictWith': ConflictReport._subject(holder),
+                            'message': ConflictReport._message(conflict_type, resource, day, period),
+                            'event': event.get('id'),
+                            'conflictWithEvent': holder.get('id')
+                        })
+
+        summary = {conflict_type: 0 for conflict_type, _, _ in ConflictReport.CHECKS}
+        for conflict in conflicts:
+            summary[conflict['type']] += 1
+        summary['total'] = len(conflicts)
+        return {'version': ConflictReport.VERSION, 'conflicts': conflicts, 'summary': summary}
+
+    @staticmethod
+    def _message(conflict_type: str, resource, day: str, period: str) -> str:
+        # Same wording as conflict.service.js
+        if conflict_type == 'teacher':
+            return f"Teacher {resource} double booked for {day} {period}"
+        if conflict_type == 'room':
+            return f"Room {resource} double booked for {day} {period}"
+        return f"Student group {resource} has overlapping classes"
@@ -0,0 +1,198 @@
+# python_models/utils/feasibility.py
+from typing import Dict, List, Optional, Set
+from ..base.problem_index import ProblemIndex
+from .block_layout import BlockLayout
+
+
+class FeasibilityAnalyzer:
+    """
+    Pre-solve lower bounds on the conflict graph
+    Every teacher, student group and room event list is a clique, so the
+    largest clique found bounds the number of timeslots any schedule needs.
+    The checks run in time linear in the memberships (plus a bounded clique
+    extension) and report issues before a solver spends its time limit.
+    Loads count periods, so a two-period lab weighs two slots.
+    """
+
+    # Largest resource cliques tried for extension into bigger cliques
+    CLIQUE_SEEDS = 8
+
+    @staticmethod
+    def analyze(index: ProblemIndex, num_timeslots: Optional[int] = None) -> Dict:
+        """
+        Returns dict with 'valid' bool, 'issues' list and 'bounds'
+        Issues have 'severity' 'error' (no timetable fits the timeslots) or
+        'warning' (room capacity: the models keep the rooms given in the input).
+        """
+        num_timeslots = num_timeslots if num_timeslots is not None else index.timeslots(40)
+        durations = BlockLayout.durations(index)
+        issues = []
+        issues.extend(FeasibilityAnalyzer._check_loads(index, num_timeslots, durations))
+        clique = FeasibilityAnalyzer.find_clique(index)
+        required = sum(durations[e] for e in clique)
+        if required > num_timeslots:
+            periods = f" ({required} periods)" if required != len(clique) else ""
+            issues.append({
+                'type': 'Clique bound',
+                'severity': 'error',
+                'message': f"{len(clique)} events{periods} pairwise share a teacher, group or room "
+                           f"but only {num_timeslots} timeslots are available",
+                'resources': [index.event_ids[e] for e in clique],
+                'required': required,
+                'available': num_timeslots
+            })
+        issues.extend(FeasibilityAnalyzer._check_rooms(index, num_timeslots))
+
+        return {
+            'valid': not any(issue['severity'] == 'error' for issue in issues),
+            'issues': issues,
+            'bounds': {
+                'num_timeslots': num_timeslots,
+                'min_timeslots': required,
+                'max_clique': [index.event_ids[e] for e in clique],
+                'max_teacher_load': max((sum(durations[e] for e in events) for events in index.teacher_events), default=0),
+                'max_group_load': max((sum(durations[e] for e in events) for events in index.group_events), default=0),
+                'max_room_load': max((sum(durations[e] for e in events) for events in index.room_events), default=0)
+            }
+        }
+
+    @staticmethod
+    def _check_loads(index: ProblemIndex, num_timeslots: int, durations: Optional[List[int]] = None) -> List[Dict]:
+        """Periods per teacher/group/room against the slots that resource can use"""
+        durations = durations or BlockLayout.durations(index)
+        issues = []
+        sections = (
+            ('Teacher', index.teacher_ids, index.teachers, index.teacher_events),
+            ('Student group', index.group_ids, index.student_groups, index.group_events),
+            ('Room', index.room_ids, index.rooms, index.room_events)
+        )
+        for label, ids, items, event_lists in sections:
+            for pos, events in enumerate(event_lists):
+                available = num_timeslots
+                item = items[pos] or {}
+                # Optional per-resource limits: a weekly hour cap, or explicit slot numbers
+                if isinstance(item.get('max_hours'), int):
+                    available = min(available, item['max_hours'])
+                slots = item.get('availability')
+                if isinstance(slots, list) and all(isinstance(s, int) for s in slots):
+                    available = min(available, len({s for s in slots if 0 <= s < num_timeslots}))
+                load = sum(durations[e] for e in events)
+                if load > available:
+                    periods = f" ({load} periods)" if load != len(events) else ""
+                    issues.append({
+                        'type': f"{label} overload",
+                        'severity': 'error',
+                        'message': f"{label} {ids[pos]} has {len(events)} events{periods} "
+                                   f"but only {available} usable timeslots",
+                        'resources': [ids[pos]],
+                        'required': load,
+                        'available': available
+                    })
+        return issues
+
+    @staticmethod
+    def _check_rooms(index: ProblemIndex, num_timeslots: int) -> List[Dict]:
+        """Seat demand of events against listed room capacities"""
+        capacities = [room.get('capacity') for room in index.rooms if room is not None]
+        capacities = [c for c in capacities if isinstance(c, (int, float))]
+        group_sizes = [
+            group.get('size') if group is not None and isinstance(group.get('size'), (int, float)) else 0
+            for group in index.student_groups
+        ]
+        if not capacities:
+            return []
+
+        issues = []
+        largest = max(capacities)
+        demand = 0
+        for e in range(index.num_events):
+            seats = sum(group_sizes[g] for g in index.event_groups[e])
+            demand += seats
+            room = index.event_room[e]
+            if room >= 0:
+                capacity = (index.rooms[room] or {}).get('capacity')
+                if isinstance(capacity, (int, float)) and seats > capacity:
+                    issues.append({
+                        'type': 'Room capacity',
+                        'severity': 'warning',
+                        'message': f"Event {index.event_ids[e]} needs {seats} seats but room "
+                                   f"{index.room_ids[room]} holds {capacity}",
+                        'resources': [index.event_ids[e], index.room_ids[room]],
+                        'required': seats,
+                        'available': capacity
+                    })
+            elif seats > largest:
+                issues.append({
+                    'type': 'Room capacity',
+                    'severity': 'warning',
+                    'message': f"Event {index.event_ids[e]} needs {seats} seats but the largest room holds {largest}",
+                    'resources': [index.event_ids[e]],
+                    'required': seats,
+                    'available': largest
+                })
+
+        total = sum(capacities) * num_timeslots
+        if demand > total:
+            issues.append({
+                'type': 'Room capacity',
+                'severity': 'warning',
+                'message': f"Events need {demand} seat-hours but the rooms offer {total}",
+                'resources': [],
+                'required': demand,
+                'available': total
+            })
+        if index.num_events > len(capacities) * num_timeslots:
+            issues.append({
+                'type': 'Room capacity',
+                'severity': 'warning',
+                'message': f"{index.num_events} events do not fit {len(capacities)} rooms "
+                           f"over {num_timeslots} timeslots",
+                'resources': [],
+                'required': index.num_events,
+                'available': len(capacities) * num_timeslots
+            })
+        return issues
+
+    @staticmethod
+    def find_clique(index: ProblemIndex) -> List[int]:
+        """
+        Large clique of the conflict graph (event positions)
+        Starts from the biggest resource cliques and greedily adds events that
+        conflict with every member. Any clique is a valid lower bound.
+        """
+        resource_lists = sorted(index.resource_events(), key=len, reverse=True)
+        best = list(resource_lists[0]) if resource_lists else []
+        for seed in resource_lists[:FeasibilityAnalyzer.CLIQUE_SEEDS]:
+            clique = FeasibilityAnalyzer._extend_clique(index, list(seed))
+            if len(clique) > len(best):
+                best = clique
+        return best
+
+    @staticmethod
+    def _extend_clique(index: ProblemIndex, clique: List[int]) -> List[int]:
+        if not clique:
+            return clique
+        members = set(clique)
+        # Candidates must conflict with the first member, so they share one of its resources
+        candidates = FeasibilityAnalyzer._neighbors(index, clique[0]) - members
+        neighbor_sets = {e: FeasibilityAnalyzer._neighbors(index, e) for e in candidates}
+        candidates = [e for e in candidates if members <= neighbor_sets[e]]
+        # Most connected candidates first
+        candidates.sort(key=lambda e: -len(neighbor_sets[e]))
+        for e in candidates:
+            if members <= neighbor_sets[e]:
+                clique.append(e)
+                members.add(e)
+        return clique
+
+    @staticmethod
+    def _neighbors(index: ProblemIndex, e: int) -> Set[int]:
+        """Events sharing a teacher, group or room with event e (including e)"""
+        neighbors = set()
+        if index.event_teacher[e] >= 0:
+            neighbors.update(index.teacher_events[index.event_teacher[e]])
+        for g in index.event_groups[e]:
+            neighbors.update(index.group_events[g])
+        if index.event_room[e] >= 0:
+            neighbors.update(index.room_events[index.event_room[e]])
+        return neighbors
@@ -0,0 +1,278 @@
+# python_models/utils/graph_export.py
+from typing import Dict, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape, quoteattr
+import json
+import os
+import numpy as np
+from .clique_graph import CliqueGraph
+from .graph_metrics import GraphMetrics
+
+
+class GraphExport:
+    """
+    Headless conflict-graph rendering to files
+    Layouts are linear-time NumPy: nodes are grouped (by timeslot/colour or by
+    connected component), each group is drawn as a sunflower disc and the
+    discs are shelf-packed. 'spring' refines that start with a force layout
+    whose repulsion uses a few random pivots per round instead of all pairs.
+    SVG, GraphML and JSON are written directly; PNG needs matplotlib and
+    renders on the Agg canvas, so no display is ever touched.
+    """
+
+    FORMATS = ('svg', 'png', 'graphml', 'json')
+    LAYOUTS = ('timeslots', 'components', 'spring')
+    PALETTE = ('#4e79a7', '#f28e2b', '#e15759', '#76b7b2', '#59a14f', '#edc948',
+               '#b07aa1', '#ff9da7', '#9c755f', '#bab0ac', '#86bcb6', '#d37295')
+    GOLDEN_ANGLE = np.pi * (3 - np.sqrt(5))
+
+    @staticmethod
+    def groups_from_schedule(schedule: Dict) -> Dict:
+        """event id -> timeslot, for the 'timeslots' layout"""
+        return {event['id']: slot for slot, events in schedule.get('timeslots', {}).items() for event in events}
+
+    @staticmethod
+    def adjacency(graph, labels: Optional[Sequence] = None) -> Tuple[np.ndarray, np.ndarray, List]:
+        """CSR adjacency plus node labels of a networkx graph or CliqueGraph"""
+        if isinstance(graph, CliqueGraph):
+            indptr, indices = GraphMetrics.csr_from_clique_graph(graph)
+            return indptr, indices, list(labels) if labels is not None else list(range(len(indptr) - 1))
+        indptr, indices = GraphMetrics.csr_from_networkx(graph)
+        return indptr, indices, list(labels) if labels is not None else list(graph)
+
+    @staticmethod
+    def sample(indptr: np.ndarray, indices: np.ndarray, max_nodes: Optional[int] = None,
+               max_edges: Optional[int] = None, seed: Optional[int] = 0):
+        """
+        Induced subgraph on at most max_nodes random nodes, keeping at most
+        max_edges random edges; returns (kept node positions, indptr, indices)
+        """
+        n = len(indptr) - 1
+        rng = np.random.default_rng(seed)
+        nodes = np.arange(n)
+        if max_nodes is not None and n > max_nodes:
+            nodes = np.sort(rng.choice(n, max_nodes, replace=False))
+            position = np.full(n, -1)
+            position[nodes] = np.arange(len(nodes))
+            rows = np.repeat(np.arange(n), np.diff(indptr))
+            keep = (position[rows] >= 0) & (position[indices] >= 0)
+            indptr, indices = GraphMetrics._csr(position[rows[keep]], position[indices[keep]], len(nodes))
+        if max_edges is not None and len(indices) // 2 > max_edges:
+            rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+            upper = np.flatnonzero(rows < indices)
+            chosen = rng.choice(upper, max_edges, replace=False)
+            rows, cols = rows[chosen], indices[chosen]
+            indptr, indices = GraphMetrics._csr(np.concatenate([rows, cols]), np.concatenate([cols, rows]),
+                                                len(indptr) - 1)
+        return nodes, indptr, indices
+
+    @staticmethod
+    def layout(indptr: np.ndarray, indices: np.ndarray, groups: Optional[np.ndarray] = None,
+               method: str = 'components', iterations: int = 30, pivots: int = 32,
+               seed: Optional[int] = 0) -> np.ndarray:
+        """(n, 2) positions; groups are per-node group numbers for 'timeslots'"""
+        if method not in GraphExport.LAYOUTS:
+            raise ValueError(f"Unknown layout: {method}")
+        if method == 'timeslots':
+            if groups is None:
+                raise ValueError("The 'timeslots' layout needs a group per node")
+        else:
+            groups = GraphMetrics.component_labels(indptr, indices)
+        positions = GraphExport._pack(np.asarray(groups))
+        if method == 'spring':
+            positions = GraphExport._spring(indptr, indices, positions, iterations, pivots, seed)
+        return positions
+
+    @staticmethod
+    def _pack(groups: np.ndarray) -> np.ndarray:
+        """Sunflower disc per group, discs shelf-packed largest first"""
+        n = len(groups)
+        positions = np.zeros((n, 2))
+        if n == 0:
+            return positions
+        _, group, sizes = np.unique(groups, return_inverse=True, return_counts=True)
+        group = group.ravel()
+        # Nodes ordered by group, biggest groups first; rank is the index within the group
+        order_of_group = np.argsort(-sizes, kind='stable')
+        group_rank = np.empty_like(order_of_group)
+        group_rank[order_of_group] = np.arange(len(sizes))
+        order = np.argsort(group_rank[group], kind='stable')
+        starts = np.concatenate(([0], np.cumsum(sizes[order_of_group])[:-1]))
+        rank = np.arange(n) - np.repeat(starts, sizes[order_of_group])
+
+        radius = np.sqrt(rank + 0.5)
+        angle = rank * GraphExport.GOLDEN_ANGLE
+        local = np.column_stack([radius * np.cos(angle), radius * np.sin(angle)])
+
+        # Shelf packing of discs of radius sqrt(size) + 1
+        disc = np.sqrt(sizes[order_of_group]) + 1.0
+        width = max(2.0 * disc[0], 2.0 * np.sqrt(np.sum((2 * disc) ** 2)))
+        centers = np.zeros((len(disc), 2))
+        x = y = shelf = 0.0
+        for g, r in enumerate(disc):
+            if x + 2 * r > width and x > 0:
+                x, y, shelf = 0.0, y + shelf, 0.0
+            centers[g] = (x + r, y + r)
+            x += 2 * r
+            shelf = max(shelf, 2 * r)
+
+        positions[order] = local + np.repeat(centers, sizes[order_of_group], axis=0)
+        return positions
+
+    @staticmethod
+    def _spring(indptr: np.ndarray, indices: np.ndarray, positions: np.ndarray, iterations: int,
+                pivots: int, seed: Optional[int]) -> np.ndarray:
+        """Fruchterman-Reingold style rounds; repulsion sampled from random pivots"""
+        n = len(positions)
+        if n < 2:
+            return positions
+        rng = np.random.default_rng(seed)
+        positions = positions.copy()
+        rows = np.repeat(np.arange(n), np.diff(indptr))
+        span = np.ptp(positions, axis=0).max() or 1.0
+        k = span / np.sqrt(n)
+        temperature = span / 10
+        for _ in range(iterations):
+            # Repulsion from a random pivot sample, scaled up to all nodes
+            chosen = rng.choice(n, min(pivots, n), replace=False)
+            delta = positions[:, None, :] - positions[chosen][None, :, :]
+            distance = np.maximum(np.linalg.norm(delta, axis=2), 1e-3 * k)
+            force = (delta * (k * k / distance ** 2)[:, :, None]).sum(axis=1) * (n / len(chosen))
+            # Attraction along edges
+            if len(indices):
+                delta = positions[indices] - positions[rows]
+                pull = delta * (np.linalg.norm(delta, axis=1) / k)[:, None]
+                force[:, 0] += np.bincount(rows, weights=pull[:, 0], minlength=n)
+                force[:, 1] += np.bincount(rows, weights=pull[:, 1], minlength=n)
+            length = np.maximum(np.linalg.norm(force, axis=1), 1e-9)
+            positions += force * (np.minimum(length, temperature) / length)[:, None]
+            temperature *= 0.9
+        return positions
+
+    @staticmethod
+    def export(graph, path: str, fmt: Optional[str] = None, layout: Optional[str] = None,
+               groups: Optional[Dict] = None, labels: Optional[Sequence] = None,
+               max_nodes: Optional[int] = None, max_edges: Optional[int] = None,
+               seed: Optional[int] = 0) -> Dict:
+        """
+        Lay out and write graph to path; fmt defaults to the file extension
+        - groups: node label -> group (e.g. groups_from_schedule), enables 'timeslots'
+        - labels: node labels for a CliqueGraph (e.g. index.event_ids)
+        - max_nodes / max_edges: random sampling for huge graphs
+        """
+        fmt = (fmt or os.path.splitext(path)[1].lstrip('.')).lower()
+        if fmt not in GraphExport.FORMATS:
+            raise ValueError(f"Unknown format: {fmt}")
+        layout = layout or ('timeslots' if groups else 'components')
+
+        indptr, indices, names = GraphExport.adjacency(graph, labels)
+        total_nodes, total_edges = len(names), len(indices) // 2
+        nodes, indptr, indices = GraphExport.sample(indptr, indices, max_nodes, max_edges, seed)
+        names = [names[i] for i in nodes]
+        group_values = [groups.get(name) for name in names] if groups else None
+        group_numbers = None
+        if group_values is not None:
+            # Unscheduled nodes share one extra group
+            _, group_numbers = np.unique([str(value) for value in group_values], return_inverse=True)
+        positions = GraphExport.layout(indptr, indices, group_numbers, layout, seed=seed)
+
+        rows = np.repeat(np.arange(len(names)), np.diff(indptr))
+        upper = rows < indices
+        edges = np.column_stack([rows[upper], indices[upper]])
+        colors = group_numbers if group_numbers is not None else GraphMetrics.component_labels(indptr, indices)
+        colors = np.unique(colors, return_inverse=True)[1].ravel() if len(colors) else colors
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        writer = getattr(GraphExport, f'_write_{fmt}')
+        writer(path, names, positions, edges, colors, group_values)
+        return {
+            'path': path,
+            'format': fmt,
+            'layout': layout,
+            'nodes': len(names),
+            'edges': len(edges),
+            'total_nodes': total_nodes,
+            'total_edges': total_edges
+        }
+
+    @staticmethod
+    def _viewport(positions: np.ndarray, size: float = 1000.0, margin: float = 10.0):
+        """Positions scaled into a size x size box, plus the node radius"""
+        if len(positions) == 0:
+            return positions, 1.0
+        low = positions.min(axis=0)
+        scale = (size - 2 * margin) / (np.ptp(positions, axis=0).max() or 1.0)
+        radius = float(np.clip(0.4 * scale, 0.5, 6.0))
+        return (positions - low) * scale + margin, radius
+
+    @staticmethod
+    def _write_svg(path, names, positions, edges, colors, group_values):
+        points, radius = GraphExport._viewport(positions)
+        palette = GraphExport.PALETTE
+        with open(path, 'w') as f:
+            f.write('<svg xmlns="http://www.w3.org/2000/svg" width="1000" height="1000" viewBox="0 0 1000 1000">\n')
+            if len(edges):
+                segments = np.concatenate([points[edges[:, 0]], points[edges[:, 1]]], axis=1)
+                f.write('<path stroke="#999" stroke-opacity="0.3" stroke-width="0.5" fill="none" d="')
+                f.write(''.join('M%.1f %.1fL%.1f %.1f' % tuple(s) for s in segments))
+                f.write('"/>\n')
+            for (x, y), name, color in zip(points, names, colors):
+                f.write(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{radius:.1f}" fill="{palette[color % len(palette)]}">'
+                        f'<title>{escape(str(name))}</title></circle>\n')
+            f.write('</svg>\n')
+
+    @staticmethod
+    def _write_png(path, names, positions, edges, colors, group_values):
+        try:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.collections import LineCollection
+            from matplotlib.figure import Figure
+        except ImportError:
+            raise ImportError("PNG export requires matplotlib. Install with: pip install matplotlib") from None
+        points, radius = GraphExport._viewport(positions)
+        palette = GraphExport.PALETTE
+        figure = Figure(figsize=(10, 10), dpi=100)
+        FigureCanvasAgg(figure)
+        axes = figure.add_axes((0, 0, 1, 1))
+        axes.set_axis_off()
+        axes.set_xlim(0, 1000)
+        axes.set_ylim(1000, 0)
+        if len(edges):
+            axes.add_collection(LineCollection(np.stack([points[edges[:, 0]], points[edges[:, 1]]], axis=1),
+                                               colors='#999999', alpha=0.3, linewidths=0.5))
+        axes.scatter(points[:, 0], points[:, 1], s=(2 * radius) ** 2,
+                     c=[palette[color % len(palette)] for color in colors], linewidths=0)
+        figure.savefig(path)
+
+    @staticmethod
+    def _write_graphml(path, names, positions, edges, colors, group_values):
+        with open(path, 'w') as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                    '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+                    '<key id="x" for="node" attr.name="x" attr.type="double"/>\n'
+                    '<key id="y" for="node" attr.name="y" attr.type="double"/>\n'
+                    '<key id="group" for="node" attr.name="group" attr.type="string"/>\n'
+                    '<graph edgedefault="undirected">\n')
+            for i, (name, (x, y)) in enumerate(zip(names, positions)):
+                group = group_values[i] if group_values is not None else colors[i]
+                f.write(f'<node id={quoteattr(str(name))}><data key="x">{x:.3f}</data><data key="y">{y:.3f}</data>'
+                        f'<data key="group">{escape(str(group))}</data></node>\n')
+            for a, b in edges:
+                f.write(f'<edge source={quoteattr(str(names[a]))} target={quoteattr(str(names[b]))}/>\n')
+            f.write('</graph>\n</graphml>\n')
+
+    @staticmethod
+    def _write_json(path, names, positions, edges, colors, group_values):
+        nodes = [
+            {
+                'id': name,
+                'x': round(float(x), 3),
+                'y': round(float(y), 3),
+                'group': group_values[i] if group_values is not None else int(colors[i])
+            }
+            for i, (name, (x, y)) in enumerate(zip(names, positions))
+        ]
+        with open(path, 'w') as f:
+            # Edges are [i, j] positions into nodes
+            json.dump({'nodes': nodes, 'edges': edges.tolist()}, f, default=str)
@@ -0,0 +1,177 @@
+# python_models/utils/graph_metrics.py
+from typing import Dict, Optional, Tuple
+import numpy as np
+
+
+class GraphMetrics:
+    """
+    Conflict-graph metrics over a CSR adjacency (int32 indptr/indices)
+    Everything is vectorised with NumPy; SciPy is used for connected
+    components when installed. Clustering is estimated from sampled nodes
+    (exact for nodes with few neighbour pairs) so dense graphs stay cheap.
+    """
+
+    @staticmethod
+    def csr_from_networkx(graph) -> Tuple[np.ndarray, np.ndarray]:
+        """CSR adjacency of a networkx graph (nodes numbered in iteration order)"""
+        n = graph.number_of_nodes()
+        try:
+            import networkx as nx
+            matrix = nx.to_scipy_sparse_array(graph, format='csr')
+            return matrix.indptr.astype(np.int64), matrix.indices.astype(np.int32)
+        except ImportError:
+            pass
+        positions = {node: i for i, node in enumerate(graph)}
+        edges = np.fromiter((positions[x] for edge in graph.edges() for x in edge), dtype=np.int64,
+                            count=2 * graph.number_of_edges()).reshape(-1, 2)
+        return GraphMetrics._csr(np.concatenate([edges[:, 0], edges[:, 1]]),
+                                 np.concatenate([edges[:, 1], edges[:, 0]]), n)
+
+    @staticmethod
+    def csr_from_clique_graph(graph) -> Tuple[np.ndarray, np.ndarray]:
+        """CSR adjacency of a CliqueGraph; shared cliques are merged into single edges"""
+        n = graph.number_of_nodes()
+        members = np.frombuffer(graph.resource_events, dtype=np.int32)
+        ptr = np.frombuffer(graph.resource_ptr, dtype=np.int32).astype(np.int64)
+        if len(members) == 0:
+            return np.zeros(n + 1, dtype=np.int64), np.zeros(0, dtype=np.int32)
+        # Every member of a size-k clique is paired with all k members of it
+        sizes = np.diff(ptr)
+        member_size = np.repeat(sizes, sizes)
+        member_start = np.repeat(ptr[:-1], sizes)
+        block_start = np.cumsum(member_size) - member_size
+        within = np.arange(int(member_size.sum()), dtype=np.int64) - np.repeat(block_start, member_size)
+        rows = np.repeat(members, member_size)
+        cols = members[np.repeat(member_start, member_size) + within]
+        keep = rows != cols
+        return GraphMetrics._csr(rows[keep], cols[keep], n)
+
+    @staticmethod
+    def _csr(rows: np.ndarray, cols: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        # Sort and drop repeats (faster than np.unique's hashing on large key arrays)
+        keys = np.sort(rows.astype(np.int64) * n + cols)
+        if len(keys):
+            keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+        rows, cols = keys // n, keys % n
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        return indptr, cols.astype(np.int32)
+
+    @staticmethod
+    def compute(indptr: np.ndarray, indices: np.ndarray, sample: int = 500, pairs: int = 64,
+                seed: Optional[int] = 0) -> Dict:
+        """Degree stats, density, components, sampled clustering and a clique lower bound"""
+        n = len(indptr) - 1
+        degrees = np.diff(indptr)
+        num_edges = int(degrees.sum()) // 2
+        metrics = {
+            'num_nodes': n,
+            'num_edges': num_edges,
+            'density': 2.0 * num_edges / (n * (n - 1)) if n > 1 else 0.0,
+            'average_degree': float(degrees.mean()) if n else 0.0,
+            'max_degree': int(degrees.max()) if n else 0,
+            'min_degree': int(degrees.min()) if n else 0,
+            'degree_std': float(degrees.std()) if n else 0.0,
+            'isolated_nodes': int(np.count_nonzero(degrees == 0)),
+            'connected_components': GraphMetrics.connected_components(indptr, indices),
+        }
+        clustering, sampled = GraphMetrics.estimate_clustering(indptr, indices, sample, pairs, seed)
+        metrics['clustering_coefficient'] = float(clustering)
+        metrics['clustering_sampled_nodes'] = sampled
+        metrics['clique_lower_bound'] = len(GraphMetrics.greedy_clique(indptr, indices))
+        return metrics
+
+    @staticmethod
+    def connected_components(indptr: np.ndarray, indices: np.ndarray) -> int:
+        n = len(indptr) - 1
+        if n == 0:
+            return 0
+        labels = GraphMetrics.component_labels(indptr, indices)
+        return int(np.count_nonzero(labels == np.arange(n)))
+
+    @staticmethod
+    def component_labels(indptr: np.ndarray, indices: np.ndarray) -> np.ndarray:
+        """Per-node component label: the smallest node id in its component"""
+        n = len(indptr) - 1
+        labels = np.arange(n)
+        if n == 0:
+            return labels
+        try:
+            from scipy.sparse import csr_matrix
+            from scipy.sparse.csgraph import connected_components
+            matrix = csr_matrix((np.ones(len(indices), dtype=np.int8), indices, indptr), shape=(n, n))
+            _, components = connected_components(matrix, directed=False)
+            # Relabel scipy's component numbers by their first node
+            first = np.full(components.max() + 1, n)
+            np.minimum.at(first, components, labels)
+            return first[components]
+        except ImportError:
+            pass
+        # Min-label propagation with pointer jumping
+        degrees = np.diff(indptr)
+        active = degrees > 0
+        starts = indptr[:-1][active]
+        while True:
+            updated = labels.copy()
+            if len(indices):
+                neighbor_min = np.minimum.reduceat(labels[indices], starts)
+                updated[active] = np.minimum(labels[active], neighbor_min)
+            # Follow label chains so long paths converge in few rounds
+            while True:
+                jumped = updated[updated]
+                if np.array_equal(jumped, updated):
+                    break
+                updated = jumped
+            if np.array_equal(updated, labels):
+                return labels
+            labels = updated
+
+    @staticmethod
+    def estimate_clustering(indptr: np.ndarray, indices: np.ndarray, sample: int = 500,
+                            pairs: int = 64, seed: Optional[int] = 0) -> Tuple[float, int]:
+        """
+        Average clustering over sampled nodes (nodes of degree < 2 count as 0)
+        Each node's local clustering is exact when it has at most `pairs`
+        neighbour pairs, otherwise estimated from `pairs` random pairs.
+        """
+        n = len(indptr) - 1
+        if n == 0:
+            return 0.0, 0
+        rng = np.random.default_rng(seed)
+        nodes = np.arange(n) if n <= sample else rng.choice(n, sample, replace=False)
+        edge_keys = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr)) * n + indices
+        total = 0.0
+        for v in nodes:
+            neighbors = indices[indptr[v]:indptr[v + 1]]
+            d = len(neighbors)
+            if d < 2:
+                continue
+            if d * (d - 1) // 2 <= pairs:
+                a, b = np.triu_indices(d, 1)
+            else:
+                a, b = rng.integers(0, d, pairs), rng.integers(0, d - 1, pairs)
+                b = b + (b >= a)
+            keys = neighbors[a].astype(np.int64) * n + neighbors[b]
+            found = np.searchsorted(edge_keys, keys)
+            found = np.minimum(found, len(edge_keys) - 1)
+            total += np.count_nonzero(edge_keys[found] == keys) / len(keys)
+        return total / len(nodes), len(nodes)
+
+    @staticmethod
+    def greedy_clique(indptr: np.ndarray, indices: np.ndarray, seeds: int = 10) -> np.ndarray:
+        """Clique grown greedily from the highest-degree nodes (a lower bound on the clique number)"""
+        n = len(indptr) - 1
+        if n == 0:
+            return np.zeros(0, dtype=np.int32)
+        degrees = np.diff(indptr)
+        best = np.array([int(np.argmax(degrees))], dtype=np.int32)
+        for seed in np.argsort(-degrees, kind='stable')[:seeds]:
+            clique = [int(seed)]
+            candidates = indices[indptr[seed]:indptr[seed + 1]]
+            while len(candidates):
+                v = int(candidates[np.argmax(degrees[candidates])])
+                clique.append(v)
+                candidates = np.intersect1d(candidates, indices[indptr[v]:indptr[v + 1]], assume_unique=True)
+            if len(clique) > len(best):
+                best = np.array(clique, dtype=np.int32)
+        return best
@@ -1,6 +1,9 @@
 # python_models/utils/graph_utils.py
 import networkx as nx
-from typing import Dict, List
+from typing import Dict, List, Optional
+from .clique_graph import CliqueGraph
+from .graph_export import GraphExport
+from .graph_metrics import GraphMetrics
 
 class GraphUtils:
     """Utility class for graph operations related to timetabling"""
@@ -50,26 +53,23 @@ class GraphUtils:
         return [graph.subgraph(c).copy() for c in nx.connected_components(graph)]
     
     @staticmethod
-    def visualize_graph(graph: nx.Graph):
-        """Visualize the conflict graph (requires matplotlib)"""
-        try:
-            import matplotlib.pyplot as plt
-            pos = nx.spring_layout(graph)
-            nx.draw(graph, pos, with_labels=True, node_color='lightblue', 
-                   edge_color='gray', node_size=500, font_size=8)
-            plt.show()
-        except ImportError:
-            print("Visualization requires matplotlib. Install with: pip install matplotlib")
+    def visualize_graph(graph, path: str, groups: Optional[Dict] = None,
+                        layout: Optional[str] = None, max_nodes: Optional[int] = 2000, **options) -> Dict:
+        """
+        Render the conflict graph to path (svg, png, graphml or json by extension)
+        Callers choose the file; nothing is written to the working directory
+        by default. Runs headless; graphs above max_nodes are sampled. See GraphExport.export.
+        """
+        return GraphExport.export(graph, path, layout=layout, groups=groups, max_nodes=max_nodes, **options)
 
     @staticmethod
-    def calculate_graph_metrics(graph: nx.Graph) -> Dict:
-        """Calculate various metrics for the conflict graph"""
-        metrics = {
-            'num_nodes': graph.number_of_nodes(),
-            'num_edges': graph.number_of_edges(),
-            'density': nx.density(graph),
-            'average_degree': sum(dict(graph.degree()).values()) / graph.number_of_nodes(),
-            'clustering_coefficient': nx.average_clustering(graph),
-            'connected_components': nx.number_connected_components(graph)
-        }
-        return metrics
\ No newline at end of file
+    def calculate_graph_metrics(graph, sample: int = 500, seed: Optional[int] = 0) -> Dict:
+        """
+        Calculate various metrics for the conflict graph (networkx Graph or CliqueGraph)
+        clustering_coefficient is estimated from `sample` nodes; see GraphMetrics
+        """
+        if isinstance(graph, CliqueGraph):
+            indptr, indices = GraphMetrics.csr_from_clique_graph(graph)
+        else:
+            indptr, indices = GraphMetrics.csr_from_networkx(graph)
+        return GraphMetrics.compute(indptr, indices, sample=sample, seed=seed)
@@ -0,0 +1,123 @@
+# python_models/utils/instance_generator.py
+from typing import Dict, List
+import random
+
+class InstanceGenerator:
+    """Seeded generator of synthetic university timetabling instances"""
+
+    DAYS = 5
+    PERIODS_PER_DAY = 8
+
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+
+    def generate(self, num_events: int = 200, num_teachers: int = 20, num_groups: int = 10,
+                 num_rooms: int = 10, num_programs: int = 3, num_shared_courses: int = 5,
+                 num_electives: int = 10, density: float = 0.2, room_share: float = 0.5,
+                 num_timeslots: int = DAYS * PERIODS_PER_DAY) -> Dict:
+        """
+        Generate one instance in the standard input shape
+        - events: lectures of a program, each taught by one teacher of that program
+        - density: probability that an event is shared with a second group of
+          the same program (joint lecture), which adds conflict edges
+        - room_share: fraction of events pinned to a specific room
+        The same courses are also exposed as 'courses', 'shared_courses' and
+        group 'electives' so MultiAgentModel can run on the same instance.
+        """
+        rng = random.Random(self.seed)
+        num_programs = max(1, min(num_programs, num_groups, num_teachers))
+
+        programs = [{'id': f"P{p:03d}", 'name': f"Program {p}"} for p in range(num_programs)]
+        teachers = [
+            {'id': f"T{t:04d}", 'name': f"Teacher {t}", 'program': programs[t % num_programs]['id']}
+            for t in range(num_teachers)
+        ]
+        student_groups = [
+            {
+                'id': f"G{g:04d}",
+                'name': f"Group {g}",
+                'program': programs[g % num_programs]['id'],
+                'size': rng.randint(20, 60),
+                'electives': []
+            }
+            for g in range(num_groups)
+        ]
+        rooms = [
+            {
+                'id': f"R{r:03d}",
+                'name': f"Room {r}",
+                'capacity': rng.choice((30, 40, 60, 80, 120)),
+                'equipment': rng.sample(['projector', 'whiteboard', 'computers', 'lab_bench'], 2)
+            }
+            for r in range(num_rooms)
+        ]
+
+        teachers_by_program = self._by_program(teachers)
+        groups_by_program = self._by_program(student_groups)
+
+        events = []
+        courses = []
+        for e in range(num_events):
+            group = student_groups[e % num_groups]
+            program = group['program']
+            attendees = [group['id']]
+            peers = [g['id'] for g in groups_by_program[program] if g['id'] != group['id']]
+            if peers and rng.random() < density:
+                attendees.append(rng.choice(peers))
+            event = {
+                'id': f"E{e:05d}",
+                'name': f"Lecture {e}",
+                'teacher': rng.choice(teachers_by_program[program])['id'],
+                'student_groups': attendees
+            }
+            if rooms and rng.random() < room_share:
+                event['room'] = rng.choice(rooms)['id']
+            events.append(event)
+            courses.append({
+                'id': event['id'],
+                'name': event['name'],
+                'teacher': event['teacher'],
+                'student_groups': attendees
+            })
+
+        shared_courses = []
+        for c in range(num_shared_courses):
+            shared = {
+                'id': f"S{c:04d}",
+                'name': f"Shared course {c}",
+                'teacher': rng.choice(teachers)['id'],
+                'student_groups': [g['id'] for g in rng.sample(student_groups, min(3, num_groups))]
+            }
+            if rooms:
+                shared['required_room'] = rng.choice(rooms)['id']
+            shared_courses.append(shared)
+
+        for c in range(num_electives):
+            group = rng.choice(student_groups)
+            group['electives'].append({
+                'id': f"L{c:04d}",
+                'name': f"Elective {c}",
+                'teacher': rng.choice(teachers)['id']
+            })
+
+        return {
+            'num_timeslots': num_timeslots,
+            'events': events,
+            'teachers': teachers,
+            'student_groups': student_groups,
+            'rooms': rooms,
+            'courses': courses,
+            'shared_courses': shared_courses,
+            'programs': programs,
+            'curricula': [
+                {'program': p['id'], 'student_groups': [g['id'] for g in groups_by_program[p['id']]]}
+                for p in programs
+            ]
+        }
+
+    @staticmethod
+    def _by_program(items: List[Dict]) -> Dict[str, List[Dict]]:
+        grouped = {}
+        for item in items:
+            grouped.setdefault(item['program'], []).append(item)
+        return grouped
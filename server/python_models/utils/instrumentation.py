@@ -0,0 +1,222 @@
+# python_models/utils/instrumentation.py
+from contextlib import contextmanager
+from typing import Dict, Optional, TextIO
+import json
+import logging
+import sys
+import time
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Logger for scheduler diagnostics
+    Records go to stderr so they never mix with the JSON written to stdout
+    """
+    logger = logging.getLogger('python_models')
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(_JsonLogFormatter())
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger.getChild(name)
+
+
+class _JsonLogFormatter(logging.Formatter):
+    """Format log records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'type': 'log',
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        entry.update(getattr(record, 'fields', {}))
+        return json.dumps(entry, default=str)
+
+
+class _NullPhase:
+    """Shared no-op context manager returned when instrumentation is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class Instrumentation:
+    """
+    Per-run phase timers, counters, peak-memory sampling and optional cProfile capture
+    A disabled instance turns every call into a constant-time no-op, so models
+    can keep their instrumentation calls in place at near-zero cost.
+    Peak memory per phase is the highest traced size while the phase was open,
+    nested phases included.
+    """
+
+    def __init__(self, enabled: bool = True, trace_memory: bool = False,
+                 profile: bool = False, profile_output: Optional[str] = None,
+                 profile_limit: int = 20):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.profile = enabled and (profile or profile_output is not None)
+        self.profile_output = profile_output
+        self.profile_limit = profile_limit
+        self.reset()
+
+    @classmethod
+    def disabled(cls) -> 'Instrumentation':
+        return _DISABLED
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'Instrumentation':
+        """Instance configured from a request's 'config' block (see configure)"""
+        instrumentation = cls()
+        instrumentation.configure(config)
+        return instrumentation
+
+    def configure(self, config: Dict):
+        """
+        Apply config.stats (default on), config.trace_memory and config.profile
+        profile_output is not read from requests: it would let callers write
+        files on the server. The profile summary still goes in the stats block.
+        """
+        self.enabled = bool(config.get('stats', True))
+        self.trace_memory = self.enabled and bool(config.get('trace_memory', False))
+        self.profile = self.enabled and (bool(config.get('profile', False)) or self.profile_output is not None)
+        if isinstance(config.get('profile_limit'), int):
+            self.profile_limit = config['profile_limit']
+
+    def reset(self):
+        """Clear collected data so the instance can be reused for another run"""
+        self.timings = {}
+        self.counters = {}
+        self.memory = {}
+        self.profile_summary = []
+        self._profiler = None
+        self._started_tracemalloc = False
+        # Running peak of each open phase, innermost last
+        self._peaks = []
+
+    def _fold_peak(self) -> int:
+        """Fold the traced peak since the last reset into every open phase"""
+        import tracemalloc
+        peak = tracemalloc.get_traced_memory()[1]
+        self._peaks = [max(open_peak, peak) for open_peak in self._peaks]
+        return peak
+
+    @contextmanager
+    def _timed(self, name: str):
+        if self.trace_memory:
+            import tracemalloc
+            # Outer phases keep their peak so far; this phase measures from here
+            self._fold_peak()
+            tracemalloc.reset_peak()
+            self._peaks.append(0)
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+            if self.trace_memory:
+                self._fold_peak()
+                peak = self._peaks.pop()
+                self.memory[name] = max(self.memory.get(name, 0), peak)
+
+    def phase(self, name: str):
+        """Context manager timing one phase; repeated phases accumulate"""
+        if not self.enabled:
+            return _NULL_PHASE
+        return self._timed(name)
+
+    @contextmanager
+    def _running(self, name: str):
+        if self.trace_memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+        if self.profile:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        try:
+            with self._timed(name):
+                yield self
+        finally:
+            if self._profiler is not None:
+                self._profiler.disable()
+                self._collect_profile()
+            if self._started_tracemalloc:
+                import tracemalloc
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+
+    def run(self, name: str = 'total'):
+        """Context manager around a whole run; starts memory tracing and profiling"""
+        if not self.enabled:
+            return _NULL_PHASE
+        return self._running(name)
+
+    def count(self, name: str, amount: int = 1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def gauge(self, name: str, value):
+        """Record a counter whose latest value wins (e.g. colors used)"""
+        if self.enabled:
+            self.counters[name] = value
+
+    def _collect_profile(self):
+        import pstats
+        if self.profile_output:
+            self._profiler.dump_stats(self.profile_output)
+        stats = pstats.Stats(self._profiler)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+        self.profile_summary = [
+            {
+                'function': f"{filename}:{line}({func})",
+                'calls': nc,
+                'total_time': round(tt, 6),
+                'cumulative_time': round(ct, 6)
+            }
+            for (filename, line, func), (cc, nc, tt, ct, callers) in rows[:self.profile_limit]
+        ]
+        self._profiler = None
+
+    def stats(self) -> Dict:
+        """Collected data as a JSON-serialisable 'stats' block"""
+        stats = {
+            'timings': {name: round(seconds, 6) for name, seconds in self.timings.items()},
+            'counters': dict(self.counters)
+        }
+        if self.trace_memory:
+            stats['peak_memory_bytes'] = dict(self.memory)
+        if self.profile_summary:
+            stats['profile'] = self.profile_summary
+        return stats
+
+    def attach(self, result: Dict) -> Dict:
+        """Add the stats block to a result dict when enabled"""
+        if self.enabled:
+            result['stats'] = self.stats()
+        return result
+
+    def emit(self, stream: Optional[TextIO] = None, **fields):
+        """Write the stats block to stderr as one structured JSON line"""
+        if not self.enabled:
+            return
+        entry = {'type': 'stats'}
+        entry.update(fields)
+        entry.update(self.stats())
+        stream = stream or sys.stderr
+        stream.write(json.dumps(entry, default=str) + '\n')
+        stream.flush()
+
+
+_DISABLED = Instrumentation(enabled=False)
@@ -0,0 +1,47 @@
+# python_models/utils/model_pool.py
+from contextlib import contextmanager
+from typing import Callable, Iterator, List
+import threading
+from ..base.scheduler_interface import SchedulerInterface
+
+
+class ModelPool:
+    """
+    Warm model instances for long-lived workers
+    acquire() hands out an idle instance (or builds one) and resets it when
+    it comes back, so per-problem state never leaks between requests while
+    caches keyed by the conflict structure (ProblemIndex.structure()) stay
+    warm for the next request with the same problem, whatever its index.
+    """
+
+    def __init__(self, factory: Callable[[], SchedulerInterface], max_idle: int = 4):
+        self.factory = factory
+        self.max_idle = max_idle
+        self.created = 0
+        self._idle: List[SchedulerInterface] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self) -> Iterator[SchedulerInterface]:
+        with self._lock:
+            model = self._idle.pop() if self._idle else None
+        if model is None:
+            model = self.factory()
+            with self._lock:
+                self.created += 1
+        try:
+            yield model
+        finally:
+            model.reset()
+            with self._lock:
+                if len(self._idle) < self.max_idle:
+                    self._idle.append(model)
+
+    def idle(self) -> int:
+        with self._lock:
+            return len(self._idle)
+
+    def clear(self):
+        """Drop idle instances and the caches they hold"""
+        with self._lock:
+            self._idle.clear()
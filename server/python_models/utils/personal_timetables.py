@@ -0,0 +1,172 @@
+# python_models/utils/personal_timetables.py
+from array import array
+from typing import Dict, List, Optional
+from urllib.parse import quote
+import json
+import os
+from .block_layout import BlockLayout
+
+
+class PersonalTimetables:
+    """
+    Per-person weekly timetables materialised from a solved schedule
+    Every teacher, student group and student gets a compact int32 slot array
+    (event position per timeslot, -1 when free) over one shared event table.
+    Students come from input 'students' ({'id', 'student_groups', 'electives'})
+    and/or group 'students' id lists; they inherit their groups' slots plus
+    their elective events. Block events (labs) fill every slot they cover.
+    Rows span the declared num_timeslots or the last slot actually used,
+    whichever is larger, so no booking is dropped. write() stores one small
+    file per person so the API can serve a single timetable without loading
+    the whole schedule.
+    """
+
+    KINDS = ('teachers', 'student_groups', 'students')
+    FREE = -1
+
+    def __init__(self, events: List[Dict], num_timeslots: int, slots: Dict[str, Dict[str, array]],
+                 clashes: Dict[str, Dict[str, List[int]]]):
+        self.events = events
+        self.num_timeslots = num_timeslots
+        self.slots = slots
+        self.clashes = clashes
+
+    @classmethod
+    def build(cls, schedule: Dict, input_data: Optional[Dict] = None,
+              num_timeslots: Optional[int] = None) -> 'PersonalTimetables':
+        """Materialise every person's timetable in one pass over the scheduled events"""
+        input_data = input_data or {}
+        placed = [(int(slot), event) for slot, slot_events in schedule.get('timeslots', {}).items()
+                  for event in slot_events]
+        if any(slot < 0 for slot, _ in placed):
+            raise ValueError("Schedule has negative timeslots")
+        if num_timeslots is None:
+            num_timeslots = input_data.get('num_timeslots') or 0
+        # Models may use more slots than declared (graph coloring is unbounded)
+        used = max((slot + BlockLayout.duration(event) for slot, event in placed), default=0)
+        num_timeslots = max(num_timeslots, used)
+
+        events, event_pos = [], {}
+        slots = {kind: {} for kind in cls.KINDS}
+        clashes = {kind: {} for kind in cls.KINDS}
+        for slot, event in placed:
+            event_pos[event['id']] = len(events)
+            events.append(cls._compact(event, slot))
+            e = len(events) - 1
+            for cell in BlockLayout.cells(slot, BlockLayout.duration(event)):
+                if event.get('teacher') is not None:
+                    cls._book(slots, clashes, 'teachers', event['teacher'], cell, e, num_timeslots)
+                for group in event.get('student_groups', []):
+                    cls._book(slots, clashes, 'student_groups', group, cell, e, num_timeslots)
+
+        # Person-level elective bookings kept by MultiAgentModel
+        for person, assignments in schedule.get('students', {}).items():
+            for assignment in assignments:
+                e = event_pos.get(assignment['event']['id'])
+                if e is not None:
+                    cls._book(slots, clashes, 'students', person, int(assignment['timeslot']), e, num_timeslots)
+
+        for student, groups, electives in cls._students(input_data):
+            for group in groups:
+                for slot, e in enumerate(slots['student_groups'].get(group, ())):
+                    if e != cls.FREE:
+                        cls._book(slots, clashes, 'students', student, slot, e, num_timeslots)
+            for event_id in electives:
+                e = event_pos.get(event_id)
+                if e is not None:
+                    for cell in BlockLayout.cells(events[e]['timeslot'], events[e]['duration']):
+                        cls._book(slots, clashes, 'students', student, cell, e, num_timeslots)
+            # Students without any booking still get an (empty) timetable
+            cls._row(slots, 'students', student, num_timeslots)
+        return cls(events, num_timeslots, slots, clashes)
+
+    @staticmethod
+    def _compact(event: Dict, slot: int) -> Dict:
+        compact = {
+            'id': event['id'],
+            'name': event.get('name'),
+            'timeslot': slot,
+            'duration': BlockLayout.duration(event),
+            'teacher': event.get('teacher'),
+            'student_groups': list(event.get('student_groups', []))
+        }
+        if 'room' in event:
+            compact['room'] = event['room']
+        return compact
+
+    @classmethod
+    def _row(cls, slots: Dict, kind: str, person, num_timeslots: int) -> array:
+        row = slots[kind].get(person)
+        if row is None:
+            row = slots[kind][person] = array('i', [cls.FREE]) * num_timeslots
+        return row
+
+    @classmethod
+    def _book(cls, slots: Dict, clashes: Dict, kind: str, person, slot: int, e: int, num_timeslots: int):
+        row = cls._row(slots, kind, person, num_timeslots)
+        if row[slot] == cls.FREE:
+            row[slot] = e
+        elif row[slot] != e:
+            # Double-booked: the first event keeps the slot, the rest are listed
+            clashes[kind].setdefault(person, []).append(e)
+
+    @staticmethod
+    def _students(input_data: Dict):
+        """(student id, group ids, elective event ids) from both input shapes"""
+        students = {}
+        for student in input_data.get('students', []):
+            entry = students.setdefault(student['id'], (set(), []))
+            entry[0].update(student.get('student_groups', student.get('groups', [])))
+            entry[1].extend(student.get('electives', []))
+        for group in input_data.get('student_groups', []):
+            for student_id in group.get('students', []):
+                students.setdefault(student_id, (set(), []))[0].add(group['id'])
+        for student_id, (groups, electives) in students.items():
+            yield student_id, sorted(groups, key=str), electives
+
+    def view(self, kind: str, person) -> Optional[Dict]:
+        """One person's timetable with events resolved, None when unknown"""
+        row = self.slots[kind].get(person)
+        if row is None:
+            return None
+        return {
+            'id': person,
+            'kind': kind,
+            'num_timeslots': self.num_timeslots,
+            'timetable': [
+                {'timeslot': slot, 'event': self.events[e]}
+                for slot, e in enumerate(row) if e != self.FREE
+            ],
+            'clashes': [self.events[e] for e in self.clashes[kind].get(person, [])]
+        }
+
+    def summary(self) -> Dict:
+        return {kind: len(self.slots[kind]) for kind in self.KINDS}
+
+    @staticmethod
+    def path(directory: str, kind: str, person) -> str:
+        """File holding one person's view (ids are percent-encoded)"""
+        return os.path.join(directory, kind, quote(str(person), safe='') + '.json')
+
+    def write(self, directory: str) -> Dict:
+        """Write one JSON file per person plus an index.json of who is where"""
+        index = {'num_timeslots': self.num_timeslots, 'people': {}}
+        for kind in self.KINDS:
+            os.makedirs(os.path.join(directory, kind), exist_ok=True)
+            for person in self.slots[kind]:
+                path = self.path(directory, kind, person)
+                with open(path, 'w') as f:
+                    json.dump(self.view(kind, person), f, default=str)
+                index['people'].setdefault(kind, {})[str(person)] = os.path.relpath(path, directory)
+        with open(os.path.join(directory, 'index.json'), 'w') as f:
+            json.dump(index, f)
+        return self.summary()
+
+    @staticmethod
+    def read(directory: str, kind: str, person) -> Optional[Dict]:
+        """Load a single person's view written by write()"""
+        try:
+            with open(PersonalTimetables.path(directory, kind, person)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
@@ -0,0 +1,89 @@
+# python_models/utils/reproducibility.py
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+import hashlib
+import json
+import random
+
+
+class Reproducibility:
+    """
+    Seeds, canonical ordering and fingerprints for reproducible runs
+    canonical_input() sorts events and resources by id, so the models see the
+    same order however the caller listed them. tie_break() gives the ranks the
+    deterministic heuristics use to break ties: input order without a seed, a
+    seeded permutation with one. Fingerprints are SHA-256 digests of sorted
+    JSON, independent of dict order and Python's per-process hash seed.
+    """
+
+    # Input sections whose items are keyed by 'id'
+    SECTIONS = ('events', 'teachers', 'student_groups', 'rooms', 'courses', 'shared_courses')
+    # Event fields that are unordered collections
+    UNORDERED_FIELDS = ('student_groups',)
+
+    @staticmethod
+    def _key(item) -> str:
+        return str(item.get('id')) if isinstance(item, dict) else str(item)
+
+    @staticmethod
+    def canonical_input(input_data: Dict) -> Dict:
+        """Shallow copy of input_data with sections sorted by id and group lists sorted"""
+        canonical = dict(input_data)
+        for section in Reproducibility.SECTIONS:
+            items = input_data.get(section)
+            if not isinstance(items, list):
+                continue
+            ordered = []
+            for item in sorted(items, key=Reproducibility._key):
+                if isinstance(item, dict) and any(isinstance(item.get(f), list) for f in Reproducibility.UNORDERED_FIELDS):
+                    item = dict(item)
+                    for field in Reproducibility.UNORDERED_FIELDS:
+                        if isinstance(item.get(field), list):
+                            item[field] = sorted(item[field], key=str)
+                ordered.append(item)
+            canonical[section] = ordered
+        return canonical
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def tie_break(n: int, seed: Optional[int] = None) -> Tuple[int, ...]:
+        """
+        Rank per position: identity without a seed, a seeded permutation otherwise
+        The table depends only on (n, seed), so it is built once per process
+        and shared by every model instance.
+        """
+        ranks = list(range(n))
+        if seed is not None:
+            random.Random(seed).shuffle(ranks)
+        return tuple(ranks)
+
+    @staticmethod
+    def digest(value) -> str:
+        text = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def problem_fingerprint(input_data: Dict) -> str:
+        """Digest of the problem (sections, num_timeslots, constraints), ignoring listing order and config"""
+        canonical = Reproducibility.canonical_input(input_data)
+        return Reproducibility.digest({key: value for key, value in canonical.items() if key != 'config'})
+
+    @staticmethod
+    def schedule_fingerprint(schedule: Dict) -> str:
+        """Digest of the placements (event id, timeslot, room), ignoring list and dict order"""
+        placements = sorted(
+            (str(event.get('id')), str(slot), str(event.get('room')))
+            for slot, events in schedule.get('timeslots', {}).items()
+            for event in events
+        )
+        return Reproducibility.digest(placements)
+
+    @staticmethod
+    def fingerprint(input_data: Dict, schedule: Dict, model: str, seed: Optional[int] = None) -> Dict:
+        """Fingerprint block attached to results: equal blocks mean identical runs"""
+        return {
+            'problem': Reproducibility.problem_fingerprint(input_data),
+            'schedule': Reproducibility.schedule_fingerprint(schedule),
+            'model': model,
+            'seed': seed
+        }
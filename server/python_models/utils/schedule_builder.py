@@ -0,0 +1,95 @@
+# python_models/utils/schedule_builder.py
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Tuple
+from .block_layout import BlockLayout
+
+
+class ScheduleBuilder:
+    """
+    Builds the schedule dict every model returns
+    timeslots maps a slot to the events starting there; teachers, rooms and
+    student_groups map a resource to its {'timeslot', 'event'} bookings. A
+    block event is listed once under its start slot and books its resources
+    in every slot it covers, so per-slot duplicate checks see overlaps.
+    Elective bookings go to an optional 'students' section the same way.
+    """
+
+    # (section, conflict type, label) checked by conflicts()
+    CHECKS = (
+        ('teachers', 'Teacher conflict', 'Teacher'),
+        ('rooms', 'Room conflict', 'Room'),
+        ('student_groups', 'Student group conflict', 'Group')
+    )
+
+    @staticmethod
+    def empty() -> Dict:
+        return {
+            'timeslots': {},
+            'events': [],
+            'teachers': {},
+            'rooms': {},
+            'student_groups': {}
+        }
+
+    @staticmethod
+    def place(schedule: Dict, event: Dict, timeslot, students=()):
+        """Add event at timeslot (its start slot for blocks), booking students' electives too"""
+        if timeslot not in schedule['timeslots']:
+            schedule['timeslots'][timeslot] = []
+        schedule['timeslots'][timeslot].append(event)
+        schedule['events'].append(event)
+
+        duration = BlockLayout.duration(event)
+        cells = [timeslot] if duration == 1 else BlockLayout.cells(int(timeslot), duration)
+        for cell in cells:
+            # Track teacher schedules
+            schedule['teachers'].setdefault(event.get('teacher'), []).append({'timeslot': cell, 'event': event})
+
+            # Track room usage if specified
+            if 'room' in event:
+                schedule['rooms'].setdefault(event['room'], []).append({'timeslot': cell, 'event': event})
+
+            # Track student group schedules
+            for group in event.get('student_groups', []):
+                schedule['student_groups'].setdefault(group, []).append({'timeslot': cell, 'event': event})
+
+            # Track individual student (elective) schedules
+            for student in students:
+                schedule.setdefault('students', {}).setdefault(student, []).append({'timeslot': cell, 'event': event})
+
+    @staticmethod
+    def build(placements: Iterable[Tuple[object, Dict]]) -> Dict:
+        """Schedule from (timeslot, event) pairs, in the given order"""
+        schedule = ScheduleBuilder.empty()
+        for timeslot, event in placements:
+            ScheduleBuilder.place(schedule, event, timeslot)
+        return schedule
+
+    @staticmethod
+    def _overbooked(schedule: Dict) -> Iterator[Tuple[str, str, object, List, Counter]]:
+        """(conflict type, label, resource, booked slots, bookings per slot) for every double-booked resource"""
+        for section, conflict_type, label in ScheduleBuilder.CHECKS:
+            for resource, assignments in schedule[section].items():
+                timeslots = [a['timeslot'] for a in assignments]
+                counts = Counter(timeslots)
+                if len(counts) != len(timeslots):
+                    yield conflict_type, label, resource, timeslots, counts
+
+    @staticmethod
+    def conflicts(schedule: Dict) -> List[Dict]:
+        """Teachers, rooms and groups booked more than once in a slot (the models' get_conflicts)"""
+        return [
+            {
+                'type': conflict_type,
+                'message': f"{label} {resource} scheduled for multiple events at times "
+                           f"{[t for t in timeslots if counts[t] > 1]}",
+                'resources': [resource]
+            }
+            for conflict_type, label, resource, timeslots, counts in ScheduleBuilder._overbooked(schedule)
+        ]
+
+    @staticmethod
+    def clash_count(schedule: Dict) -> int:
+        """Extra bookings over all resources and slots (0 for a conflict-free schedule)"""
+        return sum(len(timeslots) - len(counts)
+                   for _, _, _, timeslots, counts in ScheduleBuilder._overbooked(schedule))
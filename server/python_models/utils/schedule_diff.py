@@ -0,0 +1,133 @@
+# python_models/utils/schedule_diff.py
+from typing import Dict
+import copy
+from .schedule_builder import ScheduleBuilder
+
+
+class ScheduleDiff:
+    """
+    Minimal change sets between two schedules in the standard dict shape
+    Events are keyed by id and placed by their timeslot key, so diff() and
+    apply() are linear in the number of events. A patch lists:
+      - moved:   {'id', 'from', 'to'} timeslot changes
+      - rooms:   {'id', 'from', 'to'} room changes (None when absent)
+      - added:   {'timeslot', 'event'} new events
+      - removed: ids of events no longer scheduled
+      - updated: {'id', 'event'} events whose other fields changed
+      - students: {'id', 'from', 'to'} changes to the students booked on an
+        event (elective bookings; added events carry theirs as 'students')
+    apply() keeps the schedule's other keys (unassigned, cancelled, ...).
+    """
+
+    # Event fields tracked by 'moved'/'rooms' rather than 'updated'
+    PLACEMENT_FIELDS = ('timeslot', 'room')
+
+    @staticmethod
+    def placements(schedule: Dict) -> Dict:
+        """event id -> (timeslot, event) from the schedule's timeslot map"""
+        placed = {}
+        for slot, events in schedule.get('timeslots', {}).items():
+            slot = ScheduleDiff._slot_key(slot)
+            for event in events:
+                placed[event['id']] = (slot, event)
+        return placed
+
+    @staticmethod
+    def students(schedule: Dict) -> Dict:
+        """event id -> sorted students booked on it in the 'students' section"""
+        booked = {}
+        for student, assignments in schedule.get('students', {}).items():
+            for assignment in assignments:
+                booked.setdefault(assignment['event']['id'], set()).add(student)
+        return {event_id: sorted(students, key=str) for event_id, students in booked.items()}
+
+    @staticmethod
+    def _slot_key(slot):
+        # JSON round trips turn int timeslot keys into strings
+        if isinstance(slot, str) and slot.lstrip('-').isdigit():
+            return int(slot)
+        return slot
+
+    @staticmethod
+    def _details(event: Dict) -> Dict:
+        return {key: value for key, value in event.items() if key not in ScheduleDiff.PLACEMENT_FIELDS}
+
+    @staticmethod
+    def diff(old: Dict, new: Dict) -> Dict:
+        """Patch turning schedule old into schedule new"""
+        before, after = ScheduleDiff.placements(old), ScheduleDiff.placements(new)
+        students_before, students_after = ScheduleDiff.students(old), ScheduleDiff.students(new)
+        patch = {'moved': [], 'rooms': [], 'added': [], 'removed': [], 'updated': [], 'students': []}
+        for event_id, (slot, event) in after.items():
+            previous = before.get(event_id)
+            if previous is None:
+                added = {'timeslot': slot, 'event': event}
+                if event_id in students_after:
+                    added['students'] = students_after[event_id]
+                patch['added'].append(added)
+                continue
+            students = students_after.get(event_id, [])
+            if students_before.get(event_id, []) != students:
+                patch['students'].append({'id': event_id, 'from': students_before.get(event_id, []), 'to': students})
+            old_slot, old_event = previous
+            if old_slot != slot:
+                patch['moved'].append({'id': event_id, 'from': old_slot, 'to': slot})
+            if old_event.get('room') != event.get('room'):
+                patch['rooms'].append({'id': event_id, 'from': old_event.get('room'), 'to': event.get('room')})
+            if old_event is not event and ScheduleDiff._details(old_event) != ScheduleDiff._details(event):
+                patch['updated'].append({'id': event_id, 'event': event})
+        patch['removed'] = [event_id for event_id in before if event_id not in after]
+        patch['size'] = sum(len(changes) for changes in patch.values())
+        return patch
+
+    @staticmethod
+    def is_empty(patch: Dict) -> bool:
+        return not any(patch.get(key) for key in ('moved', 'rooms', 'added', 'removed', 'updated', 'students'))
+
+    @staticmethod
+    def apply(schedule: Dict, patch: Dict) -> Dict:
+        """New schedule with patch applied; the input schedule is not modified"""
+        placed = {event_id: (slot, dict(event)) for event_id, (slot, event)
+                  in ScheduleDiff.placements(schedule).items()}
+        students = ScheduleDiff.students(schedule)
+        for event_id in patch.get('removed', []):
+            placed.pop(event_id, None)
+            students.pop(event_id, None)
+        for change in patch.get('updated', []):
+            if change['id'] in placed:
+                slot, event = placed[change['id']]
+                updated = copy.deepcopy(change['event'])
+                for field in ScheduleDiff.PLACEMENT_FIELDS:
+                    updated.pop(field, None)
+                    if field in event:
+                        updated[field] = event[field]
+                placed[change['id']] = (slot, updated)
+        for change in patch.get('moved', []):
+            if change['id'] in placed:
+                _, event = placed[change['id']]
+                if 'timeslot' in event:
+                    event['timeslot'] = change['to']
+                placed[change['id']] = (change['to'], event)
+        for change in patch.get('rooms', []):
+            if change['id'] in placed:
+                event = placed[change['id']][1]
+                if change['to'] is None:
+                    event.pop('room', None)
+                else:
+                    event['room'] = change['to']
+        for change in patch.get('students', []):
+            students[change['id']] = change['to']
+        for change in patch.get('added', []):
+            placed[change['event']['id']] = (change['timeslot'], copy.deepcopy(change['event']))
+            students[change['event']['id']] = change.get('students', [])
+
+        result = ScheduleBuilder.empty()
+        for event_id, (slot, event) in placed.items():
+            ScheduleBuilder.place(result, event, slot, students.get(event_id, ()))
+        # Keys that are not placements carry over; placed events are no longer unassigned
+        for key, value in schedule.items():
+            if key not in result and key != 'students':
+                result[key] = copy.deepcopy(value)
+        if isinstance(result.get('unassigned'), list):
+            result['unassigned'] = [event_id for event_id in result['unassigned'] if event_id not in placed]
+        return result
@@ -1,74 +1,96 @@
 # python_models/utils/vtu_validator.py
-from typing import Dict, List
+from typing import Dict, IO, Iterator, List, Optional, Tuple, Union
+import codecs
+import io
 import json
+import re
+from ..base.problem_index import ProblemIndexBuilder
+from .block_layout import BlockLayout
 
 class VTUValidator:
     """Validator for VTU (University Timetabling) schema compliance"""
     
     @staticmethod
-    def validate_input_schema(input_data: Dict) -> Dict:
+    def validate_input_schema(input_data: Dict, max_errors: Optional[int] = None,
+                              build_index: bool = False) -> Dict:
         """
         Validate input data against VTU schema
-        Returns dict with 'valid' bool and 'errors' list
+        Returns dict with 'valid' bool and 'errors' list, plus the interned
+        'index' (ProblemIndex, None when invalid) if build_index is set.
+        The input's config (max_errors, periods_per_day) applies as in
+        validate_input_stream.
         """
-        errors = []
+        checker = _InputChecker(max_errors, build_index)
+        if build_index:
+            checker.builder.num_timeslots = input_data.get('num_timeslots')
+        checker.set_config(input_data.get('config'))
         
-        # Check required top-level fields
-        required_fields = ['events', 'teachers', 'student_groups', 'rooms']
-        for field in required_fields:
-            if field not in input_data:
-                errors.append(f"Missing required field: {field}")
+        for section in _InputChecker.SECTIONS:
+            if section not in input_data:
+                continue
+            checker.open_section(section, input_data[section])
+            if isinstance(input_data[section], list):
+                for i, item in enumerate(input_data[section]):
+                    if checker.full:
+                        break
+                    checker.check_item(section, i, item)
+            checker.close_section(section)
         
-        # Validate events
-        if 'events' in input_data:
-            for i, event in enumerate(input_data['events']):
-                if 'id' not in event:
-                    errors.append(f"Event at index {i} missing 'id'")
-                if 'name' not in event:
-                    errors.append(f"Event at index {i} missing 'name'")
-                if 'teacher' not in event:
-                    errors.append(f"Event at index {i} missing 'teacher'")
-                if 'student_groups' not in event:
-                    errors.append(f"Event at index {i} missing 'student_groups'")
-                elif not isinstance(event['student_groups'], list):
-                    errors.append(f"Event {event.get('id', str(i))} student_groups should be a list")
-        
-        # Validate teachers
-        if 'teachers' in input_data:
-            for i, teacher in enumerate(input_data['teachers']):
-                if 'id' not in teacher:
-                    errors.append(f"Teacher at index {i} missing 'id'")
-                if 'name' not in teacher:
-                    errors.append(f"Teacher at index {i} missing 'name'")
-        
-        # Validate student groups
-        if 'student_groups' in input_data:
-            for i, group in enumerate(input_data['student_groups']):
-                if 'id' not in group:
-                    errors.append(f"Student group at index {i} missing 'id'")
-                if 'name' not in group:
-                    errors.append(f"Student group at index {i} missing 'name'")
-        
-        # Validate rooms
-        if 'rooms' in input_data:
-            for i, room in enumerate(input_data['rooms']):
-                if 'id' not in room:
-                    errors.append(f"Room at index {i} missing 'id'")
-                if 'name' not in room:
-                    errors.append(f"Room at index {i} missing 'name'")
-                if 'capacity' not in room:
-                    errors.append(f"Room at index {i} missing 'capacity'")
-                elif not isinstance(room['capacity'], int):
-                    errors.append(f"Room {room.get('id', str(i))} capacity should be integer")
-                if 'equipment' not in room:
-                    errors.append(f"Room at index {i} missing 'equipment'")
-                elif not isinstance(room['equipment'], list):
-                    errors.append(f"Room {room.get('id', str(i))} equipment should be list")
+        return checker.finish()
+    
+    @staticmethod
+    def validate_input_stream(stream: Union[IO, str, bytes], max_errors: Optional[int] = None,
+                              chunk_size: int = 65536, build_index: bool = False,
+                              keep_data: bool = False) -> Dict:
+        """
+        Validate raw JSON input while it is being parsed
+        Items are checked one at a time as the parser reaches them and reading
+        stops as soon as max_errors errors have been collected; a 'config'
+        object read before that overrides max_errors with its own.
+        Returns dict with 'valid' bool and 'errors' list (and 'index', see above);
+        with keep_data, 'data' is the parsed input, or None if reading stopped early.
+        """
+        if isinstance(stream, (str, bytes)):
+            stream = io.BytesIO(stream) if isinstance(stream, bytes) else io.StringIO(stream)
         
-        return {
-            'valid': len(errors) == 0,
-            'errors': errors
-        }
+        checker = _InputChecker(max_errors, build_index)
+        data = {}
+        complete = False
+        try:
+            for kind, key, index, value in _iter_top_level(_JsonStream(stream, chunk_size)):
+                if keep_data:
+                    if kind == 'open':
+                        data[key] = []
+                    elif kind == 'item':
+                        data[key].append(value)
+                    elif kind == 'value':
+                        data[key] = value
+                if key == 'num_timeslots' and build_index:
+                    checker.builder.num_timeslots = value
+                if key == 'config':
+                    checker.set_config(value)
+                if key not in _InputChecker.SECTIONS:
+                    continue
+                if kind == 'open':
+                    checker.open_section(key, [])
+                elif kind == 'item':
+                    checker.check_item(key, index, value)
+                elif kind == 'close':
+                    checker.close_section(key)
+                else:
+                    checker.open_section(key, value)
+                    checker.close_section(key)
+                if checker.full:
+                    break
+            else:
+                complete = True
+        except ValueError as e:
+            checker.error(f"Malformed JSON input: {e}")
+        
+        result = checker.finish()
+        if keep_data:
+            result['data'] = data if complete else None
+        return result
     
     @staticmethod
     def validate_schedule(schedule: Dict) -> Dict:
@@ -168,4 +190,280 @@ class VTUValidator:
         return {
             'conflicts_found': len(conflicts) > 0,
             'conflicts': conflicts
-        }
\ No newline at end of file
+        }
+
+class _InputChecker:
+    """Incremental input checks shared by the dict and streaming validators"""
+    
+    SECTIONS = ('events', 'teachers', 'student_groups', 'rooms')
+    LABELS = {
+        'events': 'Event',
+        'teachers': 'Teacher',
+        'student_groups': 'Student group',
+        'rooms': 'Room'
+    }
+    
+    def __init__(self, max_errors: Optional[int] = None, build_index: bool = False):
+        self.max_errors = max_errors
+        self.builder = ProblemIndexBuilder() if build_index else None
+        self.errors = []
+        self.seen = set()
+        self.closed = set()
+        self.ids = {section: set() for section in self.SECTIONS}
+        # References to resource sections that had not been read yet
+        self.pending = []
+        # (event label, duration) of multi-period events, checked against the
+        # day length once the whole input (and its config) has been read
+        self.blocks = []
+        self.periods_per_day = None
+    
+    @property
+    def full(self) -> bool:
+        return self.max_errors is not None and len(self.errors) >= self.max_errors
+    
+    def set_config(self, config):
+        """Apply max_errors and periods_per_day from the input's config object"""
+        if not isinstance(config, dict):
+            return
+        if isinstance(config.get('max_errors'), int):
+            self.max_errors = config['max_errors']
+        if isinstance(config.get('periods_per_day'), int) and config['periods_per_day'] > 0:
+            self.periods_per_day = config['periods_per_day']
+    
+    def error(self, message: str):
+        if not self.full:
+            self.errors.append(message)
+    
+    def open_section(self, section: str, value):
+        self.seen.add(section)
+        if not isinstance(value, list):
+            self.error(f"Field {section} should be a list")
+    
+    def close_section(self, section: str):
+        self.closed.add(section)
+    
+    def check_item(self, section: str, i: int, item):
+        label = self.LABELS[section]
+        if not isinstance(item, dict):
+            self.error(f"{label} at index {i} should be an object")
+            return
+        
+        if 'id' not in item:
+            self.error(f"{label} at index {i} missing 'id'")
+        elif not self._valid_id(item['id']):
+            self.error(f"{label} at index {i} id should be a string or integer")
+        elif item['id'] in self.ids[section]:
+            self.error(f"Duplicate {label.lower()} id '{item['id']}' at index {i}")
+        else:
+            self.ids[section].add(item['id'])
+            if self.builder is not None:
+                if section == 'events':
+                    self.builder.add_event(item)
+                else:
+                    self.builder.add_resource(section, item)
+        if 'name' not in item:
+            self.error(f"{label} at index {i} missing 'name'")
+        
+        if section == 'events':
+            self._check_event(i, item)
+        elif section == 'rooms':
+            self._check_room(i, item)
+    
+    def _check_event(self, i: int, event: Dict):
+        event_label = event.get('id', str(i))
+        if 'teacher' not in event:
+            self.error(f"Event at index {i} missing 'teacher'")
+        else:
+            self._check_reference(event_label, 'teachers', event['teacher'])
+        if 'student_groups' not in event:
+            self.error(f"Event at index {i} missing 'student_groups'")
+        elif not isinstance(event['student_groups'], list):
+            self.error(f"Event {event_label} student_groups should be a list")
+        else:
+            for group in event['student_groups']:
+                self._check_reference(event_label, 'student_groups', group)
+        if 'room' in event:
+            self._check_reference(event_label, 'rooms', event['room'])
+        if 'duration' in event and (not isinstance(event['duration'], int) or isinstance(event['duration'], bool)
+                                    or event['duration'] < 1):
+            self.error(f"Event {event_label} duration should be a positive integer")
+        elif BlockLayout.duration(event) > 1:
+            self.blocks.append((event_label, BlockLayout.duration(event)))
+    
+    def _check_room(self, i: int, room: Dict):
+        if 'capacity' not in room:
+            self.error(f"Room at index {i} missing 'capacity'")
+        elif not isinstance(room['capacity'], int):
+            self.error(f"Room {room.get('id', str(i))} capacity should be integer")
+        if 'equipment' not in room:
+            self.error(f"Room at index {i} missing 'equipment'")
+        elif not isinstance(room['equipment'], list):
+            self.error(f"Room {room.get('id', str(i))} equipment should be list")
+    
+    @staticmethod
+    def _valid_id(value) -> bool:
+        """Ids and references are strings or integers (hashable, and JSON round-trips them)"""
+        return isinstance(value, (str, int)) and not isinstance(value, bool)
+    
+    def _check_reference(self, event_label, section: str, ref):
+        if not self._valid_id(ref):
+            self.error(f"Event {event_label} has invalid {section} reference {ref!r}")
+            return
+        if ref in self.ids[section]:
+            return
+        if section in self.closed:
+            self._unknown_reference(event_label, section, ref)
+        else:
+            self.pending.append((event_label, section, ref))
+    
+    def _unknown_reference(self, event_label, section: str, ref):
+        self.error(f"Event {event_label} references unknown {self.LABELS[section].lower()} '{ref}'")
+    
+    def finish(self) -> Dict:
+        """Report missing sections and resolve deferred references"""
+        for section in self.SECTIONS:
+            if section not in self.seen:
+                self.error(f"Missing required field: {section}")
+        
+        for event_label, section, ref in self.pending:
+            if self.full:
+                break
+            if section in self.seen and ref not in self.ids[section]:
+                self._unknown_reference(event_label, section, ref)
+        
+        periods_per_day = self.periods_per_day or BlockLayout.PERIODS_PER_DAY
+        for event_label, duration in self.blocks:
+            if duration > periods_per_day:
+                self.error(f"Event {event_label} duration {duration} exceeds {periods_per_day} periods per day")
+        
+        result = {
+            'valid': len(self.errors) == 0,
+            'errors': self.errors
+        }
+        if self.builder is not None:
+            result['index'] = self.builder.build() if result['valid'] else None
+        return result
+
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class _JsonStream:
+    """Minimal pull reader that decodes one JSON value at a time from a text or binary stream"""
+    
+    # Longest number, literal or escape a chunk boundary can cut short; decode
+    # errors further than this from the end of the buffer are final
+    TOKEN_MARGIN = 256
+    
+    def __init__(self, stream: IO, chunk_size: int = 65536):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._bytes_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._offset = 0
+        self._eof = False
+    
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping consumed text"""
+        if self._eof:
+            return False
+        chunk = self._stream.read(self._chunk_size)
+        while isinstance(chunk, bytes):
+            raw = chunk
+            chunk = self._bytes_decoder.decode(raw, final=not raw)
+            # A chunk ending inside a multi-byte character decodes to ''
+            if chunk or not raw:
+                break
+            chunk = self._stream.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._offset += self._pos
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+    
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it"""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or not self._fill():
+                break
+        return self._buffer[self._pos:self._pos + 1]
+    
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"expected '{char}' but found '{found or 'end of input'}' "
+                             f"at offset {self._offset + self._pos}")
+        self._pos += 1
+    
+    def end(self):
+        """Fail unless only whitespace is left"""
+        found = self.peek()
+        if found:
+            raise ValueError(f"unexpected '{found}' after the top-level object "
+                             f"at offset {self._offset + self._pos}")
+    
+    def value(self):
+        """Decode one complete JSON value, reading more input as needed"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                # Only an error at the edge of the buffered text (or an open string) may be truncation
+                truncated = e.msg.startswith('Unterminated string') or e.pos + self.TOKEN_MARGIN >= len(self._buffer)
+                if truncated and self._fill():
+                    continue
+                raise ValueError(f"{e.msg} at offset {self._offset + e.pos}")
+            # A number or literal ending exactly at the buffer edge may be truncated
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def _iter_top_level(reader: _JsonStream) -> Iterator[Tuple[str, str, Optional[int], object]]:
+    """
+    Walk the top-level object, yielding array members one by one
+    Yields ('open'|'item'|'close', key, index, value) for arrays and
+    ('value', key, None, value) for any other field; anything but whitespace
+    after the closing brace is an error
+    """
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.expect('}')
+        reader.end()
+        return
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise ValueError(f"object key should be a string, got {key!r}")
+        reader.expect(':')
+        if reader.peek() == '[':
+            reader.expect('[')
+            yield 'open', key, None, None
+            if reader.peek() == ']':
+                reader.expect(']')
+            else:
+                index = 0
+                while True:
+                    yield 'item', key, index, reader.value()
+                    index += 1
+                    if reader.peek() == ',':
+                        reader.expect(',')
+                        continue
+                    reader.expect(']')
+                    break
+            yield 'close', key, None, None
+        else:
+            yield 'value', key, None, reader.value()
+        if reader.peek() == ',':
+            reader.expect(',')
+            continue
+        reader.expect('}')
+        break
+    reader.end()
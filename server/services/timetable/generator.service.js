@@ -54,8 +54,11 @@ const generateTimetable = async (input) => {
             throw new Error('Python script returned invalid result');
         }
 
-        // Detect conflicts
-        const conflicts = conflictService.detectConflicts(result.schedule);
+        // Python ships a report with detectConflicts semantics; only re-scan
+        // the schedule when an older script did not provide one
+        const conflicts = result.conflict_report
+            ? result.conflict_report.conflicts
+            : conflictService.detectConflicts(result.schedule);
 
         // Prepare stats
         const stats = {
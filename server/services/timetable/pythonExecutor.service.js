@@ -5,11 +5,22 @@ const path = require('path');
 const logger = require('../../utils/logger');
 const { ApiError } = require('../../middleware/errorHandler');
 
-const execPythonScript = (scriptPath, inputData) => {
+/**
+ * Run a python_models script and resolve with its result message.
+ * Scripts write NDJSON to stdout: zero or more {type: 'progress'} lines
+ * followed by the result. Options:
+ *   timeoutMs  - budget; on expiry the script gets SIGTERM and returns its
+ *                best-so-far schedule (marked cancelled)
+ *   graceMs    - how long to wait after cancelling before killing the process
+ *   onProgress - called with each progress message
+ */
+const execPythonScript = (scriptPath, inputData, options = {}) => {
+    const { timeoutMs, graceMs = 5000, onProgress } = options;
+
     return new Promise((resolve, reject) => {
         try {
             // Configure Python shell options
-            const options = {
+            const shellOptions = {
                 mode: 'json',
                 pythonPath: process.env.PYTHON_PATH || 'python3',
                 pythonOptions: ['-u'], // unbuffered output
@@ -19,20 +30,51 @@ const execPythonScript = (scriptPath, inputData) => {
 
             logger.debug(`Executing Python script: ${scriptPath}`);
 
-            const pyshell = new PythonShell(path.basename(scriptPath), options);
+            const pyshell = new PythonShell(path.basename(scriptPath), shellOptions);
 
-            let output = '';
+            let result = null;
             let errorOutput = '';
+            let cancelTimer = null;
+            let killTimer = null;
+            let killed = false;
 
             pyshell.on('message', (message) => {
-                output += message;
+                if (message && message.type === 'progress') {
+                    if (onProgress) {
+                        onProgress(message);
+                    }
+                    return;
+                }
+                result = message;
             });
 
             pyshell.on('stderr', (stderr) => {
                 errorOutput += stderr;
             });
 
+            if (timeoutMs) {
+                cancelTimer = setTimeout(() => {
+                    logger.warn(`Python script exceeded ${timeoutMs}ms, requesting cancellation`);
+                    // stdin is already closed by pyshell.end() below, so cancel with
+                    // SIGTERM (handled by the script's CancellationToken) rather than
+                    // a stdin command
+                    pyshell.childProcess.kill('SIGTERM');
+                    killTimer = setTimeout(() => {
+                        killed = true;
+                        pyshell.kill('SIGKILL');
+                    }, graceMs);
+                }, timeoutMs);
+            }
+
             pyshell.end((err) => {
+                clearTimeout(cancelTimer);
+                clearTimeout(killTimer);
+
+                if (killed) {
+                    logger.error(`Python script killed after ${timeoutMs + graceMs}ms`);
+                    return reject(new ApiError(504, 'Python script timed out'));
+                }
+
                 if (err) {
                     logger.error(`Python execution error: ${err.message}`);
                     return reject(new ApiError(500, `Python script failed: ${err.message}`));
@@ -42,14 +84,8 @@ const execPythonScript = (scriptPath, inputData) => {
                     logger.error(`Python stderr: ${errorOutput}`);
                 }
 
-                try {
-                    const result = output ? JSON.parse(output) : {};
-                    logger.debug('Python script executed successfully');
-                    resolve(result);
-                } catch (parseError) {
-                    logger.error(`Failed to parse Python output: ${parseError.message}`);
-                    reject(new ApiError(500, 'Invalid output from Python script'));
-                }
+                logger.debug('Python script executed successfully');
+                resolve(result || {});
             });
 
         } catch (error) {